@@ -1,82 +1,156 @@
 import numpy as np
 import logging
+from abc import ABC, abstractmethod
+from indice_aleatorio import IndiceAleatorio
+from instrumentacao import instrumentacao
 
-logging.basicConfig(format="%(asctime)s %(levelname)s %(message)s", level="INFO")
+try:
+    from scipy import sparse
+    from scipy.sparse.linalg import spsolve
+except ImportError:
+    sparse = None
+
+logger = logging.getLogger(__name__)
+
+# Índice aleatório proposto por Saaty, indexado pela quantidade de critérios (n - 1). Para mais
+# critérios, o índice é simulado pela classe IndiceAleatorio
+RANDOM_INDEX = [0, 0 , 0.58, 0.9, 1.12, 1.24, 1.32, 1.41, 1.45, 1.49, 1.51, 1.48, 1.56, 1.57, 1.59]
+
+# A partir desta quantidade de critérios, matrizes incompletas são resolvidas com álgebra esparsa (se
+# o scipy estiver disponível)
+TAMANHO_MINIMO_ESPARSO = 200
+
+# Precisões aceitas nos cálculos: float64 (exatidão) ou float32 (metade da memória)
+PRECISOES = (np.float64, np.float32)
+
+def valida_precisao(dtype):
+    """
+    Função que confere se a precisão informada é uma das aceitas pelo algoritmo
+
+    Args:
+        dtype (numpy dtype, str): precisão desejada ('float64' ou 'float32')
+
+    Returns:
+        dtype (numpy dtype): precisão normalizada
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in [np.dtype(precisao) for precisao in PRECISOES]:
+        raise ValueError("A precisão deve ser float64 ou float32")
+    return dtype
 
 # Classe utilizada para operações com a matriz de jugamento (do processo ou de um critério)
 class MatrizJulgamento:
-    def __init__(self) -> None:
-        logging.info("Iniciando a classe da matriz de julgamento")
+    def __init__(self, dtype = np.float64) -> None:
+        logger.debug("Iniciando a classe da matriz de julgamento")
+        self.dtype = valida_precisao(dtype)
         
 
-    def checa_reciprocidade(self, matriz):
+    def valida_matriz(self, matriz, tolerancia = 1e-6, permite_ausentes = False):
+        """
+        Função que verifica, em operações vetorizadas, a diagonal principal (aii = 1) e o princípio
+        da reciprocidade (aij = 1/aji) de uma matriz de julgamento ou de uma pilha de matrizes. A
+        reciprocidade é avaliada pelo erro relativo |aij * aji - 1|, tolerando arredondamentos em
+        valores como 1/3. Todas as violações são reportadas, e não apenas a primeira
+
+        Args:
+            matriz (numpy array): matriz de julgamento (n, n) ou pilha de matrizes (k, n, n)
+            tolerancia (float): maior erro aceito na diagonal e na reciprocidade
+            permite_ausentes (bool): aceita comparações ausentes (NaN), desde que aij e aji estejam ambos ausentes
+
+        Returns:
+            validos (bool, numpy array): veredito da matriz ou vetor (k,) com o veredito de cada matriz
+            violacoes (numpy array): índices (i, j) dos elementos reprovados, com i <= j (pares com i == j
+            indicam falha na diagonal). Para pilhas, cada linha é (modelo, i, j)
+        """
+        logger.debug("Validando a diagonal principal e a reciprocidade da matriz de julgamento")
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        if matriz.ndim < 2 or matriz.shape[-1] != matriz.shape[-2]:
+            raise ValueError("A matriz não é quadrada")
+
+        tamanho = matriz.shape[-1]
+        produto = matriz * np.swapaxes(matriz, -1, -2)
+        # A comparação negada também reprova elementos NaN
+        erros = ~(np.abs(produto - 1) <= tolerancia)
+        if permite_ausentes:
+            erros &= ~(np.isnan(matriz) & np.isnan(np.swapaxes(matriz, -1, -2)))
+        mascara = np.triu(erros, k=1)
+        indices = np.arange(tamanho)
+        diagonal = matriz[..., indices, indices]
+        mascara[..., indices, indices] = ~(np.abs(diagonal - 1) <= tolerancia)
+
+        validos = ~mascara.any(axis=(-2, -1))
+        violacoes = np.argwhere(mascara)
+        if matriz.ndim == 2:
+            validos = bool(validos)
+        return validos, violacoes
+
+    def checa_reciprocidade(self, matriz, tolerancia = 1e-6, permite_ausentes = False):
         """
         Função que verifica o princípio da reciprocidade da matriz: aij = aji
 
         Args:
             matriz (numpy array): matriz de julgamento
+            tolerancia (float): maior erro relativo aceito entre aij e 1/aji
+            permite_ausentes (bool): aceita comparações ausentes (NaN) nas duas posições do par
         
         Returns:
             message (str): texto indicando o veredito do processo
             status (int): código indicando o status do processo
         """
-        logging.info("Checando o princípio da reciprocidade para a matriz de julgamento")
-        shape = matriz.shape
-        linhas = shape[0]
-        colunas = shape[1]
-        
-        if linhas != colunas:
+        logger.debug("Checando o princípio da reciprocidade para a matriz de julgamento")
+        shape = np.shape(matriz)
+        if len(shape) != 2 or shape[0] != shape[1]:
             message = "A matriz não é quadrada"
             status = 400
             return message, status
-        
-        for i in range(linhas):
-            for j in range(i+1, colunas):
-                if matriz[i][j] != 1./matriz[j][i]:
-                    message = f"Falha na reciprocidade: o elemento a{i}{j} deve ser igual a 1/a{j}{i}"
-                    status = 400
-                    return message, status
+
+        _, violacoes = self.valida_matriz(matriz, tolerancia, permite_ausentes)
+        pares = [f"a{i}{j} deve ser igual a 1/a{j}{i}" for i, j in violacoes if i != j]
+        if len(pares) > 0:
+            message = f"Falha na reciprocidade: {'; '.join(pares)}"
+            status = 400
+            return message, status
         return "OK", 200
 
-    def verifica_qualidade_matriz(self, matriz):
+    def verifica_qualidade_matriz(self, matriz, tolerancia = 1e-6):
         """
         Função que verifica a consistência da diagonal principal (deve ser composta apenas por '1')
 
         Args:
             matriz (numpy array): matriz de julgamento
+            tolerancia (float): maior diferença aceita entre os elementos da diagonal e 1
         
         Returns:
             message (str): texto indicando o veredito do processo
             status (int): código indicando o status do processo
         """
-        logging.info("Checando a consistência da diagonal principal da matriz de julgamento")
-        diag = np.unique(np.diagonal(matriz))
-        if len(diag) != 1:
-            message = "A diagonal da matriz de julgamento deve ser composta apenas pelo elemento 1"
-            status = 400
-            return message, status
-        
-        if diag[0] != 1:
-            message = f"A diagonal da matriz de julgamento deve ser composta apenas pelo elemento 1"
+        logger.debug("Checando a consistência da diagonal principal da matriz de julgamento")
+        diagonal = np.diagonal(np.asarray(matriz, dtype=self.dtype))
+        posicoes = np.flatnonzero(~(np.abs(diagonal - 1) <= tolerancia))
+        if len(posicoes) > 0:
+            elementos = ", ".join(f"a{i}{i}" for i in posicoes)
+            message = f"A diagonal da matriz de julgamento deve ser composta apenas pelo elemento 1 (falha em {elementos})"
             status = 400
             return message, status
         return "OK", 200
     
-    def normalizacao_julgamentos(self, matriz):
+    def normalizacao_julgamentos(self, matriz, out = None):
         """
         Função que calcula o vetor prioridade da matriz de julgamento. Este vetor busca traduzir
         em termos percentuais o grau de importância de cada critério ou qualidade
 
         Args:
-            matriz (numpy array): matriz de julgamento
+            matriz (numpy array): matriz de julgamento (n, n) ou pilha de matrizes (k, n, n)
+            out (numpy array): vetor (n, 1) ou pilha (k, n, 1) pré-alocada que recebe o resultado (opcional)
         
         Returns:
             vetor_prioridade (numpy array): vetor prioridade com percentuais de importância de cada critério
         """
-        logging.info("Retornando o vetor prioridade da matriz de julgamento")
-        soma_linhas = np.sum(matriz, axis = 0, dtype='f')
+        logger.debug("Retornando o vetor prioridade da matriz de julgamento")
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        soma_linhas = np.sum(matriz, axis = -2, keepdims = True)
         matriz_normalizada = matriz / soma_linhas
-        vetor_prioridade = np.mean(matriz_normalizada, axis = 1, dtype='f').reshape((-1,1))
+        vetor_prioridade = np.mean(matriz_normalizada, axis = -1, keepdims = True, out = out)
         return vetor_prioridade
     
     def analise_consistencia(self, matriz, vetor_prioridade):
@@ -87,92 +161,1083 @@ class MatrizJulgamento:
         valores também propostos e fixos a depender da quantidade de critérios).
 
         Args:
-            matriz (numpy array): matriz de julgamento
-            vetor_prioridade (numpy array): vetor prioridade
+            matriz (numpy array): matriz de julgamento (n, n) ou pilha de matrizes (k, n, n)
+            vetor_prioridade (numpy array): vetor prioridade (n, 1) ou pilha de vetores (k, n, 1)
         
         Returns:
-            cr (float): raio de consistência. Valor que indica o quão coerente foi o processo de 
-            atribuição de pesos da matriz de julgamento
+            cr (float, numpy array): raio de consistência. Valor que indica o quão coerente foi o processo de 
+            atribuição de pesos da matriz de julgamento (vetor (k,) para pilhas)
         """
-        logging.info("Checando a consistência dos graus de importância atribuídos na matriz de julgamento")
-        random_index = [0, 0 , 0.58, 0.9, 1.12, 1.24, 1.32, 1.41, 1.45, 1.49, 1.51, 1.48, 1.56, 1.57, 1.59]
-        tamanho = vetor_prioridade.shape[0]
-        matriz_auxiliar = matriz
-        for i in range(tamanho):
-            matriz_auxiliar[:, i] = matriz_auxiliar[:, i] * vetor_prioridade[i][0]
-
-        soma_pesos = np.sum(matriz_auxiliar, axis = 1, dtype='f').reshape((-1,1))
+        logger.debug("Checando a consistência dos graus de importância atribuídos na matriz de julgamento")
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        vetor_prioridade = np.asarray(vetor_prioridade, dtype=self.dtype).reshape(matriz.shape[:-1] + (1,))
+        tamanho = matriz.shape[-1]
+        # A aplicação dos pesos sobre cada coluna seguida da soma das linhas equivale ao produto A.w,
+        # calculado sem alterar a matriz recebida
+        soma_pesos = np.matmul(matriz, vetor_prioridade)
         vetor_lambda = soma_pesos / vetor_prioridade
-        lambda_max = np.sum(vetor_lambda, dtype='f') / tamanho
+        lambda_max = np.sum(vetor_lambda, axis = (-2, -1)) / tamanho
+        cr = self.razao_consistencia(lambda_max, tamanho)
+        if matriz.ndim == 2:
+            return float(cr)
+        return cr
+
+    def autovetor_principal(self, matriz, tolerancia=1e-10, max_iteracoes=100, vetor_inicial=None):
+        """
+        Função que calcula o vetor prioridade pelo método exato de Saaty (autovetor principal) através
+        do método das potências. O autovalor máximo é obtido na mesma passagem, dispensando a etapa
+        separada de análise de consistência. Aceita uma única matriz (n, n) ou uma pilha (k, n, n)
+
+        Args:
+            matriz (numpy array): matriz de julgamento (n, n) ou pilha de matrizes (k, n, n)
+            tolerancia (float): maior variação absoluta aceita entre duas iterações para declarar convergência
+            max_iteracoes (int): quantidade máxima de iterações
+            vetor_inicial (numpy array): ponto de partida da iteração (por exemplo, o autovetor de uma versão
+            anterior da matriz). Quando None, parte-se da aproximação por normalização das colunas
+
+        Returns:
+            vetor_prioridade (numpy array): vetor prioridade (n, 1) ou pilha de vetores (k, n, 1)
+            lambda_max (float, numpy array): autovalor máximo da matriz ou vetor (k,) de autovalores
+        """
+        logger.debug("Calculando o autovetor principal da matriz de julgamento pelo método das potências")
+        if max_iteracoes < 1:
+            raise ValueError("A quantidade máxima de iterações deve ser pelo menos 1")
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        # Tolerâncias abaixo da resolução da precisão escolhida nunca seriam atingidas
+        tolerancia = max(tolerancia, 10 * np.finfo(self.dtype).eps)
+        if vetor_inicial is not None:
+            vetor = np.asarray(vetor_inicial, dtype=self.dtype).reshape(matriz.shape[:-1] + (1,))
+        else:
+            # A aproximação por normalização das colunas é usada como ponto de partida, reduzindo as iterações
+            vetor = (matriz / matriz.sum(axis=-2, keepdims=True)).mean(axis=-1, keepdims=True)
+        lambda_max = np.full(matriz.shape[:-2], np.nan, dtype=self.dtype)
+        for _ in range(max_iteracoes):
+            produto = np.matmul(matriz, vetor)
+            # Como o vetor soma 1, a soma de A.w é a estimativa do autovalor máximo
+            lambda_max = produto.sum(axis=(-2, -1))
+            novo_vetor = produto / lambda_max[..., np.newaxis, np.newaxis]
+            # A convergência é avaliada por modelo: em pilhas, modelos inválidos (com NaN ou elementos não
+            # positivos) têm variação não finita e não impedem a parada quando os demais convergem
+            variacao = np.atleast_1d(np.abs(novo_vetor - vetor).max(axis=(-2, -1)))
+            variacao = variacao[np.isfinite(variacao)]
+            vetor = novo_vetor
+            if not (variacao >= tolerancia).any():
+                break
+        else:
+            logger.warning(f"O método das potências não convergiu em {max_iteracoes} iterações (variação {variacao.max()})")
+
+        if matriz.ndim == 2:
+            lambda_max = float(lambda_max)
+        return vetor, lambda_max
+
+    def razao_consistencia(self, lambda_max, tamanho):
+        """
+        Função que calcula a razão de consistência a partir de um autovalor máximo já conhecido
+
+        Args:
+            lambda_max (float, numpy array): autovalor máximo (ou vetor de autovalores) da matriz de julgamento
+            tamanho (int): quantidade de critérios da matriz de julgamento
+
+        Returns:
+            cr (float, numpy array): razão de consistência (em percentual)
+        """
+        if tamanho > len(RANDOM_INDEX):
+            # Acima da tabela de Saaty o índice é estimado por simulação (e lido do cache nas próximas execuções)
+            indice_aleatorio = IndiceAleatorio().obtem(tamanho)
+        else:
+            indice_aleatorio = RANDOM_INDEX[tamanho - 1]
+        if indice_aleatorio == 0:
+            return np.zeros_like(lambda_max, dtype=self.dtype) if np.ndim(lambda_max) else 0.0
         ci = (lambda_max - tamanho) / (tamanho - 1)
-        cr = ci / random_index[tamanho - 1]
+        cr = ci / indice_aleatorio
         cr = cr * 100
         return cr
+
+    def checa_conectividade(self, matriz):
+        """
+        Função que verifica se as comparações conhecidas (elementos não NaN) ligam todos os critérios,
+        condição necessária para derivar prioridades de uma matriz incompleta
+
+        Args:
+            matriz (numpy array): matriz de julgamento com comparações ausentes representadas por NaN
+        
+        Returns:
+            message (str): texto indicando o veredito do processo
+            status (int): código indicando o status do processo
+        """
+        logger.debug("Checando a conectividade das comparações da matriz de julgamento")
+        alcancados = self.componente_conexo(matriz, 0)
+        if not alcancados.all():
+            isolados = ", ".join(str(i) for i in np.flatnonzero(~alcancados))
+            message = f"As comparações conhecidas não ligam todos os critérios (sem ligação com o critério 0: {isolados})"
+            status = 400
+            return message, status
+        return "OK", 200
+
+    def componente_conexo(self, matriz, origem):
+        """
+        Função que encontra os critérios ligados a um critério de origem por comparações conhecidas,
+        por meio de uma busca em largura feita com produtos booleanos
+
+        Args:
+            matriz (numpy array): matriz de julgamento com comparações ausentes representadas por NaN
+            origem (int): critério de origem
         
+        Returns:
+            alcancados (numpy array): vetor booleano (n,) com os critérios ligados à origem
+        """
+        conhecidas = ~np.isnan(np.asarray(matriz, dtype=self.dtype))
+        alcancados = np.zeros(conhecidas.shape[0], dtype=bool)
+        alcancados[origem] = True
+        while True:
+            novos = alcancados | conhecidas[alcancados].any(axis=0)
+            if (novos == alcancados).all():
+                return alcancados
+            alcancados = novos
+
+    def laplaciano_comparacoes(self, matriz):
+        """
+        Função que monta o sistema do método dos mínimos quadrados logarítmicos (LLSM) sobre o grafo de
+        comparações: L . v = r, em que L é o laplaciano do grafo e ri é a soma de ln(aij) nas comparações
+        conhecidas da linha i
+
+        Args:
+            matriz (numpy array): matriz de julgamento com comparações ausentes representadas por NaN
+        
+        Returns:
+            laplaciano (numpy array): matriz (n, n) do laplaciano do grafo de comparações
+            termo (numpy array): vetor (n,) com as somas dos logaritmos por linha
+        """
+        matriz = np.asarray(matriz, dtype=np.float64)
+        conhecidas = ~np.isnan(matriz)
+        np.fill_diagonal(conhecidas, False)
+        logaritmos = np.where(conhecidas, np.log(np.where(conhecidas, matriz, 1.0)), 0.0)
+        adjacencia = conhecidas.astype(np.float64)
+        laplaciano = np.diag(adjacencia.sum(axis=1)) - adjacencia
+        return laplaciano, logaritmos.sum(axis=1)
+
+    def prioridade_incompleta(self, matriz):
+        """
+        Função que calcula o vetor prioridade de uma matriz com comparações ausentes (NaN) pelo método
+        dos mínimos quadrados logarítmicos restrito às comparações conhecidas. Em matrizes completas, o
+        resultado coincide com a média geométrica das linhas
+
+        Args:
+            matriz (numpy array): matriz de julgamento com comparações ausentes representadas por NaN
+        
+        Returns:
+            vetor_prioridade (numpy array): vetor prioridade (n, 1)
+        """
+        logger.debug("Calculando o vetor prioridade da matriz de julgamento incompleta")
+        message, status = self.checa_conectividade(matriz)
+        if status != 200:
+            raise ValueError(message)
+
+        laplaciano, termo = self.laplaciano_comparacoes(matriz)
+        tamanho = laplaciano.shape[0]
+        # O laplaciano é singular (as prioridades são definidas a menos de uma escala): fixa-se v0 = 0
+        if sparse is not None and tamanho >= TAMANHO_MINIMO_ESPARSO:
+            reduzido = spsolve(sparse.csr_matrix(laplaciano[1:, 1:]), termo[1:])
+        else:
+            reduzido = np.linalg.solve(laplaciano[1:, 1:], termo[1:])
+        logaritmos = np.concatenate([[0.0], reduzido])
+        vetor_prioridade = np.exp(logaritmos - logaritmos.max())
+        vetor_prioridade = vetor_prioridade / vetor_prioridade.sum()
+        return vetor_prioridade.astype(self.dtype).reshape((-1, 1))
+
+    def completa_matriz(self, matriz, vetor_prioridade):
+        """
+        Função que preenche as comparações ausentes com a razão entre as prioridades (wi / wj), o que
+        permite aplicar a análise de consistência às comparações conhecidas
+
+        Args:
+            matriz (numpy array): matriz de julgamento com comparações ausentes representadas por NaN
+            vetor_prioridade (numpy array): vetor prioridade (n, 1)
+        
+        Returns:
+            matriz_completa (numpy array): matriz de julgamento sem comparações ausentes
+        """
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        pesos = np.asarray(vetor_prioridade, dtype=self.dtype).reshape(-1)
+        return np.where(np.isnan(matriz), pesos[:, np.newaxis] / pesos[np.newaxis, :], matriz)
+
+    def proxima_comparacao(self, matriz):
+        """
+        Função que sugere a próxima comparação a ser perguntada ao tomador de decisão. Se o grafo de
+        comparações não estiver conectado, sugere um par que ligue o critério 0 a um critério isolado;
+        caso contrário, o par ausente de maior resistência efetiva no grafo, isto é, aquele cuja
+        razão de prioridades é estimada com maior variância pelo LLSM
+
+        Args:
+            matriz (numpy array): matriz de julgamento com comparações ausentes representadas por NaN
+        
+        Returns:
+            par (tuple): índices (i, j) da comparação sugerida, ou None se a matriz estiver completa
+        """
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        ausentes = np.triu(np.isnan(matriz), k=1)
+        if not ausentes.any():
+            return None
+
+        alcancados = self.componente_conexo(matriz, 0)
+        if not alcancados.all():
+            return 0, int(np.flatnonzero(~alcancados)[0])
+
+        laplaciano, _ = self.laplaciano_comparacoes(matriz)
+        pseudo_inversa = np.linalg.pinv(laplaciano)
+        diagonal = np.diagonal(pseudo_inversa)
+        resistencias = diagonal[:, np.newaxis] + diagonal[np.newaxis, :] - 2 * pseudo_inversa
+        resistencias = np.where(ausentes, resistencias, -np.inf)
+        i, j = np.unravel_index(np.argmax(resistencias), resistencias.shape)
+        return int(i), int(j)
+
+# Limites do índice de consistência geométrico (GCI) propostos por Aguarón e Moreno-Jiménez, equivalentes
+# à razão de consistência de 10% de Saaty, indexados pela quantidade de critérios (acima de 4 vale o último)
+LIMITES_GCI = {3: 0.31, 4: 0.35}
+LIMITE_GCI = 0.37
+
+# Classe base das estratégias de priorização: cada estratégia deriva os vetores prioridade e o índice de
+# consistência correspondente de uma matriz (n, n) ou de uma pilha (k, n, n) de matrizes de julgamento
+class Priorizacao(ABC):
+    nome = None
+    indice = "da razão de consistência"
+    unidade = "%"
+    aceita_ausentes = False
+
+    def __init__(self, tolerancia = 1e-10, max_iteracoes = 100, dtype = np.float64) -> None:
+        """
+        Args:
+            tolerancia (float): tolerância de convergência dos métodos iterativos
+            max_iteracoes (int): quantidade máxima de iterações dos métodos iterativos
+            dtype (numpy dtype): precisão dos cálculos, float64 (padrão) ou float32
+        """
+        self.tolerancia = tolerancia
+        self.max_iteracoes = max_iteracoes
+        self.dtype = valida_precisao(dtype)
+        self.class_matriz_julgamento = MatrizJulgamento(self.dtype)
+
+    @abstractmethod
+    def prioridades(self, matriz):
+        """
+        Função que calcula o vetor prioridade
+
+        Args:
+            matriz (numpy array): matriz de julgamento (n, n) ou pilha de matrizes (k, n, n)
+
+        Returns:
+            vetor_prioridade (numpy array): vetor prioridade (n, 1) ou pilha de vetores (k, n, 1)
+        """
+
+    @abstractmethod
+    def consistencia(self, matriz, vetor_prioridade):
+        """
+        Função que calcula o índice de consistência associado ao método
+
+        Args:
+            matriz (numpy array): matriz de julgamento (n, n) ou pilha de matrizes (k, n, n)
+            vetor_prioridade (numpy array): vetor prioridade (n, 1) ou pilha de vetores (k, n, 1)
+
+        Returns:
+            consistencia (float, numpy array): índice de consistência (vetor (k,) para pilhas)
+        """
+
+    def limite(self, tamanho):
+        """
+        Função que devolve o maior índice de consistência aceito
+
+        Args:
+            tamanho (int): quantidade de critérios da matriz de julgamento
+
+        Returns:
+            limite (float): maior valor aceito do índice de consistência
+        """
+        return 10
+
+    def mensagem_reprovacao(self, consistencia, tamanho):
+        """
+        Função que monta a mensagem de reprovação no teste de consistência
+
+        Args:
+            consistencia (float): índice de consistência encontrado
+            tamanho (int): quantidade de critérios da matriz de julgamento
+
+        Returns:
+            message (str): texto indicando o veredito do processo
+        """
+        return f"""O teste de consistência da matriz de julgamento reprovou as prioridades definidas.\n
+                        O resultando {self.indice} deve ser menor que {self.limite(tamanho)}{self.unidade}. O valor encontrado foi
+                        {consistencia}"""
+
+# Classe que calcula as prioridades pela normalização das colunas (média aditiva) e a consistência pela razão de Saaty
+class PriorizacaoAditiva(Priorizacao):
+    nome = "aproximado"
+
+    def prioridades(self, matriz):
+        return self.class_matriz_julgamento.normalizacao_julgamentos(matriz)
+
+    def consistencia(self, matriz, vetor_prioridade):
+        return self.class_matriz_julgamento.analise_consistencia(matriz, vetor_prioridade)
+
+# Classe que calcula as prioridades pelo autovetor principal (método das potências) e a consistência pela
+# razão de Saaty, com o autovalor máximo estimado pela soma de A.w
+class PriorizacaoAutovetor(Priorizacao):
+    nome = "autovetor"
+
+    def prioridades(self, matriz):
+        vetor_prioridade, _ = self.class_matriz_julgamento.autovetor_principal(matriz, self.tolerancia, self.max_iteracoes)
+        return vetor_prioridade
+
+    def consistencia(self, matriz, vetor_prioridade):
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        lambda_max = np.matmul(matriz, vetor_prioridade).sum(axis=(-2, -1))
+        if matriz.ndim == 2:
+            lambda_max = float(lambda_max)
+        return self.class_matriz_julgamento.razao_consistencia(lambda_max, matriz.shape[-1])
+
+# Classe que calcula as prioridades pela média geométrica das linhas, feita no espaço logarítmico para
+# evitar estouros no produto, e a consistência pelo índice de consistência geométrico (GCI):
+# GCI = 2 / ((n - 1)(n - 2)) . soma, para i < j, de ln²(aij . wj / wi)
+class PriorizacaoGeometrica(Priorizacao):
+    nome = "geometrica"
+    indice = "do índice de consistência geométrico"
+    unidade = ""
+
+    def prioridades(self, matriz):
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        logaritmos = np.log(matriz).mean(axis=-1, keepdims=True)
+        vetor_prioridade = np.exp(logaritmos - logaritmos.max(axis=-2, keepdims=True))
+        vetor_prioridade /= vetor_prioridade.sum(axis=-2, keepdims=True)
+        return vetor_prioridade
+
+    def erros(self, matriz, vetor_prioridade):
+        """
+        Função que calcula os erros logarítmicos eij = ln(aij) + ln(wj) - ln(wi) de cada comparação
+
+        Args:
+            matriz (numpy array): matriz de julgamento (n, n) ou pilha de matrizes (k, n, n)
+            vetor_prioridade (numpy array): vetor prioridade (n, 1) ou pilha de vetores (k, n, 1)
+
+        Returns:
+            erros (numpy array): matriz (n, n) ou pilha (k, n, n) de erros (NaN nas comparações ausentes)
+        """
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        pesos = np.log(np.asarray(vetor_prioridade, dtype=self.dtype).reshape(matriz.shape[:-1]))
+        return np.log(matriz) + pesos[..., np.newaxis, :] - pesos[..., :, np.newaxis]
+
+    def consistencia(self, matriz, vetor_prioridade):
+        tamanho = np.shape(matriz)[-1]
+        erros = self.erros(matriz, vetor_prioridade)
+        if tamanho <= 2:
+            gci = np.zeros(erros.shape[:-2], dtype=self.dtype)
+        else:
+            # Como eji = -eij, a soma sobre i < j é metade da soma sobre a matriz inteira
+            gci = np.square(erros).sum(axis=(-2, -1)) / ((tamanho - 1) * (tamanho - 2))
+        if erros.ndim == 2:
+            return float(gci)
+        return gci
+
+    def limite(self, tamanho):
+        return LIMITES_GCI.get(tamanho, LIMITE_GCI)
+
+# Classe que calcula as prioridades pelo método dos mínimos quadrados logarítmicos (LLSM), aceitando
+# comparações ausentes (NaN). Em pilhas, os sistemas (L + 11'/n) . v = r de todos os modelos são
+# resolvidos de uma vez; a parcela 11'/n fixa a soma dos logaritmos em zero e torna o laplaciano
+# inversível quando o grafo de comparações é conexo. Em matrizes completas, coincide com a média geométrica
+class PriorizacaoMinimosQuadrados(PriorizacaoGeometrica):
+    nome = "llsm"
+    aceita_ausentes = True
+
+    def conectados(self, conhecidas):
+        """
+        Função que verifica, para toda a pilha, se as comparações conhecidas ligam todos os critérios
+
+        Args:
+            conhecidas (numpy array): pilha (k, n, n) booleana das comparações conhecidas
+
+        Returns:
+            conectados (numpy array): vetor booleano (k,) com os modelos de grafo conexo
+        """
+        alcancados = np.zeros(conhecidas.shape[:-1], dtype=bool)
+        alcancados[:, 0] = True
+        while True:
+            novos = alcancados | (alcancados[:, :, np.newaxis] & conhecidas).any(axis=1)
+            if (novos == alcancados).all():
+                return alcancados.all(axis=1)
+            alcancados = novos
+
+    def prioridades(self, matriz):
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        if matriz.ndim == 2:
+            return self.class_matriz_julgamento.prioridade_incompleta(matriz)
+
+        k, tamanho, _ = matriz.shape
+        conhecidas = ~np.isnan(matriz)
+        conhecidas[:, np.arange(tamanho), np.arange(tamanho)] = False
+        with np.errstate(divide="ignore", invalid="ignore"):
+            logaritmos = np.where(conhecidas, np.log(np.where(conhecidas, matriz, 1.0)), 0.0)
+        adjacencia = conhecidas.astype(np.float64)
+        sistema = -adjacencia
+        sistema[:, np.arange(tamanho), np.arange(tamanho)] = adjacencia.sum(axis=-1)
+        sistema += 1.0 / tamanho
+        termo = logaritmos.sum(axis=-1, keepdims=True)
+
+        # Modelos desconexos teriam sistema singular: são resolvidos com a identidade e marcados com NaN
+        conectados = self.conectados(conhecidas)
+        sistema[~conectados] = np.eye(tamanho)
+        termo[~np.isfinite(termo)] = 0.0
+        logaritmos = np.linalg.solve(sistema, termo)
+        vetor_prioridade = np.exp(logaritmos - logaritmos.max(axis=-2, keepdims=True))
+        vetor_prioridade /= vetor_prioridade.sum(axis=-2, keepdims=True)
+        vetor_prioridade[~conectados] = np.nan
+        return vetor_prioridade.astype(self.dtype)
+
+    def consistencia(self, matriz, vetor_prioridade):
+        # Nas matrizes incompletas, a média dos erros quadráticos é tomada sobre as comparações conhecidas
+        # e escalada como se a matriz fosse completa, o que preserva os limites do GCI
+        tamanho = np.shape(matriz)[-1]
+        erros = self.erros(matriz, vetor_prioridade)
+        if tamanho <= 2:
+            gci = np.zeros(erros.shape[:-2], dtype=self.dtype)
+        else:
+            conhecidas = ~np.isnan(erros)
+            quantidade = np.maximum(conhecidas.sum(axis=(-2, -1)) - tamanho, 1)
+            media = np.square(np.where(conhecidas, erros, 0.0)).sum(axis=(-2, -1)) / quantidade
+            gci = media * tamanho / (tamanho - 2)
+        if erros.ndim == 2:
+            return float(gci)
+        return gci
+
+# Classe que mantém o comportamento do método 'incompleto': prioridades pelo LLSM e consistência pela
+# razão de Saaty da matriz completada com as razões wi / wj nas comparações ausentes
+class PriorizacaoIncompleta(PriorizacaoMinimosQuadrados):
+    nome = "incompleto"
+    indice = Priorizacao.indice
+    unidade = Priorizacao.unidade
+
+    def consistencia(self, matriz, vetor_prioridade):
+        matriz = np.asarray(matriz, dtype=self.dtype)
+        pesos = np.asarray(vetor_prioridade, dtype=self.dtype).reshape(matriz.shape[:-1])
+        razoes = pesos[..., :, np.newaxis] / pesos[..., np.newaxis, :]
+        matriz_completa = np.where(np.isnan(matriz), razoes, matriz)
+        return self.class_matriz_julgamento.analise_consistencia(matriz_completa, vetor_prioridade)
+
+    def limite(self, tamanho):
+        return Priorizacao.limite(self, tamanho)
+
+# Estratégias de priorização disponíveis, indexadas pelo nome do método
+PRIORIZACOES = {classe.nome: classe for classe in (PriorizacaoAditiva, PriorizacaoAutovetor, PriorizacaoGeometrica,
+                                                   PriorizacaoMinimosQuadrados, PriorizacaoIncompleta)}
+
+def obtem_priorizacao(metodo, tolerancia = 1e-10, max_iteracoes = 100, dtype = np.float64):
+    """
+    Função que devolve a estratégia de priorização de um método
+
+    Args:
+        metodo (str, Priorizacao): nome do método (chave de PRIORIZACOES) ou uma estratégia já instanciada
+        tolerancia (float): tolerância de convergência dos métodos iterativos
+        max_iteracoes (int): quantidade máxima de iterações dos métodos iterativos
+        dtype (numpy dtype): precisão dos cálculos, float64 (padrão) ou float32
+
+    Returns:
+        priorizacao (Priorizacao): estratégia de priorização
+    """
+    if isinstance(metodo, Priorizacao):
+        return metodo
+    if metodo not in PRIORIZACOES:
+        raise ValueError(f"O método deve ser um entre {', '.join(repr(nome) for nome in PRIORIZACOES)}")
+    return PRIORIZACOES[metodo](tolerancia, max_iteracoes, dtype)
+
+# Classe que mantém o estado de uma matriz de julgamento editada interativamente. A cada alteração de
+# um julgamento, as somas das colunas, o vetor prioridade e as pontuações das alternativas são
+# atualizados de forma incremental, sem recalcular tudo. A razão de consistência é calculada como no
+# AHP: pela análise de consistência do vetor aproximado ou pelo autovalor máximo no método do autovetor
+class MatrizJulgamentoIncremental:
+    def __init__(self, matriz, matriz_decisao = None, lista_referencia_monotomica = None, metodo = "aproximado",
+                 tolerancia = 1e-10, max_iteracoes = 100, intervalo_recalculo = 1000) -> None:
+        """
+        Args:
+            matriz (numpy array): matriz de julgamento inicial (n, n)
+            matriz_decisao (numpy array): matriz de decisão (m, n), opcional, para manter as pontuações
+            lista_referencia_monotomica (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+            metodo (str): 'aproximado' (normalização das colunas) ou 'autovetor' (método das potências)
+            tolerancia (float): tolerância de convergência do método das potências
+            max_iteracoes (int): quantidade máxima de iterações do método das potências
+            intervalo_recalculo (int): quantidade de atualizações após a qual tudo é recalculado do zero,
+            eliminando o acúmulo de erros de arredondamento
+        """
+        logger.debug("Iniciando a classe da matriz de julgamento incremental")
+        if metodo not in ("aproximado", "autovetor"):
+            raise ValueError("O método deve ser 'aproximado' ou 'autovetor'")
+        self.class_matriz_julgamento = MatrizJulgamento()
+        self.matriz = np.array(matriz, dtype=np.float64)
+        for verificacao in (self.class_matriz_julgamento.verifica_qualidade_matriz, self.class_matriz_julgamento.checa_reciprocidade):
+            message, status = verificacao(self.matriz)
+            if status != 200:
+                raise ValueError(message)
+
+        self.tamanho = self.matriz.shape[0]
+        self.metodo = metodo
+        self.tolerancia = tolerancia
+        self.max_iteracoes = max_iteracoes
+        self.intervalo_recalculo = intervalo_recalculo
+        self.matriz_normalizada = None
+        if matriz_decisao is not None:
+            if lista_referencia_monotomica is None:
+                lista_referencia_monotomica = [1] * self.tamanho
+            self.matriz_normalizada = MatrizDecisao().normalizacao_decisao(matriz_decisao, lista_referencia_monotomica)
+        self.recalcula()
+
+    def recalcula(self):
+        """
+        Função que recalcula todo o estado a partir da matriz atual
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        mj = self.class_matriz_julgamento
+        self.soma_colunas = self.matriz.sum(axis=0)
+        self.lambda_max = None
+        if self.metodo == "autovetor":
+            self.vetor_prioridade, self.lambda_max = mj.autovetor_principal(self.matriz, self.tolerancia, self.max_iteracoes)
+        else:
+            self.vetor_prioridade = (self.matriz / self.soma_colunas).mean(axis=1, keepdims=True)
+        self._consistencia = None
+
+        self.resultado = None
+        if self.matriz_normalizada is not None:
+            # Com o método aproximado, resultado = (1/n) . (N . A) . (1 / somas); guardar N . A permite
+            # atualizar as pontuações em O(m) quando apenas duas colunas de A mudam
+            if self.metodo == "aproximado":
+                self.produto_decisao = np.matmul(self.matriz_normalizada, self.matriz)
+            self.resultado = np.matmul(self.matriz_normalizada, self.vetor_prioridade)
+        self.atualizacoes = 0
+
+    @property
+    def consistencia(self):
+        # No método aproximado, a razão é calculada em O(n²) apenas quando consultada, e guardada até a
+        # próxima alteração
+        if self._consistencia is None:
+            mj = self.class_matriz_julgamento
+            if self.metodo == "autovetor":
+                self._consistencia = mj.razao_consistencia(self.lambda_max, self.tamanho)
+            else:
+                self._consistencia = mj.analise_consistencia(self.matriz, self.vetor_prioridade)
+        return self._consistencia
+
+    def atualiza(self, i, j, valor):
+        """
+        Função que altera o julgamento aij (mantendo aji = 1 / aij) e atualiza o estado de forma
+        incremental: apenas as colunas i e j mudam, então as somas das colunas e o vetor prioridade
+        aproximado são corrigidos em O(n) e as pontuações recebem, em O(m), apenas a correção das duas
+        colunas alteradas. No método do autovetor, o método das potências parte do autovetor anterior
+
+        Args:
+            i (int): linha do julgamento
+            j (int): coluna do julgamento
+            valor (float): novo valor de aij
+
+        Returns:
+            None
+        """
+        if i == j:
+            raise ValueError("A diagonal da matriz de julgamento deve ser composta apenas pelo elemento 1")
+        if not valor > 0:
+            raise ValueError("Os julgamentos devem ser positivos")
+
+        delta_ij = valor - self.matriz[i, j]
+        delta_ji = 1.0 / valor - self.matriz[j, i]
+        colunas = [i, j]
+        colunas_anteriores = self.matriz[:, colunas] / self.soma_colunas[colunas]
+
+        self.matriz[i, j] = valor
+        self.matriz[j, i] = 1.0 / valor
+        somas_anteriores = self.soma_colunas[colunas].copy()
+        self.soma_colunas[j] += delta_ij
+        self.soma_colunas[i] += delta_ji
+
+        self._consistencia = None
+
+        if self.metodo == "aproximado":
+            colunas_novas = self.matriz[:, colunas] / self.soma_colunas[colunas]
+            self.vetor_prioridade += (colunas_novas - colunas_anteriores).sum(axis=1, keepdims=True) / self.tamanho
+            if self.resultado is not None:
+                produto_anterior = self.produto_decisao[:, colunas] / somas_anteriores
+                self.produto_decisao[:, j] += self.matriz_normalizada[:, i] * delta_ij
+                self.produto_decisao[:, i] += self.matriz_normalizada[:, j] * delta_ji
+                produto_novo = self.produto_decisao[:, colunas] / self.soma_colunas[colunas]
+                self.resultado += (produto_novo - produto_anterior).sum(axis=1, keepdims=True) / self.tamanho
+        else:
+            autovetor, self.lambda_max = self.class_matriz_julgamento.autovetor_principal(
+                self.matriz, self.tolerancia, self.max_iteracoes, vetor_inicial=self.vetor_prioridade)
+            variacao = autovetor - self.vetor_prioridade
+            self.vetor_prioridade = autovetor
+            if self.resultado is not None:
+                self.resultado += np.matmul(self.matriz_normalizada, variacao)
+
+        self.atualizacoes += 1
+        if self.atualizacoes >= self.intervalo_recalculo:
+            self.recalcula()
+
 class MatrizDecisao:
-    def __init__(self) -> None:
-        logging.info("Iniciando a classe da matriz de decisão")
+    def __init__(self, dtype = np.float64) -> None:
+        logger.debug("Iniciando a classe da matriz de decisão")
+        self.dtype = valida_precisao(dtype)
 
-    def normalizacao_decisao(self, matriz_decisao, lista_referencia_monotomica):
+    def normalizacao_decisao(self, matriz_decisao, lista_referencia_monotomica, out = None):
         """
         Função que normaliza os valores da matriz de decisão (converte-os para uma mesma unidade
         comparável, em percentuais)
 
         Args:
-            matriz (numpy array): matriz de julgamento
+            matriz (numpy array): matriz de decisão (m, n) ou pilha de matrizes (k, m, n)
             lista_referencia_monotomica (list): lista contendo '-1' (critério monotômico de custo) ou
-            '1' (critério monotômico de lucro)
+            '1' (critério monotômico de lucro). Para pilhas, também aceita uma matriz (k, n) com uma
+            lista por modelo
+            out (numpy array): matriz (m, n) ou pilha (k, m, n) pré-alocada que recebe o resultado
+            (opcional). Permite reaproveitar a mesma área de memória entre chamadas
         
         Returns:
             matriz_normalizada (numpy array): matriz normalizada com as adequações necessárias
         """
-        logging.info("Normalizando os valores da matriz de decisão (descrição em percentuais)")
-        matriz_auxiliar = matriz_decisao
-        for i in range(len(lista_referencia_monotomica)):
-            if lista_referencia_monotomica[i] == -1:
-                matriz_auxiliar[:, i] =  1.0 / matriz_auxiliar[:, i]
+        logger.debug("Normalizando os valores da matriz de decisão (descrição em percentuais)")
+        matriz_decisao = np.asarray(matriz_decisao, dtype=self.dtype)
+        custo = np.asarray(lista_referencia_monotomica) == -1
+        if custo.ndim == 2:
+            custo = custo[:, np.newaxis, :]
+        if out is None:
+            out = np.empty(matriz_decisao.shape, dtype=self.dtype)
+        # A matriz recebida nunca é alterada: a inversão dos critérios de custo é escrita em 'out'
+        np.copyto(out, matriz_decisao)
+        np.divide(1.0, matriz_decisao, out=out, where=custo)
         
-        soma_linhas = np.sum(matriz_auxiliar, axis = 0, dtype='f')
-        matriz_normalizada = matriz_auxiliar / soma_linhas
+        soma_linhas = np.sum(out, axis = -2, keepdims = True)
+        matriz_normalizada = np.divide(out, soma_linhas, out=out)
         return matriz_normalizada
 
+# Classe que mantém uma matriz de decisão que ganha e perde alternativas continuamente. São guardados
+# os valores brutos (com os critérios de custo invertidos) e a soma de cada coluna, de forma que
+# incluir, remover ou alterar uma alternativa custa O(n), sem renormalizar a matriz. Como
+# (X / soma) . w = X . (w / soma), a normalização é aplicada aos pesos no momento da leitura
+class MatrizDecisaoIncremental:
+    def __init__(self, vetor_prioridade, lista_referencia_monotomica, matriz_decisao = None, alternativas = None,
+                 capacidade = 1024, intervalo_recalculo = 100000) -> None:
+        """
+        Args:
+            vetor_prioridade (numpy array): vetor prioridade (n, 1) dos critérios
+            lista_referencia_monotomica (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+            matriz_decisao (numpy array): matriz de decisão (m, n) inicial (opcional)
+            alternativas (list): identificadores das alternativas iniciais (por padrão, 0 a m - 1)
+            capacidade (int): quantidade de linhas reservadas inicialmente (a reserva dobra quando esgota)
+            intervalo_recalculo (int): quantidade de alterações após a qual as somas das colunas são
+            recalculadas do zero, eliminando o acúmulo de erros de arredondamento
+        """
+        logger.debug("Iniciando a classe da matriz de decisão incremental")
+        self.vetor_prioridade = np.asarray(vetor_prioridade, dtype=np.float64).reshape(-1)
+        self.custo = np.asarray(lista_referencia_monotomica) == -1
+        if len(self.custo) != len(self.vetor_prioridade):
+            raise ValueError("A lista de referência deve ter um valor para cada critério do vetor prioridade")
+        self.tamanho = len(self.custo)
+        self.intervalo_recalculo = intervalo_recalculo
+        self.valores = np.empty((max(1, capacidade), self.tamanho))
+        self.soma_colunas = np.zeros(self.tamanho)
+        self.alternativas = []
+        self.linhas = {}
+        self.alteracoes = 0
+        self.pesos_normalizados = None
+
+        if matriz_decisao is not None:
+            matriz_decisao = np.asarray(matriz_decisao, dtype=np.float64)
+            if alternativas is None:
+                alternativas = list(range(matriz_decisao.shape[0]))
+            ajustada = self.ajusta(matriz_decisao)
+            self.reserva(ajustada.shape[0])
+            self.valores[:ajustada.shape[0]] = ajustada
+            self.soma_colunas = ajustada.sum(axis=0)
+            self.alternativas = list(alternativas)
+            self.linhas = {alternativa: linha for linha, alternativa in enumerate(self.alternativas)}
+            if len(self.linhas) != len(self.alternativas):
+                raise ValueError("Os identificadores das alternativas devem ser únicos")
+
+    def __len__(self):
+        return len(self.alternativas)
+
+    def ajusta(self, valores):
+        """
+        Função que confere os valores de uma ou mais alternativas e inverte os critérios de custo
+
+        Args:
+            valores (numpy array): valores (n,) de uma alternativa ou (m, n) de várias
+
+        Returns:
+            ajustados (numpy array): valores com os critérios de custo substituídos por 1 / valor
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        if valores.shape[-1] != self.tamanho:
+            raise ValueError("A matriz de decisão deve ter uma coluna para cada critério do vetor prioridade")
+        if not np.all(np.isfinite(valores)) or np.any(valores[..., self.custo] <= 0):
+            raise ValueError("Os valores devem ser finitos e os critérios de custo, positivos")
+        ajustados = valores.copy()
+        np.divide(1.0, valores, out=ajustados, where=self.custo)
+        return ajustados
+
+    def reserva(self, quantidade):
+        """
+        Função que garante espaço para a quantidade de linhas informada, dobrando a reserva quando necessário
+
+        Args:
+            quantidade (int): quantidade de linhas necessárias
+
+        Returns:
+            None
+        """
+        if quantidade <= self.valores.shape[0]:
+            return
+        capacidade = self.valores.shape[0]
+        while capacidade < quantidade:
+            capacidade *= 2
+        valores = np.empty((capacidade, self.tamanho))
+        valores[:len(self.alternativas)] = self.valores[:len(self.alternativas)]
+        self.valores = valores
+
+    def registra_alteracao(self):
+        self.pesos_normalizados = None
+        self.alteracoes += 1
+        if self.alteracoes >= self.intervalo_recalculo:
+            self.soma_colunas = self.valores[:len(self.alternativas)].sum(axis=0)
+            self.alteracoes = 0
+
+    def adiciona(self, alternativa, valores):
+        """
+        Função que inclui uma alternativa em O(n)
+
+        Args:
+            alternativa (hashable): identificador da alternativa
+            valores (numpy array): valores (n,) da alternativa em cada critério
+
+        Returns:
+            None
+        """
+        if alternativa in self.linhas:
+            raise ValueError(f"A alternativa {alternativa} já existe")
+        ajustados = self.ajusta(valores)
+        linha = len(self.alternativas)
+        self.reserva(linha + 1)
+        self.valores[linha] = ajustados
+        self.soma_colunas += ajustados
+        self.alternativas.append(alternativa)
+        self.linhas[alternativa] = linha
+        self.registra_alteracao()
+
+    def remove(self, alternativa):
+        """
+        Função que remove uma alternativa em O(n): a última linha ocupa o lugar da removida, o que muda
+        a posição (e não o identificador) da alternativa movida
+
+        Args:
+            alternativa (hashable): identificador da alternativa
+
+        Returns:
+            None
+        """
+        linha = self.linhas.pop(alternativa)
+        self.soma_colunas -= self.valores[linha]
+        ultima = len(self.alternativas) - 1
+        if linha != ultima:
+            self.valores[linha] = self.valores[ultima]
+            movida = self.alternativas[ultima]
+            self.alternativas[linha] = movida
+            self.linhas[movida] = linha
+        self.alternativas.pop()
+        self.registra_alteracao()
+
+    def altera(self, alternativa, valores):
+        """
+        Função que substitui os valores de uma alternativa em O(n)
+
+        Args:
+            alternativa (hashable): identificador da alternativa
+            valores (numpy array): novos valores (n,) da alternativa
+
+        Returns:
+            None
+        """
+        linha = self.linhas[alternativa]
+        ajustados = self.ajusta(valores)
+        self.soma_colunas += ajustados - self.valores[linha]
+        self.valores[linha] = ajustados
+        self.registra_alteracao()
+
+    def altera_pesos(self, vetor_prioridade):
+        """
+        Função que substitui o vetor prioridade dos critérios (por exemplo, após uma nova matriz de julgamento)
+
+        Args:
+            vetor_prioridade (numpy array): vetor prioridade (n, 1)
+
+        Returns:
+            None
+        """
+        vetor_prioridade = np.asarray(vetor_prioridade, dtype=np.float64).reshape(-1)
+        if vetor_prioridade.shape != (self.tamanho,):
+            raise ValueError("O vetor prioridade deve ter um valor para cada critério")
+        self.vetor_prioridade = vetor_prioridade
+        self.pesos_normalizados = None
+
+    def pesos(self):
+        """
+        Função que incorpora a normalização das colunas aos pesos (w / soma), calculados uma vez por alteração
+
+        Args:
+            None
+
+        Returns:
+            pesos_normalizados (numpy array): vetor (n,)
+        """
+        if self.pesos_normalizados is None:
+            self.pesos_normalizados = self.vetor_prioridade / self.soma_colunas
+        return self.pesos_normalizados
+
+    def pontuacao(self, alternativa):
+        """
+        Função que calcula, em O(n), a relevância de uma alternativa
+
+        Args:
+            alternativa (hashable): identificador da alternativa
+
+        Returns:
+            pontuacao (float): relevância da alternativa
+        """
+        return float(self.valores[self.linhas[alternativa]] @ self.pesos())
+
+    def resultado(self, out = None):
+        """
+        Função que calcula a relevância de todas as alternativas com um único produto matricial sobre os
+        valores guardados, sem montar a matriz normalizada
+
+        Args:
+            out (numpy array): vetor (m,) pré-alocado que recebe o resultado (opcional)
+
+        Returns:
+            resultado (numpy array): vetor (m, 1) na ordem de self.alternativas
+        """
+        linhas = len(self.alternativas)
+        if out is None:
+            out = np.empty(linhas)
+        np.matmul(self.valores[:linhas], self.pesos(), out=out)
+        return out.reshape((linhas, 1))
+
 class AHP:
-    def __init__(self, matriz_julgamento, matriz_decisao, lista_referencia_monotomica) -> None:
-        logging.info("Iniciando a classe AHP")
+    def __init__(self, matriz_julgamento, matriz_decisao, lista_referencia_monotomica, metodo = "aproximado",
+                 tolerancia = 1e-10, max_iteracoes = 100, tolerancia_validacao = 1e-6, dtype = np.float64) -> None:
+        """
+        Args:
+            matriz_julgamento (numpy array): matriz de julgamento dos critérios
+            matriz_decisao (numpy array): matriz de decisão (alternativas x critérios)
+            lista_referencia_monotomica (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+            metodo (str, Priorizacao): 'aproximado' (normalização das colunas), 'autovetor' (método das
+            potências), 'geometrica' (média geométrica das linhas, com GCI), 'llsm' (mínimos quadrados
+            logarítmicos, com GCI e aceitando comparações ausentes como NaN), 'incompleto' (LLSM com a
+            razão de consistência da matriz completada) ou uma estratégia de priorização instanciada
+            tolerancia (float): tolerância de convergência do método 'autovetor'
+            max_iteracoes (int): quantidade máxima de iterações do método 'autovetor'
+            tolerancia_validacao (float): erro aceito na diagonal e na reciprocidade da matriz de julgamento
+            dtype (numpy dtype): precisão dos cálculos, float64 (padrão) ou float32
+        """
+        logger.debug("Iniciando a classe AHP")
+        self.dtype = valida_precisao(dtype)
+        self.priorizacao = obtem_priorizacao(metodo, tolerancia, max_iteracoes, self.dtype)
         self.matriz_julgamento = matriz_julgamento
         self.matriz_decisao = matriz_decisao
         self.lista_referencia_monotomica = lista_referencia_monotomica
+        self.metodo = self.priorizacao.nome
+        self.tolerancia = tolerancia
+        self.max_iteracoes = max_iteracoes
+        self.tolerancia_validacao = tolerancia_validacao
+        # Preenchidos por executa_algoritmo, mesmo quando o teste de consistência reprova a matriz
+        self.vetor_prioridade = None
+        self.consistencia = None
     
-    def executa_algoritmo(self):
+    def executa_algoritmo(self, out = None, matriz_auxiliar = None):
         """
-        Função que executa o algoritmo e coordena os passos lógicos de sua execução
+        Função que executa o algoritmo e coordena os passos lógicos de sua execução. As matrizes
+        recebidas pela classe não são alteradas. O vetor prioridade e o índice de consistência
+        calculados ficam disponíveis nos atributos vetor_prioridade e consistencia
 
         Args:
-            None
+            out (numpy array): vetor (m, 1) pré-alocado que recebe o resultado (opcional)
+            matriz_auxiliar (numpy array): matriz (m, n) pré-alocada usada na normalização da matriz de
+            decisão (opcional)
         
         Returns:
             resultado (numpy array): vetor que indica, para cada alternativa, o qual sua relevância (ordem)
             no processo de tomada de decisão
         """
-        logging.info("Executando o algoritmo")
-        class_matriz_julgamento = MatrizJulgamento()
-        class_matriz_decisao = MatrizDecisao()
-        message, status = class_matriz_julgamento.verifica_qualidade_matriz(self.matriz_julgamento)
-        if status != 200:
-            raise ValueError(message)
-        
-        message, status = class_matriz_julgamento.checa_reciprocidade(self.matriz_julgamento)
+        logger.debug("Executando o algoritmo")
+        priorizacao = self.priorizacao
+        class_matriz_julgamento = priorizacao.class_matriz_julgamento
+        class_matriz_decisao = MatrizDecisao(self.dtype)
+        matriz_julgamento = np.asarray(self.matriz_julgamento, dtype=self.dtype)
+        with instrumentacao.etapa("validacao"):
+            message, status = class_matriz_julgamento.verifica_qualidade_matriz(matriz_julgamento, self.tolerancia_validacao)
+            if status == 200:
+                message, status = class_matriz_julgamento.checa_reciprocidade(matriz_julgamento, self.tolerancia_validacao,
+                                                                              permite_ausentes = priorizacao.aceita_ausentes)
+            forma_decisao = np.shape(self.matriz_decisao)
+            if status == 200 and (len(forma_decisao) != 2 or forma_decisao[1] != matriz_julgamento.shape[0]):
+                message, status = "A matriz de decisão deve ter uma coluna para cada critério da matriz de julgamento", 400
+            if status == 200 and np.shape(self.lista_referencia_monotomica) != (matriz_julgamento.shape[0],):
+                message, status = "A lista de referência deve ter um valor para cada critério da matriz de julgamento", 400
         if status != 200:
             raise ValueError(message)
         
-        vetor_prioridade = class_matriz_julgamento.normalizacao_julgamentos(self.matriz_julgamento)
-        consistencia = class_matriz_julgamento.analise_consistencia(self.matriz_julgamento, vetor_prioridade)
-        if consistencia > 10:
-            message = f"""O teste de consistência da matriz de julgamento reprovou as prioridades definidas.\n
-                        O resultando da razão de consistência deve ser menor que 10%. O valor encontrado foi
-                        {consistencia}"""
-            raise ValueError(message)
+        with instrumentacao.etapa("priorizacao"):
+            vetor_prioridade = priorizacao.prioridades(matriz_julgamento)
+        with instrumentacao.etapa("consistencia"):
+            consistencia = priorizacao.consistencia(matriz_julgamento, vetor_prioridade)
+        self.vetor_prioridade = vetor_prioridade
+        self.consistencia = consistencia
+        tamanho = matriz_julgamento.shape[0]
+        if not consistencia <= priorizacao.limite(tamanho):
+            raise ValueError(priorizacao.mensagem_reprovacao(consistencia, tamanho))
         
-        matriz_normalizada = class_matriz_decisao.normalizacao_decisao(self.matriz_decisao, self.lista_referencia_monotomica)
-        resultado = np.dot(matriz_normalizada, vetor_prioridade)
+        with instrumentacao.etapa("normalizacao"):
+            matriz_normalizada = class_matriz_decisao.normalizacao_decisao(self.matriz_decisao, self.lista_referencia_monotomica, out=matriz_auxiliar)
+        with instrumentacao.etapa("pontuacao"):
+            resultado = np.matmul(matriz_normalizada, vetor_prioridade, out=out)
         return resultado
+
+class AHPLote:
+    def __init__(self, matrizes_julgamento, matrizes_decisao, lista_referencia_monotomica, metodo = "aproximado",
+                 tolerancia = 1e-10, max_iteracoes = 100, tolerancia_validacao = 1e-6, dtype = np.float64) -> None:
+        """
+        Versão vetorizada do AHP, que avalia de uma só vez uma pilha de modelos com a mesma
+        quantidade de critérios
+
+        Args:
+            matrizes_julgamento (numpy array): pilha (k, n, n) de matrizes de julgamento
+            matrizes_decisao (numpy array): pilha (k, m, n) de matrizes de decisão
+            lista_referencia_monotomica (list, numpy array): lista com n valores '-1' (custo) ou '1' (lucro),
+            comum a todos os modelos, ou matriz (k, n) com uma lista por modelo
+            metodo (str, Priorizacao): nome de um dos métodos de PRIORIZACOES ('aproximado', 'autovetor',
+            'geometrica', 'llsm' ou 'incompleto') ou uma estratégia de priorização instanciada
+            tolerancia (float): tolerância de convergência do método 'autovetor'
+            max_iteracoes (int): quantidade máxima de iterações do método 'autovetor'
+            tolerancia_validacao (float): erro aceito na diagonal e na reciprocidade das matrizes de julgamento
+            dtype (numpy dtype): precisão dos cálculos, float64 (padrão) ou float32
+        """
+        logger.debug("Iniciando a classe AHPLote")
+        self.dtype = valida_precisao(dtype)
+        self.priorizacao = obtem_priorizacao(metodo, tolerancia, max_iteracoes, self.dtype)
+        self.metodo = self.priorizacao.nome
+        self.tolerancia = tolerancia
+        self.max_iteracoes = max_iteracoes
+        self.tolerancia_validacao = tolerancia_validacao
+        self.matrizes_julgamento = np.asarray(matrizes_julgamento, dtype=self.dtype)
+        self.matrizes_decisao = np.asarray(matrizes_decisao, dtype=self.dtype)
+        self.lista_referencia_monotomica = np.asarray(lista_referencia_monotomica)
+
+        if self.matrizes_julgamento.ndim != 3 or self.matrizes_decisao.ndim != 3:
+            raise ValueError("As matrizes de julgamento e de decisão devem ser pilhas tridimensionais (k, n, n) e (k, m, n)")
+        if self.matrizes_julgamento.shape[0] != self.matrizes_decisao.shape[0]:
+            raise ValueError("A quantidade de matrizes de julgamento deve ser igual à quantidade de matrizes de decisão")
+        k, _, n = self.matrizes_julgamento.shape
+        if self.lista_referencia_monotomica.shape not in ((n,), (k, n)):
+            raise ValueError(f"A lista de referência deve ter um valor para cada critério ({n},), comum a todos os "
+                             f"modelos, ou uma linha por modelo ({k}, {n}); o formato recebido foi "
+                             f"{self.lista_referencia_monotomica.shape}")
+
+    def valida_matrizes(self):
+        """
+        Função que aplica, a todos os modelos de uma vez, as verificações de diagonal principal e
+        de reciprocidade da matriz de julgamento
+
+        Args:
+            None
+
+        Returns:
+            validos (numpy array): vetor booleano (k,) indicando os modelos aprovados
+            status (list): lista de tuplas (message, status) com o veredito de cada modelo
+        """
+        logger.debug("Validando as matrizes de julgamento do lote")
+        matrizes = self.matrizes_julgamento
+        k, linhas, colunas = matrizes.shape
+        if linhas != colunas:
+            return np.zeros(k, dtype=bool), [("A matriz não é quadrada", 400)] * k
+
+        if self.matrizes_decisao.shape[2] != colunas:
+            message = "A matriz de decisão deve ter uma coluna para cada critério da matriz de julgamento"
+            return np.zeros(k, dtype=bool), [(message, 400)] * k
+
+        validos, violacoes = MatrizJulgamento(self.dtype).valida_matriz(matrizes, self.tolerancia_validacao,
+                                                                        permite_ausentes = self.priorizacao.aceita_ausentes)
+        status = [("OK", 200)] * k
+        if len(violacoes) > 0:
+            # As violações vêm ordenadas por modelo, o que permite agrupá-las sem laço por elemento
+            modelos, inicios = np.unique(violacoes[:, 0], return_index=True)
+            for modelo, grupo in zip(modelos, np.split(violacoes[:, 1:], inicios[1:])):
+                diagonal = [f"a{i}{j}" for i, j in grupo if i == j]
+                pares = [f"a{i}{j} deve ser igual a 1/a{j}{i}" for i, j in grupo if i != j]
+                if len(diagonal) > 0:
+                    message = f"A diagonal da matriz de julgamento deve ser composta apenas pelo elemento 1 (falha em {', '.join(diagonal)})"
+                else:
+                    message = f"Falha na reciprocidade: {'; '.join(pares)}"
+                status[modelo] = (message, 400)
+        return validos, status
+
+    def executa_algoritmo(self):
+        """
+        Função que executa o algoritmo para todos os modelos do lote sem laços por modelo. Modelos
+        reprovados na validação ou no teste de consistência não interrompem o processamento: seus
+        resultados são preenchidos com NaN e o motivo é registrado no status correspondente
+
+        Args:
+            None
+
+        Returns:
+            vetores_prioridade (numpy array): pilha (k, n, 1) de vetores prioridade
+            consistencias (numpy array): vetor (k,) com os índices de consistência do método (razão de
+            consistência em percentual ou GCI)
+            resultados (numpy array): pilha (k, m, 1) com a relevância de cada alternativa por modelo
+            status (list): lista de tuplas (message, status) com o veredito de cada modelo
+        """
+        logger.debug("Executando o algoritmo em lote")
+        k, m, n = self.matrizes_decisao.shape
+        with instrumentacao.etapa("validacao", k):
+            validos, status = self.valida_matrizes()
+        if not validos.any():
+            vazio = np.full((k, n, 1), np.nan, dtype=self.dtype)
+            return vazio, np.full(k, np.nan, dtype=self.dtype), np.full((k, m, 1), np.nan, dtype=self.dtype), status
+
+        matrizes = self.matrizes_julgamento
+        priorizacao = self.priorizacao
+        # Modelos reprovados na validação podem ter elementos não positivos, cujos logaritmos são descartados
+        with np.errstate(divide="ignore", invalid="ignore"):
+            with instrumentacao.etapa("priorizacao", k):
+                vetores_prioridade = priorizacao.prioridades(matrizes)
+            with instrumentacao.etapa("consistencia", k):
+                consistencias = priorizacao.consistencia(matrizes, vetores_prioridade)
+
+        # Normalização das matrizes de decisão, invertendo critérios de custo sem modificar a entrada
+        with instrumentacao.etapa("normalizacao", k), np.errstate(divide="ignore", invalid="ignore"):
+            matrizes_normalizadas = MatrizDecisao(self.dtype).normalizacao_decisao(self.matrizes_decisao,
+                                                                                   self.lista_referencia_monotomica)
+        with instrumentacao.etapa("pontuacao", k):
+            resultados = np.matmul(matrizes_normalizadas, vetores_prioridade)
+
+        # Modelos incompletos cujas comparações não ligam todos os critérios ficam sem vetor prioridade
+        desconexos = validos & ~np.isfinite(vetores_prioridade).all(axis=(-2, -1))
+        for indice in np.flatnonzero(desconexos):
+            status[indice] = ("As comparações conhecidas não ligam todos os critérios", 400)
+
+        reprovados_consistencia = validos & ~desconexos & ~(consistencias <= priorizacao.limite(n))
+        for indice in np.flatnonzero(reprovados_consistencia):
+            status[indice] = (priorizacao.mensagem_reprovacao(consistencias[indice], n), 400)
+
+        aprovados = validos & ~desconexos & ~reprovados_consistencia
+        vetores_prioridade[~validos] = np.nan
+        consistencias[~validos] = np.nan
+        resultados[~aprovados] = np.nan
+        return vetores_prioridade, consistencias, resultados, status
@@ -0,0 +1,290 @@
+import logging
+import numpy as np
+from ahp import MatrizJulgamento, TAMANHO_MINIMO_ESPARSO
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+logger = logging.getLogger(__name__)
+
+# Densidade (fração de elementos não nulos) acima da qual a potência da supermatriz deixa a
+# representação esparsa: o quadrado de uma matriz esparsa tende a ficar densa rapidamente
+DENSIDADE_MAXIMA_ESPARSA = 0.1
+
+# Classe que implementa o ANP (Analytic Network Process), em que critérios e alternativas podem
+# influenciar uns aos outros. Os nós são organizados em clusters; as comparações entre os nós de um
+# cluster em relação a um nó de controle formam os blocos da supermatriz não ponderada, e as
+# comparações entre clusters definem os pesos que a tornam estocástica por colunas (supermatriz
+# ponderada). As prioridades finais vêm da matriz limite, obtida por quadrados sucessivos
+class RedeANP:
+    def __init__(self, clusters, metodo = "aproximado", limite_consistencia = 10) -> None:
+        """
+        Args:
+            clusters (dict): nome de cada cluster e a lista com os nomes de seus nós (únicos na rede)
+            metodo (str): 'aproximado' (normalização das colunas) ou 'autovetor' (método das potências)
+            limite_consistencia (float): maior razão de consistência (em percentual) aceita nas comparações
+        """
+        logger.debug("Iniciando a classe RedeANP")
+        if metodo not in ("aproximado", "autovetor"):
+            raise ValueError("O método deve ser 'aproximado' ou 'autovetor'")
+        self.clusters = {nome: list(nos) for nome, nos in clusters.items()}
+        self.nos = [no for nos in self.clusters.values() for no in nos]
+        if len(set(self.nos)) != len(self.nos):
+            raise ValueError("Cada nó deve pertencer a um único cluster")
+        self.indices = {no: indice for indice, no in enumerate(self.nos)}
+        self.cluster_do_no = {no: nome for nome, nos in self.clusters.items() for no in nos}
+        self.indices_clusters = {nome: indice for indice, nome in enumerate(self.clusters)}
+        self.metodo = metodo
+        self.limite_consistencia = limite_consistencia
+        self.class_matriz_julgamento = MatrizJulgamento()
+        # Blocos (controle, cluster alvo) -> vetor prioridade; pesos dos clusters por cluster de controle
+        self.blocos = {}
+        self.pesos_clusters = {}
+
+    def prioridade_local(self, matriz_julgamento):
+        """
+        Função que calcula o vetor prioridade de uma matriz de comparações, aplicando as verificações do AHP
+
+        Args:
+            matriz_julgamento (numpy array): matriz de julgamento (k, k)
+
+        Returns:
+            vetor_prioridade (numpy array): vetor (k,)
+        """
+        mj = self.class_matriz_julgamento
+        matriz_julgamento = np.asarray(matriz_julgamento, dtype=np.float64)
+        for verificacao in (mj.verifica_qualidade_matriz, mj.checa_reciprocidade):
+            message, status = verificacao(matriz_julgamento)
+            if status != 200:
+                raise ValueError(message)
+        if self.metodo == "autovetor":
+            vetor_prioridade, lambda_max = mj.autovetor_principal(matriz_julgamento)
+            consistencia = mj.razao_consistencia(lambda_max, matriz_julgamento.shape[0])
+        else:
+            vetor_prioridade = mj.normalizacao_julgamentos(matriz_julgamento)
+            consistencia = mj.analise_consistencia(matriz_julgamento, vetor_prioridade)
+        if consistencia > self.limite_consistencia:
+            raise ValueError(f"""O teste de consistência da matriz de julgamento reprovou as prioridades definidas.\n
+                        O resultando da razão de consistência deve ser menor que {self.limite_consistencia}%. O valor encontrado foi
+                        {consistencia}""")
+        return vetor_prioridade[:, 0]
+
+    def compara_nos(self, no_controle, cluster, matriz_julgamento):
+        """
+        Função que registra a comparação entre os nós de um cluster em relação a um nó de controle
+
+        Args:
+            no_controle (str): nó em relação ao qual a comparação é feita (coluna da supermatriz)
+            cluster (str): cluster cujos nós são comparados (linhas da supermatriz), na ordem em que foram declarados
+            matriz_julgamento (numpy array): matriz de julgamento entre os nós do cluster
+
+        Returns:
+            vetor_prioridade (numpy array): prioridades locais dos nós do cluster
+        """
+        if len(self.clusters[cluster]) == 1:
+            vetor_prioridade = np.ones(1)
+        else:
+            vetor_prioridade = self.prioridade_local(matriz_julgamento)
+        return self.define_prioridades(no_controle, cluster, vetor_prioridade)
+
+    def define_prioridades(self, no_controle, cluster, vetor_prioridade):
+        """
+        Função que registra diretamente as prioridades dos nós de um cluster em relação a um nó de controle
+
+        Args:
+            no_controle (str): nó de controle
+            cluster (str): cluster cujos nós recebem as prioridades
+            vetor_prioridade (numpy array): prioridades não negativas, uma por nó do cluster
+
+        Returns:
+            vetor_prioridade (numpy array): prioridades normalizadas (soma 1)
+        """
+        vetor_prioridade = np.asarray(vetor_prioridade, dtype=np.float64).reshape(-1)
+        if no_controle not in self.indices:
+            raise ValueError(f"O nó {no_controle} não pertence à rede")
+        if vetor_prioridade.shape != (len(self.clusters[cluster]),):
+            raise ValueError(f"São necessárias {len(self.clusters[cluster])} prioridades para o cluster {cluster}")
+        if np.any(vetor_prioridade < 0) or not vetor_prioridade.sum() > 0:
+            raise ValueError("As prioridades devem ser não negativas e ter soma positiva")
+        vetor_prioridade = vetor_prioridade / vetor_prioridade.sum()
+        self.blocos[(no_controle, cluster)] = vetor_prioridade
+        return vetor_prioridade
+
+    def compara_clusters(self, cluster_controle, clusters, matriz_julgamento = None):
+        """
+        Função que registra a importância dos clusters que influenciam os nós de um cluster de controle
+
+        Args:
+            cluster_controle (str): cluster cujos nós são os nós de controle (colunas da supermatriz)
+            clusters (list): clusters comparados, na ordem da matriz de julgamento
+            matriz_julgamento (numpy array): matriz de julgamento entre os clusters. Quando None (ou com
+            um único cluster), os clusters recebem o mesmo peso
+
+        Returns:
+            pesos (dict): peso de cada cluster comparado
+        """
+        if matriz_julgamento is None or len(clusters) == 1:
+            vetor_prioridade = np.full(len(clusters), 1.0 / len(clusters))
+        else:
+            vetor_prioridade = self.prioridade_local(matriz_julgamento)
+        self.pesos_clusters[cluster_controle] = dict(zip(clusters, vetor_prioridade))
+        return self.pesos_clusters[cluster_controle]
+
+    def supermatriz_nao_ponderada(self):
+        """
+        Função que monta a supermatriz não ponderada: a coluna de cada nó de controle contém, em cada
+        bloco de cluster, as prioridades locais registradas (zero onde não há influência)
+
+        Args:
+            None
+
+        Returns:
+            supermatriz (numpy array): matriz (N, N), com N a quantidade de nós
+        """
+        supermatriz = np.zeros((len(self.nos), len(self.nos)))
+        for (no_controle, cluster), vetor_prioridade in self.blocos.items():
+            linhas = [self.indices[no] for no in self.clusters[cluster]]
+            supermatriz[linhas, self.indices[no_controle]] = vetor_prioridade
+        return supermatriz
+
+    def matriz_clusters(self):
+        """
+        Função que monta a matriz (C, C) de pesos dos clusters: a coluna de cada cluster de controle
+        contém o peso de cada cluster que o influencia. Clusters de controle sem comparação registrada
+        dão o mesmo peso a todos os clusters com blocos registrados
+
+        Args:
+            None
+
+        Returns:
+            matriz (numpy array): matriz (C, C) de pesos dos clusters
+        """
+        quantidade = len(self.clusters)
+        matriz = np.zeros((quantidade, quantidade))
+        for (no_controle, cluster) in self.blocos:
+            matriz[self.indices_clusters[cluster], self.indices_clusters[self.cluster_do_no[no_controle]]] = 1.0
+        for cluster_controle, pesos in self.pesos_clusters.items():
+            coluna = self.indices_clusters[cluster_controle]
+            matriz[:, coluna] = 0.0
+            for cluster, peso in pesos.items():
+                matriz[self.indices_clusters[cluster], coluna] = peso
+        somas = matriz.sum(axis=0)
+        return np.divide(matriz, somas, out=np.zeros_like(matriz), where=somas > 0)
+
+    def supermatriz_ponderada(self):
+        """
+        Função que pondera cada bloco da supermatriz pelo peso de seu cluster e renormaliza as colunas,
+        tornando a matriz estocástica por colunas. Colunas sem nenhuma influência (nós sumidouro)
+        recebem 1 na diagonal, de forma que o nó conserve o seu peso
+
+        Args:
+            None
+
+        Returns:
+            supermatriz (numpy array): matriz (N, N) estocástica por colunas
+        """
+        supermatriz = self.supermatriz_nao_ponderada()
+        clusters_nos = np.array([self.indices_clusters[self.cluster_do_no[no]] for no in self.nos])
+        pesos = self.matriz_clusters()[clusters_nos[:, np.newaxis], clusters_nos[np.newaxis, :]]
+        supermatriz *= pesos
+        somas = supermatriz.sum(axis=0)
+        sumidouros = ~(somas > 0)
+        supermatriz[:, ~sumidouros] /= somas[~sumidouros]
+        supermatriz[np.flatnonzero(sumidouros), np.flatnonzero(sumidouros)] = 1.0
+        return supermatriz
+
+    def matriz_limite(self, supermatriz = None, tolerancia = 1e-12, max_quadrados = 64, max_periodo = None):
+        """
+        Função que calcula a matriz limite por quadrados sucessivos (W, W^2, W^4, ...), o que exige
+        log2(k) produtos em vez dos k da multiplicação repetida. Quando a potência se estabiliza, é
+        conferido se ela é de fato estacionária (P . W = P). Em redes cíclicas a potência oscila com
+        algum período d; nesse caso o limite de Cesàro é a média das d potências consecutivas
+        P, P . W, ..., P . W^(d - 1). Redes grandes e esparsas começam em representação esparsa (scipy),
+        que passa a densa quando o preenchimento ultrapassa DENSIDADE_MAXIMA_ESPARSA
+
+        Args:
+            supermatriz (numpy array): supermatriz estocástica por colunas (por padrão, a supermatriz ponderada)
+            tolerancia (float): maior variação aceita entre duas potências para considerar a convergência
+            max_quadrados (int): quantidade máxima de quadrados
+            max_periodo (int): maior período procurado em redes cíclicas (por padrão, N)
+
+        Returns:
+            limite (numpy array): matriz limite (N, N)
+            periodo (int): período encontrado (1 quando a potência converge)
+        """
+        if supermatriz is None:
+            supermatriz = self.supermatriz_ponderada()
+        if sparse is not None and sparse.issparse(supermatriz):
+            # Supermatrizes já esparsas são mantidas nessa representação
+            supermatriz = sparse.csr_matrix(supermatriz, dtype=np.float64)
+            potencia = supermatriz
+        else:
+            supermatriz = np.asarray(supermatriz, dtype=np.float64)
+            potencia = supermatriz
+            if (sparse is not None and supermatriz.shape[0] >= TAMANHO_MINIMO_ESPARSO and
+                    np.count_nonzero(supermatriz) < DENSIDADE_MAXIMA_ESPARSA * supermatriz.size):
+                potencia = sparse.csr_matrix(supermatriz)
+        tamanho = supermatriz.shape[0]
+        max_periodo = max_periodo or tamanho
+
+        for quadrado in range(max_quadrados):
+            proxima = potencia @ potencia
+            if sparse is not None and sparse.issparse(proxima):
+                variacao = abs(proxima - potencia).max()
+                if proxima.nnz > DENSIDADE_MAXIMA_ESPARSA * tamanho * tamanho:
+                    proxima = proxima.toarray()
+            else:
+                # Renormalização das colunas, que elimina o acúmulo de erros de arredondamento
+                somas = proxima.sum(axis=0)
+                proxima = np.divide(proxima, somas, out=proxima, where=somas > 0)
+                variacao = np.abs(proxima - potencia).max()
+            potencia = proxima
+            if variacao < tolerancia:
+                logger.debug(f"Potência da supermatriz estabilizada após {quadrado + 1} quadrados")
+                break
+        else:
+            logger.debug(f"A potência da supermatriz não se estabilizou em {max_quadrados} quadrados")
+
+        if sparse is not None and sparse.issparse(potencia):
+            potencia = potencia.toarray()
+        escala = max(tolerancia, 1e-9)
+        # Procura o período: a menor quantidade d de multiplicações por W que retorna à mesma potência.
+        # As potências intermediárias são acumuladas em uma soma, sem guardar as d matrizes N x N
+        soma = potencia.copy()
+        atual = potencia
+        for periodo in range(1, max_periodo + 1):
+            atual = np.asarray(atual @ supermatriz)
+            if np.abs(atual - potencia).max() < escala:
+                if periodo > 1:
+                    logger.debug(f"Supermatriz cíclica com período {periodo}: usando o limite de Cesàro")
+                return soma / periodo, periodo
+            soma += atual
+        logger.warning(f"Não foi encontrado um período de até {max_periodo} passos; usando a média das potências")
+        return soma / (max_periodo + 1), max_periodo
+
+    def prioridades(self, cluster = None, no_controle = None, limite = None):
+        """
+        Função que extrai as prioridades finais da matriz limite
+
+        Args:
+            cluster (str): quando informado, apenas os nós do cluster são devolvidos, normalizados (soma 1)
+            no_controle (str): coluna da matriz limite usada (por exemplo, o objetivo). Quando None, usa-se
+            a média das colunas (em redes irredutíveis todas as colunas são iguais)
+            limite (numpy array): matriz limite já calculada (por padrão, é calculada)
+
+        Returns:
+            prioridades (dict): prioridade de cada nó
+        """
+        if limite is None:
+            limite, _ = self.matriz_limite()
+        if no_controle is None:
+            vetor = limite.mean(axis=1)
+        else:
+            vetor = limite[:, self.indices[no_controle]]
+        nos = self.nos if cluster is None else self.clusters[cluster]
+        valores = vetor[[self.indices[no] for no in nos]]
+        if cluster is not None and valores.sum() > 0:
+            valores = valores / valores.sum()
+        return dict(zip(nos, valores.tolist()))
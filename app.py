@@ -1,8 +1,11 @@
 import streamlit as st
 import pandas as pd
 import uuid
-import ahp
+from cache_resultados import CacheResultados
+from armazenamento import ArmazenamentoModelos
+from reparo_consistencia import ReparoConsistencia
 from functions_app import DealWithDf
+from classificacao import Classificacao
 
 # Inicializando algumas listas para coletar alternativas e critérios
 rows_collection_alt = []
@@ -33,6 +36,14 @@ if f"matriz_julgamento" not in st.session_state:
 if f"matriz_decisao" not in st.session_state:
     st.session_state["matriz_decisao"] = False
 
+# Cache dos cálculos do AHP, indexado pelo conteúdo das matrizes, que sobrevive às reexecuções do script
+if "cache_resultados" not in st.session_state:
+    st.session_state["cache_resultados"] = CacheResultados()
+
+# Armazenamento local (SQLite) dos modelos e avaliações, que sobrevive ao recarregamento da página
+if "armazenamento" not in st.session_state:
+    st.session_state["armazenamento"] = ArmazenamentoModelos(cache=st.session_state["cache_resultados"])
+
 # Concentrando a classe que coordena o acionamento de botões
 class Button:
     def __init__(self) -> None:
@@ -166,7 +177,8 @@ with st.container():
    
     st.image("escala_saaty.jpg", use_column_width=True)
 
-    texto4 = """Por fim, vale comentar que o modelo possui a limitação de lidar com no máximo 15 critérios. Além disso,
+    texto4 = """Por fim, vale comentar que, acima de 15 critérios, o índice aleatório usado no teste de consistência
+             é estimado por simulação (e guardado para as próximas execuções). Além disso,
              o número de combinações na matriz de julgamento aumenta conforme a expressão:
              """
     st.write(f'<div style="text-align: justify">{texto4}</div>', unsafe_allow_html=True)
@@ -175,6 +187,8 @@ with st.container():
              \dfrac{n * (n - 1)}{2}
              $$
              Em que n é o número de critérios.""")
+    # Forma de preenchimento das matrizes: um campo por célula ou uma tabela editável (que também aceita CSV)
+    modo_entrada = st.radio("Forma de preenchimento das matrizes", ("Formulário", "Tabela"), horizontal=True)
 # Estrutura dedicada a receber as alternativas de solução do modelo
 with st.container():
     st.title("Adição de alternativas")
@@ -266,18 +280,24 @@ with st.container():
                     display = st.columns(1)
                     # Criação da matriz de julgamento para o(s) critério(s) qualitativo(s)
                     if st.session_state[f"criterio_quali_concluido"]:
-                        data_criterios_ql_final = df_opps.create_judgement_table(data_criterios_ql, criterio)
+                        if modo_entrada == "Tabela":
+                            data_criterios_ql_final = df_opps.create_judgement_grid(data_criterios_ql, criterio)
+                        else:
+                            data_criterios_ql_final = df_opps.create_judgement_table(data_criterios_ql, criterio)
                         display[0].dataframe(data=data_criterios_ql_final, use_container_width=True)
-                        matrix_judge = data_criterios_ql_final.values
-                        mj = ahp.MatrizJulgamento()
-                        vetor_prioridade_criterio = mj.normalizacao_julgamentos(matrix_judge)
+                        matrix_judge = data_criterios_ql_final.to_numpy(dtype="float64")
+                        vetor_prioridade_criterio = st.session_state["cache_resultados"].vetor_prioridade(matrix_judge)
                         botao_consistencia = st.columns(1)
                         with botao_consistencia[0]:
                             # Botão que solicita a checagem de consistência para o critério em questão
                             st.button(f"Verificar consistência para o critério {criterio}", on_click=botoes.click_button_consistencia_quali,  args=[f"consistencia_quali_{criterio}"], key=uuid.uuid4())
                         if st.session_state[f"consistencia_quali_{criterio}"]:
-                            cr_criterio = mj.analise_consistencia(matrix_judge, vetor_prioridade_criterio)
+                            cr_criterio = st.session_state["cache_resultados"].consistencia(matrix_judge)
                             if cr_criterio > 10:
+                                # Sugestões dos julgamentos a serem alterados para que o teste seja aprovado
+                                sugestoes, _, cr_sugerido = ReparoConsistencia().sugere(matrix_judge)
+                                st.write(f"Ajustes sugeridos para o critério {criterio} (razão de consistência após os ajustes: {cr_sugerido:.2f}%)")
+                                st.dataframe(df_opps.create_repair_table(sugestoes, valores), use_container_width=True)
                                 message = f"""O teste de consistência da matriz de julgamento reprovou as prioridades definidas.\n
                                             O resultando da razão de consistência deve ser menor que 10%. O valor encontrado foi
                                             {cr_criterio}"""
@@ -299,9 +319,12 @@ with st.container():
             df_criterios_mapeados = df_opps.create_dataframe_from_list(valores)
             st.subheader("Dados coletados - Matriz de Julgamento")
             display = st.columns(1)
-            df_julgamento = df_opps.create_judgement_table(df_criterios_mapeados, "criterio")
+            if modo_entrada == "Tabela":
+                df_julgamento = df_opps.create_judgement_grid(df_criterios_mapeados, "criterio")
+            else:
+                df_julgamento = df_opps.create_judgement_table(df_criterios_mapeados, "criterio")
             display[0].dataframe(data=df_julgamento, use_container_width=True)
-            matriz_julgamento = df_julgamento.values
+            matriz_julgamento = df_julgamento.to_numpy(dtype="float64")
             menu_final = st.columns(1)
             with menu_final[0]:
                 # Botão que indica a finalização da matriz de julgamento
@@ -310,15 +333,19 @@ with st.container():
 # Estrutura dedicada a construir a matriz de decisão
 with st.container():
     if st.session_state["matriz_julgamento"]:
+        if modo_entrada == "Tabela":
+            create_decision = df_opps.create_decision_grid
+        else:
+            create_decision = df_opps.create_decision_table
         if st.session_state["criterios_quali_finalizados_por_completo"]:
-            df_decisao = df_opps.create_decision_table(data_alternativas, data_criterios, True, dict_quali_to_quanti)
+            df_decisao = create_decision(data_alternativas, data_criterios, True, dict_quali_to_quanti)
         else:
-            df_decisao = df_opps.create_decision_table(data_alternativas, data_criterios, False)
+            df_decisao = create_decision(data_alternativas, data_criterios, False)
 
         st.subheader("Dados coletados - Matriz de Decisão")
         display = st.columns(1)
         display[0].dataframe(data=df_decisao, use_container_width=True)
-        matriz_decisao = df_decisao.values
+        matriz_decisao = df_decisao.to_numpy(dtype="float64")
         menu_final = st.columns(1)
         with menu_final[0]:
             # Botão que indica a finalização da matriz de decisão
@@ -328,12 +355,48 @@ with st.container():
 with st.container():
     if st.session_state["matriz_decisao"]:
         lista_referencia = list(data_criterios["caracteristica"])
-        process = ahp.AHP(matriz_julgamento = matriz_julgamento, matriz_decisao = matriz_decisao, lista_referencia_monotomica = lista_referencia)
-        result = process.executa_algoritmo()
-        df_results = data_alternativas.copy()
-        df_results["resultados"] = result.flatten()
-        max = df_results["resultados"].max()
-        min = df_results["resultados"].min()
+        if st.session_state["cache_resultados"].consistencia(matriz_julgamento) > 10:
+            # Sugestões dos julgamentos a serem alterados antes da execução (que reprovará a matriz)
+            sugestoes, _, cr_sugerido = ReparoConsistencia().sugere(matriz_julgamento)
+            st.write(f"Ajustes sugeridos para a matriz de julgamento (razão de consistência após os ajustes: {cr_sugerido:.2f}%)")
+            st.dataframe(df_opps.create_repair_table(sugestoes, list(data_criterios["criterios"])), use_container_width=True)
+        avaliacao = st.session_state["armazenamento"].avalia(matriz_julgamento, matriz_decisao, lista_referencia)
+        if avaliacao["status"] != 200:
+            raise ValueError(avaliacao["mensagem"])
+        result = avaliacao["resultado"]
+        classificacao = Classificacao(result)
+        max = result.max()
+        min = result.min()
         st.subheader("Resultados - Verde (melhor escolha), Amarelo (valores intermediários), Vermelho (pior escolha)")
+        # Apenas a página visível é selecionada (sem ordenar todas as alternativas), montada e estilizada
+        menu_paginas = st.columns(3)
+        tamanho_pagina = menu_paginas[0].selectbox("Alternativas por página", (10, 25, 50, 100), key="tamanho_pagina")
+        quantidade_paginas = -(-classificacao.quantidade // tamanho_pagina) or 1
+        pagina = menu_paginas[1].number_input("Página", min_value=1, max_value=quantidade_paginas, value=1, key="pagina_resultados")
+        ordem = menu_paginas[2].radio("Ordem", ("Melhores primeiro", "Piores primeiro"), key="ordem_resultados")
+        df_results = df_opps.create_results_page(data_alternativas, classificacao, result, (pagina - 1) * tamanho_pagina,
+                                                 tamanho_pagina, melhores = ordem == "Melhores primeiro")
         display = st.columns(1)
-        display[0].dataframe(df_results.style.apply(lambda x: df_opps.color_coding(row = x, max = max, min = min), axis=1))
+        display[0].dataframe(df_results.style.apply(df_opps.color_coding, axis=None, max = max, min = min), hide_index=True)
+        # Gravação do modelo para consulta posterior
+        menu_salvar = st.columns((3, 1))
+        nome_modelo = menu_salvar[0].text_input("Nome do modelo", key="nome_modelo")
+        if menu_salvar[1].button("Salvar modelo", disabled=nome_modelo == ""):
+            st.session_state["armazenamento"].salva_modelo(nome_modelo, list(data_alternativas["alternativas"]),
+                                                           list(data_criterios["criterios"]), lista_referencia,
+                                                           matriz_julgamento, matriz_decisao)
+            st.write(f"Modelo {nome_modelo} salvo")
+
+# Modelos salvos em sessões anteriores, com as avaliações servidas pelo armazenamento
+with st.sidebar:
+    modelos_salvos = st.session_state["armazenamento"].lista_modelos()
+    if len(modelos_salvos) > 0:
+        st.subheader("Modelos salvos")
+        nome_salvo = st.selectbox("Modelo", modelos_salvos)
+        modelo_salvo = st.session_state["armazenamento"].carrega_modelo(nome_salvo)
+        avaliacao_salva = st.session_state["armazenamento"].avalia_modelos([nome_salvo])[nome_salvo]
+        if avaliacao_salva["status"] == 200:
+            st.dataframe(pd.DataFrame({"alternativas": modelo_salvo["alternativas"],
+                                       "resultados": avaliacao_salva["resultado"].flatten()}), use_container_width=True)
+        else:
+            st.write(avaliacao_salva["mensagem"])
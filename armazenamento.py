@@ -0,0 +1,328 @@
+import json
+import logging
+import sqlite3
+import struct
+import time
+import numpy as np
+import ahp
+from cache_resultados import CacheResultados
+
+logger = logging.getLogger(__name__)
+
+# Tabelas do banco: definições dos modelos (nome, rótulos e matrizes) e avaliações indexadas pelo hash
+# do conteúdo das matrizes de entrada
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS modelos (
+    nome TEXT PRIMARY KEY,
+    alternativas TEXT NOT NULL,
+    criterios TEXT NOT NULL,
+    lista_referencia TEXT NOT NULL,
+    matriz_julgamento BLOB NOT NULL,
+    matriz_decisao BLOB NOT NULL,
+    chave TEXT NOT NULL,
+    atualizado_em REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS avaliacoes (
+    chave TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    mensagem TEXT NOT NULL,
+    vetor_prioridade BLOB,
+    consistencia REAL,
+    resultado BLOB,
+    criado_em REAL NOT NULL
+);
+"""
+
+def serializa_matriz(matriz):
+    """
+    Função que converte uma matriz em bytes: quantidade de dimensões, formato e valores float64
+    (little-endian), sem o cabeçalho textual do formato .npy
+
+    Args:
+        matriz (numpy array): matriz numérica
+
+    Returns:
+        dados (bytes): representação binária da matriz
+    """
+    matriz = np.ascontiguousarray(matriz, dtype="<f8")
+    return struct.pack(f"<B{matriz.ndim}I", matriz.ndim, *matriz.shape) + matriz.tobytes()
+
+def desserializa_matriz(dados):
+    """
+    Função inversa de serializa_matriz
+
+    Args:
+        dados (bytes): representação binária da matriz (ou None)
+
+    Returns:
+        matriz (numpy array): matriz float64 (ou None)
+    """
+    if dados is None:
+        return None
+    dimensoes = dados[0]
+    formato = struct.unpack_from(f"<{dimensoes}I", dados, 1)
+    return np.frombuffer(dados, dtype="<f8", offset=1 + 4 * dimensoes).reshape(formato).astype(np.float64)
+
+# Classe que guarda modelos e avaliações em um banco SQLite local. As avaliações (vetor prioridade,
+# razão de consistência e resultado) são indexadas pelo hash do conteúdo das matrizes, de forma que
+# um modelo já avaliado, ou igual a outro já avaliado, é servido pelo banco sem recálculo. Antes do
+# banco é consultado um cache em memória (CacheResultados)
+class ArmazenamentoModelos:
+    def __init__(self, caminho = "ahp_modelos.sqlite", metodo = "aproximado", cache = None) -> None:
+        """
+        Args:
+            caminho (str): caminho do arquivo do banco (":memory:" mantém o banco apenas em memória)
+            metodo (str): um dos métodos de ahp.PRIORIZACOES ('aproximado', 'autovetor', 'geometrica', 'llsm' ou 'incompleto')
+            cache (CacheResultados): cache em memória consultado antes do banco (por padrão, um novo cache)
+        """
+        logger.debug(f"Abrindo o armazenamento de modelos em {caminho}")
+        self.priorizacao = ahp.obtem_priorizacao(metodo)
+        self.metodo = metodo
+        self.cache = cache if cache is not None else CacheResultados()
+        # O streamlit executa o script em threads diferentes a cada interação
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        self.conexao.executescript(ESQUEMA)
+        self.acertos = 0
+        self.falhas = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fecha()
+        return False
+
+    def fecha(self):
+        self.conexao.close()
+
+    def chave(self, matriz_julgamento, matriz_decisao, lista_referencia_monotomica):
+        """
+        Função que calcula o hash do conteúdo de uma avaliação (matrizes, lista de referência e método)
+
+        Args:
+            matriz_julgamento (numpy array): matriz de julgamento dos critérios
+            matriz_decisao (numpy array): matriz de decisão
+            lista_referencia_monotomica (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+
+        Returns:
+            chave (str): hash hexadecimal do conteúdo
+        """
+        return self.cache.chave("avaliacao", matriz_julgamento, matriz_decisao,
+                                [int(valor) for valor in lista_referencia_monotomica], self.metodo)
+
+    def calcula(self, matriz_julgamento, matriz_decisao, lista_referencia_monotomica):
+        """
+        Função que avalia um modelo, registrando falhas como status em vez de interromper o processo
+
+        Args:
+            matriz_julgamento (numpy array): matriz de julgamento dos critérios
+            matriz_decisao (numpy array): matriz de decisão
+            lista_referencia_monotomica (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+
+        Returns:
+            avaliacao (dict): status, mensagem, vetor prioridade (n, 1), índice de consistência e resultado (m, 1).
+            Os valores não calculados são None
+        """
+        avaliacao = {"status": 200, "mensagem": "OK", "vetor_prioridade": None, "consistencia": None, "resultado": None}
+        process = ahp.AHP(matriz_julgamento = matriz_julgamento, matriz_decisao = matriz_decisao,
+                          lista_referencia_monotomica = lista_referencia_monotomica, metodo = self.priorizacao)
+        try:
+            avaliacao["resultado"] = process.executa_algoritmo()
+        except ValueError as erro:
+            # Erros de validação, de consistência e de dimensões da matriz de decisão viram status
+            avaliacao.update(status=400, mensagem=str(erro))
+        if process.vetor_prioridade is not None:
+            avaliacao.update(vetor_prioridade=process.vetor_prioridade, consistencia=float(process.consistencia))
+        return avaliacao
+
+    def linha_avaliacao(self, chave, avaliacao):
+        return (chave, avaliacao["status"], avaliacao["mensagem"],
+                None if avaliacao["vetor_prioridade"] is None else serializa_matriz(avaliacao["vetor_prioridade"]),
+                avaliacao["consistencia"],
+                None if avaliacao["resultado"] is None else serializa_matriz(avaliacao["resultado"]),
+                time.time())
+
+    def busca_avaliacoes(self, chaves):
+        """
+        Função que lê do banco, em uma única consulta por grupo de até 500 chaves, as avaliações guardadas
+
+        Args:
+            chaves (list): hashes das avaliações
+
+        Returns:
+            avaliacoes (dict): avaliações encontradas, indexadas pela chave
+        """
+        avaliacoes = {}
+        chaves = list(dict.fromkeys(chaves))
+        for inicio in range(0, len(chaves), 500):
+            grupo = chaves[inicio:inicio + 500]
+            consulta = ("SELECT chave, status, mensagem, vetor_prioridade, consistencia, resultado FROM avaliacoes "
+                        f"WHERE chave IN ({', '.join('?' * len(grupo))})")
+            for chave, status, mensagem, vetor, consistencia, resultado in self.conexao.execute(consulta, grupo):
+                avaliacoes[chave] = {"status": status, "mensagem": mensagem, "vetor_prioridade": desserializa_matriz(vetor),
+                                     "consistencia": consistencia, "resultado": desserializa_matriz(resultado)}
+        return avaliacoes
+
+    def avalia_lote(self, entradas):
+        """
+        Função que avalia vários modelos: as avaliações já guardadas são lidas do banco e as demais são
+        calculadas e gravadas em uma única transação
+
+        Args:
+            entradas (list): tuplas (matriz_julgamento, matriz_decisao, lista_referencia_monotomica)
+
+        Returns:
+            avaliacoes (list): avaliações (ver calcula), na ordem das entradas
+        """
+        chaves = [self.chave(*entrada) for entrada in entradas]
+        guardadas = self.busca_avaliacoes(chaves)
+        novas = {}
+        for chave, entrada in zip(chaves, entradas):
+            if chave in guardadas or chave in novas:
+                self.acertos += 1
+                continue
+            self.falhas += 1
+            novas[chave] = self.calcula(*entrada)
+
+        if novas:
+            logger.debug(f"Gravando {len(novas)} avaliações no armazenamento")
+            with self.conexao:
+                self.conexao.executemany("INSERT OR REPLACE INTO avaliacoes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                         [self.linha_avaliacao(chave, avaliacao) for chave, avaliacao in novas.items()])
+        guardadas.update(novas)
+        return [guardadas[chave] for chave in chaves]
+
+    def avalia(self, matriz_julgamento, matriz_decisao, lista_referencia_monotomica):
+        """
+        Função que avalia um modelo, consultando o cache em memória, depois o banco e, por fim, calculando
+
+        Args:
+            matriz_julgamento (numpy array): matriz de julgamento dos critérios
+            matriz_decisao (numpy array): matriz de decisão
+            lista_referencia_monotomica (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+
+        Returns:
+            avaliacao (dict): ver calcula
+        """
+        chave = self.chave(matriz_julgamento, matriz_decisao, lista_referencia_monotomica)
+        return self.cache.obtem_ou_calcula(chave, lambda: self.avalia_lote(
+            [(matriz_julgamento, matriz_decisao, lista_referencia_monotomica)])[0])
+
+    def linha_modelo(self, modelo):
+        matriz_julgamento = np.asarray(modelo["matriz_julgamento"], dtype=np.float64)
+        matriz_decisao = np.asarray(modelo["matriz_decisao"], dtype=np.float64)
+        lista_referencia = [int(valor) for valor in modelo["lista_referencia"]]
+        return (modelo["nome"], json.dumps(list(modelo["alternativas"]), ensure_ascii=False),
+                json.dumps(list(modelo["criterios"]), ensure_ascii=False), json.dumps(lista_referencia),
+                serializa_matriz(matriz_julgamento), serializa_matriz(matriz_decisao),
+                self.chave(matriz_julgamento, matriz_decisao, lista_referencia), time.time())
+
+    def salva_modelos(self, modelos):
+        """
+        Função que grava (ou substitui, pelo nome) vários modelos em uma única transação
+
+        Args:
+            modelos (iterable): dicionários com nome, alternativas, criterios, lista_referencia,
+            matriz_julgamento e matriz_decisao
+
+        Returns:
+            quantidade (int): quantidade de modelos gravados
+        """
+        linhas = [self.linha_modelo(modelo) for modelo in modelos]
+        logger.debug(f"Gravando {len(linhas)} modelos no armazenamento")
+        with self.conexao:
+            self.conexao.executemany("INSERT OR REPLACE INTO modelos VALUES (?, ?, ?, ?, ?, ?, ?, ?)", linhas)
+        return len(linhas)
+
+    def salva_modelo(self, nome, alternativas, criterios, lista_referencia, matriz_julgamento, matriz_decisao):
+        """
+        Função que grava (ou substitui) um modelo
+
+        Args:
+            nome (str): nome do modelo
+            alternativas (list): nomes das alternativas
+            criterios (list): nomes dos critérios
+            lista_referencia (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+            matriz_julgamento (numpy array): matriz de julgamento dos critérios
+            matriz_decisao (numpy array): matriz de decisão
+
+        Returns:
+            None
+        """
+        self.salva_modelos([{"nome": nome, "alternativas": alternativas, "criterios": criterios,
+                             "lista_referencia": lista_referencia, "matriz_julgamento": matriz_julgamento,
+                             "matriz_decisao": matriz_decisao}])
+
+    def carrega_modelos(self, nomes = None):
+        """
+        Função que lê vários modelos em uma única consulta
+
+        Args:
+            nomes (list): nomes dos modelos desejados (None lê todos)
+
+        Returns:
+            modelos (list): dicionários no formato aceito por salva_modelos, acrescidos da chave da avaliação
+        """
+        consulta = "SELECT nome, alternativas, criterios, lista_referencia, matriz_julgamento, matriz_decisao, chave FROM modelos"
+        parametros = []
+        if nomes is not None:
+            parametros = list(nomes)
+            consulta += f" WHERE nome IN ({', '.join('?' * len(parametros))})"
+        modelos = []
+        for nome, alternativas, criterios, lista_referencia, julgamento, decisao, chave in self.conexao.execute(consulta + " ORDER BY nome", parametros):
+            modelos.append({"nome": nome, "alternativas": json.loads(alternativas), "criterios": json.loads(criterios),
+                            "lista_referencia": json.loads(lista_referencia), "matriz_julgamento": desserializa_matriz(julgamento),
+                            "matriz_decisao": desserializa_matriz(decisao), "chave": chave})
+        return modelos
+
+    def carrega_modelo(self, nome):
+        """
+        Função que lê um modelo pelo nome
+
+        Args:
+            nome (str): nome do modelo
+
+        Returns:
+            modelo (dict): ver carrega_modelos (None se o modelo não existir)
+        """
+        modelos = self.carrega_modelos([nome])
+        return modelos[0] if modelos else None
+
+    def lista_modelos(self):
+        return [nome for (nome,) in self.conexao.execute("SELECT nome FROM modelos ORDER BY nome")]
+
+    def remove_modelo(self, nome):
+        with self.conexao:
+            self.conexao.execute("DELETE FROM modelos WHERE nome = ?", (nome,))
+
+    def avalia_modelos(self, nomes = None):
+        """
+        Função que avalia modelos guardados, servindo do banco as avaliações já calculadas
+
+        Args:
+            nomes (list): nomes dos modelos (None avalia todos)
+
+        Returns:
+            avaliacoes (dict): avaliação de cada modelo (ver calcula), indexada pelo nome
+        """
+        modelos = self.carrega_modelos(nomes)
+        avaliacoes = self.avalia_lote([(modelo["matriz_julgamento"], modelo["matriz_decisao"], modelo["lista_referencia"])
+                                       for modelo in modelos])
+        return {modelo["nome"]: avaliacao for modelo, avaliacao in zip(modelos, avaliacoes)}
+
+    def estatisticas(self):
+        """
+        Função que resume o uso do armazenamento
+
+        Args:
+            None
+
+        Returns:
+            estatisticas (dict): quantidade de modelos e de avaliações guardados e de avaliações servidas
+            pelo banco (acertos) ou calculadas (falhas)
+        """
+        modelos = self.conexao.execute("SELECT COUNT(*) FROM modelos").fetchone()[0]
+        avaliacoes = self.conexao.execute("SELECT COUNT(*) FROM avaliacoes").fetchone()[0]
+        return {"modelos": modelos, "avaliacoes": avaliacoes, "acertos": self.acertos, "falhas": self.falhas}
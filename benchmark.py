@@ -0,0 +1,305 @@
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import ahp
+from indice_aleatorio import ESCALA_SAATY
+
+try:
+    from functions_app import DealWithDf
+except ImportError:
+    DealWithDf = None
+
+logger = logging.getLogger(__name__)
+
+# Varreduras padrão: quantidade de critérios, de alternativas e de modelos por lote
+TAMANHOS = (3, 5, 7, 10, 15, 20, 30)
+ALTERNATIVAS = (10, 1000, 100000, 1000000)
+LOTES = (1, 100, 10000)
+# Quantidade de critérios das matrizes de decisão nas varreduras por alternativas
+CRITERIOS_DECISAO = (5, 15)
+# Varreduras reduzidas, para uma verificação rápida
+TAMANHOS_RAPIDO = (3, 10, 15)
+ALTERNATIVAS_RAPIDO = (10, 10000)
+LOTES_RAPIDO = (1, 100)
+
+# Classe que mede o tempo e o pico de memória das etapas do AHP e dos construtores de dataframes do
+# app, com matrizes recíprocas aleatórias geradas a partir de uma semente fixa. Os resultados são
+# gravados em JSON e podem ser comparados a uma execução anterior (linha de base)
+class Benchmark:
+    def __init__(self, tamanhos = TAMANHOS, alternativas = ALTERNATIVAS, lotes = LOTES,
+                 criterios_decisao = CRITERIOS_DECISAO, repeticoes = 5, semente = 0) -> None:
+        """
+        Args:
+            tamanhos (tuple): quantidades de critérios das matrizes de julgamento
+            alternativas (tuple): quantidades de alternativas das matrizes de decisão
+            lotes (tuple): quantidades de matrizes empilhadas (1 = matriz bidimensional)
+            criterios_decisao (tuple): quantidades de critérios usadas nas varreduras por alternativas
+            repeticoes (int): quantidade de execuções cronometradas de cada caso
+            semente (int): semente do gerador das matrizes aleatórias
+        """
+        self.tamanhos = tamanhos
+        self.alternativas = alternativas
+        self.lotes = lotes
+        self.criterios_decisao = criterios_decisao
+        self.repeticoes = repeticoes
+        self.semente = semente
+
+    def gerador(self, *parametros):
+        """
+        Função que cria um gerador determinístico para cada combinação de parâmetros, de forma que um
+        caso produza as mesmas matrizes independentemente de quais outros casos foram executados
+
+        Args:
+            parametros (int): parâmetros do caso
+
+        Returns:
+            gerador (numpy Generator): gerador de números aleatórios
+        """
+        return np.random.default_rng([self.semente, *parametros])
+
+    def gera_julgamentos(self, tamanho, lote, gerador):
+        """
+        Função que gera matrizes de julgamento recíprocas com valores da escala de Saaty
+
+        Args:
+            tamanho (int): quantidade de critérios
+            lote (int): quantidade de matrizes (1 devolve uma matriz bidimensional)
+            gerador (numpy Generator): gerador de números aleatórios
+
+        Returns:
+            matrizes (numpy array): matriz (n, n) ou pilha (lote, n, n)
+        """
+        linhas, colunas = np.triu_indices(tamanho, k=1)
+        valores = gerador.choice(ESCALA_SAATY, size=(lote, len(linhas)))
+        matrizes = np.ones((lote, tamanho, tamanho))
+        matrizes[:, linhas, colunas] = valores
+        matrizes[:, colunas, linhas] = 1.0 / valores
+        return matrizes[0] if lote == 1 else matrizes
+
+    def gera_decisao(self, alternativas, criterios, gerador):
+        """
+        Função que gera uma matriz de decisão positiva e a lista de referência (metade custo, metade lucro)
+
+        Args:
+            alternativas (int): quantidade de alternativas
+            criterios (int): quantidade de critérios
+            gerador (numpy Generator): gerador de números aleatórios
+
+        Returns:
+            matriz_decisao (numpy array): matriz (m, n)
+            lista_referencia_monotomica (list): lista com '-1' ou '1' por critério
+        """
+        matriz_decisao = gerador.uniform(1.0, 100.0, size=(alternativas, criterios))
+        return matriz_decisao, [-1 if j % 2 else 1 for j in range(criterios)]
+
+    def casos(self):
+        """
+        Função que monta os casos medidos. Cada caso tem um nome, seus parâmetros e uma função sem
+        argumentos que executa a etapa; os dados de entrada são gerados antes da medição
+
+        Args:
+            None
+
+        Returns:
+            casos (generator): tuplas (nome, parametros, funcao)
+        """
+        mj = ahp.MatrizJulgamento()
+        md = ahp.MatrizDecisao()
+        priorizacoes = [ahp.obtem_priorizacao(metodo) for metodo in ahp.PRIORIZACOES]
+        for tamanho in self.tamanhos:
+            for lote in self.lotes:
+                matrizes = self.gera_julgamentos(tamanho, lote, self.gerador(tamanho, lote))
+                vetores = mj.normalizacao_julgamentos(matrizes)
+                parametros = {"tamanho": tamanho, "lote": lote}
+                # checa_reciprocidade aceita apenas uma matriz; pilhas são medidas pelo validador vetorizado
+                if lote == 1:
+                    yield "checa_reciprocidade", parametros, lambda m=matrizes: mj.checa_reciprocidade(m)
+                else:
+                    yield "valida_matriz", parametros, lambda m=matrizes: mj.valida_matriz(m)
+                yield "normalizacao_julgamentos", parametros, lambda m=matrizes: mj.normalizacao_julgamentos(m)
+                yield "analise_consistencia", parametros, lambda m=matrizes, v=vetores: mj.analise_consistencia(m, v)
+                for priorizacao in priorizacoes:
+                    nome = type(priorizacao).__name__
+                    yield f"{nome}.prioridades", parametros, lambda m=matrizes, p=priorizacao: p.prioridades(m)
+                    yield (f"{nome}.consistencia", parametros,
+                           lambda m=matrizes, p=priorizacao, v=priorizacao.prioridades(matrizes): p.consistencia(m, v))
+
+        for criterios in self.criterios_decisao:
+            julgamento = self.gera_julgamentos(criterios, 1, self.gerador(criterios, 0))
+            # Julgamentos perfeitamente consistentes, para que o AHP completo não seja interrompido pelo teste de consistência
+            pesos = julgamento.sum(axis=1)
+            julgamento = pesos[:, np.newaxis] / pesos[np.newaxis, :]
+            for alternativas in self.alternativas:
+                decisao, referencia = self.gera_decisao(alternativas, criterios, self.gerador(criterios, alternativas))
+                parametros = {"criterios": criterios, "alternativas": alternativas}
+                yield "normalizacao_decisao", parametros, lambda d=decisao, r=referencia: md.normalizacao_decisao(d, r)
+                processo = ahp.AHP(julgamento, decisao, referencia)
+                yield "AHP.executa_algoritmo", parametros, processo.executa_algoritmo
+
+        for tamanho in self.tamanhos:
+            for lote in self.lotes:
+                if lote == 1:
+                    continue
+                julgamentos = self.gera_julgamentos(tamanho, lote, self.gerador(tamanho, lote))
+                decisoes = self.gerador(tamanho, lote, 1).uniform(1.0, 100.0, size=(lote, 10, tamanho))
+                processo = ahp.AHPLote(julgamentos, decisoes, [1] * tamanho)
+                yield "AHPLote.executa_algoritmo", {"tamanho": tamanho, "lote": lote, "alternativas": 10}, processo.executa_algoritmo
+
+        if DealWithDf is None:
+            logger.warning("functions_app indisponível (streamlit não instalado): construtores do app não medidos")
+            return
+        deal = DealWithDf()
+        for tamanho in self.tamanhos:
+            rotulos = [f"c{i}" for i in range(tamanho)]
+            linhas, _ = np.triu_indices(tamanho, k=1)
+            superiores = self.gerador(tamanho, 2).choice(ESCALA_SAATY, size=len(linhas))
+            textos = np.where(superiores < 1, "1/" + np.round(1 / superiores).astype(int).astype(str),
+                              superiores.astype(int).astype(str))
+            matriz = deal.build_reciprocal_matrix(superiores, tamanho)
+            parametros = {"tamanho": tamanho}
+            yield "DealWithDf.create_dataframe_from_list", parametros, lambda r=rotulos: deal.create_dataframe_from_list(r)
+            yield "DealWithDf.build_reciprocal_matrix", parametros, lambda s=superiores, t=tamanho: deal.build_reciprocal_matrix(s, t)
+            yield "DealWithDf.matrix_to_dataframe", parametros, lambda m=matriz, r=rotulos: deal.matrix_to_dataframe(m, r)
+            yield "DealWithDf.convert_judgements", parametros, lambda t=textos: deal.convert_judgements(pd.Series(t))
+
+    def mede(self, funcao):
+        """
+        Função que mede uma etapa: o tempo de cada repetição com perf_counter e, em uma execução à parte
+        (o tracemalloc deixa a execução mais lenta), o pico de memória alocada
+
+        Args:
+            funcao (callable): função sem argumentos que executa a etapa
+
+        Returns:
+            medida (dict): tempos mediano e mínimo (em segundos) e pico de memória (em bytes)
+        """
+        funcao()
+        tempos = []
+        for _ in range(self.repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+
+        tracemalloc.start()
+        try:
+            funcao()
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return {"tempo_mediano": statistics.median(tempos), "tempo_minimo": min(tempos), "memoria_pico": pico}
+
+    def executa(self, filtro = None):
+        """
+        Função que executa todos os casos
+
+        Args:
+            filtro (str): quando informado, apenas os casos cujo nome contém o texto são executados
+
+        Returns:
+            relatorio (dict): ambiente de execução e lista de medidas por caso
+        """
+        resultados = []
+        for nome, parametros, funcao in self.casos():
+            if filtro is not None and filtro not in nome:
+                continue
+            medida = self.mede(funcao)
+            logger.debug(f"{nome} {parametros}: {medida['tempo_mediano']:.6f} s")
+            resultados.append({"caso": nome, "parametros": parametros, **medida})
+        return {
+            "ambiente": {"python": platform.python_version(), "numpy": np.__version__,
+                         "plataforma": platform.platform(), "processador": platform.processor()},
+            "repeticoes": self.repeticoes,
+            "semente": self.semente,
+            "resultados": resultados,
+        }
+
+def identificador(resultado):
+    """
+    Função que identifica um caso pelo nome e pelos parâmetros, para casar execuções diferentes
+
+    Args:
+        resultado (dict): medida de um caso
+
+    Returns:
+        identificador (str): nome seguido dos parâmetros ordenados
+    """
+    return resultado["caso"] + json.dumps(resultado["parametros"], sort_keys=True)
+
+def compara(relatorio, linha_base, limite = 0.2, tempo_minimo = 1e-3):
+    """
+    Função que compara um relatório com a linha de base. Um caso regride quando seu tempo mediano ou
+    seu pico de memória supera o da linha de base em mais que o limite. Casos muito rápidos
+    (abaixo de tempo_minimo segundos na linha de base) têm apenas a memória avaliada, pois seu tempo
+    é dominado por ruído
+
+    Args:
+        relatorio (dict): relatório da execução atual (ver Benchmark.executa)
+        linha_base (dict): relatório de referência
+        limite (float): aumento relativo tolerado (0.2 = 20%)
+        tempo_minimo (float): tempo abaixo do qual a comparação de tempo é ignorada
+
+    Returns:
+        regressoes (list): lista de dicionários com o caso, a métrica, o valor de referência, o atual e a razão
+    """
+    referencias = {identificador(resultado): resultado for resultado in linha_base["resultados"]}
+    regressoes = []
+    for resultado in relatorio["resultados"]:
+        referencia = referencias.get(identificador(resultado))
+        if referencia is None:
+            continue
+        for metrica in ("tempo_mediano", "memoria_pico"):
+            if metrica == "tempo_mediano" and referencia[metrica] < tempo_minimo:
+                continue
+            if referencia[metrica] > 0 and resultado[metrica] > referencia[metrica] * (1 + limite):
+                regressoes.append({"caso": resultado["caso"], "parametros": resultado["parametros"], "metrica": metrica,
+                                   "referencia": referencia[metrica], "atual": resultado[metrica],
+                                   "razao": resultado[metrica] / referencia[metrica]})
+    return regressoes
+
+def main(argumentos = None):
+    parser = argparse.ArgumentParser(description="Mede tempo e memória das etapas do AHP e compara com uma linha de base")
+    parser.add_argument("-o", "--saida", default=None, help="arquivo JSON onde o relatório é gravado")
+    parser.add_argument("-b", "--linha-base", default=None, help="relatório JSON anterior usado na comparação")
+    parser.add_argument("-l", "--limite", type=float, default=0.2, help="aumento relativo tolerado (padrão: 0.2 = 20%%)")
+    parser.add_argument("-t", "--tempo-minimo", type=float, default=1e-3,
+                        help="tempo (em segundos) abaixo do qual a comparação de tempo é ignorada")
+    parser.add_argument("-r", "--repeticoes", type=int, default=5, help="execuções cronometradas por caso")
+    parser.add_argument("-s", "--semente", type=int, default=0, help="semente das matrizes aleatórias")
+    parser.add_argument("-f", "--filtro", default=None, help="executa apenas os casos cujo nome contém o texto")
+    parser.add_argument("--rapido", action="store_true", help="usa varreduras reduzidas")
+    args = parser.parse_args(argumentos)
+
+    if args.rapido:
+        benchmark = Benchmark(TAMANHOS_RAPIDO, ALTERNATIVAS_RAPIDO, LOTES_RAPIDO, repeticoes=args.repeticoes, semente=args.semente)
+    else:
+        benchmark = Benchmark(repeticoes=args.repeticoes, semente=args.semente)
+    relatorio = benchmark.executa(args.filtro)
+
+    for resultado in relatorio["resultados"]:
+        parametros = ", ".join(f"{chave}={valor}" for chave, valor in resultado["parametros"].items())
+        print(f"{resultado['caso']:<40} {parametros:<40} {resultado['tempo_mediano'] * 1e3:>12.4f} ms "
+              f"{resultado['memoria_pico'] / 2 ** 20:>10.2f} MiB")
+    if args.saida is not None:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=1)
+
+    if args.linha_base is None:
+        return 0
+    with open(args.linha_base, encoding="utf-8") as arquivo:
+        linha_base = json.load(arquivo)
+    regressoes = compara(relatorio, linha_base, args.limite, args.tempo_minimo)
+    for regressao in regressoes:
+        print(f"REGRESSÃO {regressao['caso']} {regressao['parametros']} {regressao['metrica']}: "
+              f"{regressao['referencia']:.6g} -> {regressao['atual']:.6g} ({regressao['razao']:.2f}x)")
+    print(f"{len(regressoes)} regressões acima de {args.limite:.0%}")
+    return 1 if regressoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+import hashlib
+import logging
+from collections import OrderedDict
+import numpy as np
+import ahp
+
+logger = logging.getLogger(__name__)
+
+def congela(valor):
+    """
+    Função que devolve uma cópia somente leitura dos arrays de um valor, inclusive dos guardados dentro
+    de dicionários, listas e tuplas (como as avaliações do ArmazenamentoModelos)
+
+    Args:
+        valor: valor a ser guardado no cache
+
+    Returns:
+        valor: valor com os arrays substituídos por cópias somente leitura
+    """
+    if isinstance(valor, np.ndarray):
+        valor = valor.copy()
+        valor.flags.writeable = False
+        return valor
+    if isinstance(valor, dict):
+        return {chave: congela(item) for chave, item in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return type(valor)(congela(item) for item in valor)
+    return valor
+
+# Classe que guarda vetores prioridade, razões de consistência e resultados do AHP indexados por um
+# hash do conteúdo das matrizes. Assim, as reexecuções do streamlit só recalculam as matrizes que de
+# fato mudaram. O tamanho é limitado e as entradas menos usadas recentemente são descartadas (LRU)
+class CacheResultados:
+    def __init__(self, tamanho_maximo = 256) -> None:
+        """
+        Args:
+            tamanho_maximo (int): quantidade máxima de entradas guardadas
+        """
+        self.tamanho_maximo = tamanho_maximo
+        self.entradas = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def chave(self, tipo, *partes):
+        """
+        Função que calcula o hash do conteúdo das partes informadas
+
+        Args:
+            tipo (str): tipo do valor guardado (diferencia, por exemplo, vetor prioridade e consistência)
+            partes: matrizes (convertidas para float64 contíguo) ou valores simples que identificam o cálculo
+
+        Returns:
+            chave (str): hash hexadecimal do conteúdo
+        """
+        funcao_hash = hashlib.blake2b(tipo.encode(), digest_size=16)
+        for parte in partes:
+            if isinstance(parte, (np.ndarray, list, tuple)):
+                # Listas, tuplas e arrays de outras precisões são convertidos para que o mesmo conteúdo
+                # produza sempre o mesmo hash
+                matriz = np.ascontiguousarray(parte, dtype=np.float64)
+                funcao_hash.update(str(matriz.shape).encode())
+                funcao_hash.update(matriz.tobytes())
+            else:
+                funcao_hash.update(repr(parte).encode())
+            funcao_hash.update(b"|")
+        return funcao_hash.hexdigest()
+
+    def obtem_ou_calcula(self, chave, funcao):
+        """
+        Função que devolve o valor guardado para a chave ou, se ausente, calcula-o e guarda
+
+        Args:
+            chave (str): hash do conteúdo
+            funcao (callable): função sem argumentos que calcula o valor
+
+        Returns:
+            valor: valor guardado ou recém-calculado
+        """
+        if chave in self.entradas:
+            self.acertos += 1
+            self.entradas.move_to_end(chave)
+            return self.entradas[chave]
+
+        self.falhas += 1
+        # Os valores são compartilhados entre reexecuções e não podem ser alterados por quem os recebe
+        valor = congela(funcao())
+        self.entradas[chave] = valor
+        if len(self.entradas) > self.tamanho_maximo:
+            self.entradas.popitem(last=False)
+        return valor
+
+    def vetor_prioridade(self, matriz):
+        """
+        Função que retorna o vetor prioridade da matriz de julgamento (ver MatrizJulgamento.normalizacao_julgamentos)
+
+        Args:
+            matriz (numpy array): matriz de julgamento
+
+        Returns:
+            vetor_prioridade (numpy array): vetor prioridade (somente leitura)
+        """
+        return self.obtem_ou_calcula(self.chave("vetor_prioridade", matriz),
+                                     lambda: ahp.MatrizJulgamento().normalizacao_julgamentos(matriz))
+
+    def consistencia(self, matriz):
+        """
+        Função que retorna a razão de consistência da matriz de julgamento (ver MatrizJulgamento.analise_consistencia)
+
+        Args:
+            matriz (numpy array): matriz de julgamento
+
+        Returns:
+            cr (float): razão de consistência (em percentual)
+        """
+        return self.obtem_ou_calcula(self.chave("consistencia", matriz),
+                                     lambda: ahp.MatrizJulgamento().analise_consistencia(matriz, self.vetor_prioridade(matriz)))
+
+    def resultado(self, matriz_julgamento, matriz_decisao, lista_referencia_monotomica):
+        """
+        Função que retorna o resultado do algoritmo (ver AHP.executa_algoritmo). Erros não são guardados
+
+        Args:
+            matriz_julgamento (numpy array): matriz de julgamento dos critérios
+            matriz_decisao (numpy array): matriz de decisão
+            lista_referencia_monotomica (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+
+        Returns:
+            resultado (numpy array): vetor com a relevância de cada alternativa (somente leitura)
+        """
+        chave = self.chave("resultado", matriz_julgamento, matriz_decisao, list(lista_referencia_monotomica))
+        process = ahp.AHP(matriz_julgamento = matriz_julgamento, matriz_decisao = matriz_decisao,
+                          lista_referencia_monotomica = lista_referencia_monotomica)
+        return self.obtem_ou_calcula(chave, process.executa_algoritmo)
+
+    def estatisticas(self):
+        """
+        Função que resume o uso do cache
+
+        Args:
+            None
+
+        Returns:
+            estatisticas (dict): quantidade de entradas, acertos e falhas
+        """
+        logger.debug(f"Cache de resultados: {self.acertos} acertos e {self.falhas} falhas")
+        return {"entradas": len(self.entradas), "acertos": self.acertos, "falhas": self.falhas}
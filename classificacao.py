@@ -0,0 +1,113 @@
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Classe que ordena as alternativas pelo resultado do AHP sem ordenar o vetor inteiro: as k melhores
+# (ou piores) são separadas por seleção parcial (argpartition, O(m)) e apenas elas são ordenadas
+# (O(k log k)). Empates são desfeitos pelo índice, como em uma ordenação estável decrescente, de forma
+# que as posições coincidem com as de np.argsort(-resultado, kind="stable")
+class Classificacao:
+    def __init__(self, resultado) -> None:
+        """
+        Args:
+            resultado (numpy array): vetor (m,) ou (m, 1) com a relevância de cada alternativa. Valores
+            NaN (modelos reprovados) ficam nas últimas posições
+        """
+        resultado = np.asarray(resultado, dtype=np.float64).reshape(-1)
+        if np.isnan(resultado).any():
+            resultado = np.where(np.isnan(resultado), -np.inf, resultado)
+        self.resultado = resultado
+        self.quantidade = len(resultado)
+
+    def selecao(self, quantidade, melhores = True):
+        """
+        Função que devolve os índices das alternativas nas primeiras posições (ou nas últimas)
+
+        Args:
+            quantidade (int): quantidade de alternativas desejadas
+            melhores (bool): True para as melhores (da 1ª posição em diante) e False para as piores
+            (da última posição para trás)
+
+        Returns:
+            indices (numpy array): índices das alternativas, em ordem
+        """
+        quantidade = min(max(quantidade, 0), self.quantidade)
+        if quantidade == 0:
+            return np.empty(0, dtype=np.intp)
+        chave = -self.resultado if melhores else self.resultado
+        # Valor da quantidade-ésima alternativa: todas as de chave menor entram, e os empates com esse
+        # valor são completados pelo índice (menor índice entre as melhores, maior entre as piores)
+        limite = chave[np.argpartition(chave, quantidade - 1)[quantidade - 1]]
+        menores = np.flatnonzero(chave < limite)
+        empates = np.flatnonzero(chave == limite)
+        if not melhores:
+            empates = empates[::-1]
+        candidatos = np.concatenate([menores, empates[:quantidade - len(menores)]])
+        desempate = candidatos if melhores else -candidatos
+        return candidatos[np.lexsort((desempate, chave[candidatos]))]
+
+    def melhores(self, quantidade):
+        """
+        Função que devolve as k melhores alternativas
+
+        Args:
+            quantidade (int): quantidade de alternativas (k)
+
+        Returns:
+            indices (numpy array): índices das alternativas, da melhor para a pior
+            posicoes (numpy array): posições (1 = melhor)
+        """
+        indices = self.selecao(quantidade, melhores=True)
+        return indices, np.arange(1, len(indices) + 1)
+
+    def piores(self, quantidade):
+        """
+        Função que devolve as k piores alternativas
+
+        Args:
+            quantidade (int): quantidade de alternativas (k)
+
+        Returns:
+            indices (numpy array): índices das alternativas, da pior para a melhor
+            posicoes (numpy array): posições (m = pior)
+        """
+        indices = self.selecao(quantidade, melhores=False)
+        return indices, self.quantidade - np.arange(len(indices))
+
+    def pagina(self, inicio, tamanho, melhores = True):
+        """
+        Função que devolve uma página da classificação, selecionando apenas as alternativas até o fim da página
+
+        Args:
+            inicio (int): posição inicial da página (0 = primeira alternativa)
+            tamanho (int): quantidade de alternativas por página
+            melhores (bool): True percorre da melhor para a pior; False, da pior para a melhor
+
+        Returns:
+            indices (numpy array): índices das alternativas da página
+            posicoes (numpy array): posições das alternativas (1 = melhor)
+        """
+        fim = min(inicio + tamanho, self.quantidade)
+        if inicio >= fim:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        indices = self.selecao(fim, melhores)[inicio:fim]
+        posicoes = np.arange(inicio + 1, fim + 1) if melhores else self.quantidade - np.arange(inicio, fim)
+        return indices, posicoes
+
+    def posicoes(self, indices):
+        """
+        Função que calcula, em O(m) por alternativa, a posição de alternativas específicas
+
+        Args:
+            indices (list): índices das alternativas
+
+        Returns:
+            posicoes (numpy array): posições (1 = melhor)
+        """
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1)
+        posicoes = np.empty(len(indices), dtype=np.intp)
+        for posicao, indice in enumerate(indices):
+            valor = self.resultado[indice]
+            posicoes[posicao] = 1 + np.count_nonzero(self.resultado > valor) + np.count_nonzero(self.resultado[:indice] == valor)
+        return posicoes
@@ -0,0 +1,343 @@
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import ahp
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+# Extensões de arquivo reconhecidas como definições de modelo
+EXTENSOES_MODELO = (".json", ".yaml", ".yml")
+
+# Classe que monta as matrizes de um modelo AHP a partir de sua definição (dicionário lido de um
+# arquivo JSON ou YAML) e executa o algoritmo, sem depender da interface do streamlit.
+#
+# Formato esperado da definição:
+#   alternativas: lista de nomes
+#   criterios: lista de {nome, tipo ('quantitativo' ou 'qualitativo'), caracteristica (1, -1,
+#              'Quanto maior, melhor' ou 'Quanto maior, pior') e, para critérios qualitativos,
+#              valores (lista de nomes) e matriz_julgamento (entre os valores)}
+#   matriz_julgamento: matriz de julgamento entre os critérios (números ou frações como "1/3")
+#   matriz_decisao: uma linha por alternativa, com números (quantitativos) ou nomes de valores (qualitativos)
+class ModeloAHP:
+    def __init__(self, definicao, nome = "modelo", metodo = "aproximado") -> None:
+        """
+        Args:
+            definicao (dict): definição do modelo
+            nome (str): identificador do modelo nos resultados
+            metodo (str): um dos métodos de ahp.PRIORIZACOES ('aproximado', 'autovetor', 'geometrica', 'llsm' ou 'incompleto')
+        """
+        self.definicao = definicao
+        self.nome = nome
+        self.metodo = metodo
+        # Índice de consistência da matriz de julgamento de cada critério qualitativo
+        self.consistencias_qualitativas = {}
+
+    def converte_julgamento(self, valor):
+        """
+        Função que converte um julgamento (número ou texto como "1/3") em float
+
+        Args:
+            valor (int, float, str): julgamento
+
+        Returns:
+            valor (float): julgamento numérico
+        """
+        if isinstance(valor, str) and "/" in valor:
+            numerador, denominador = valor.split("/")
+            return float(numerador) / float(denominador)
+        return float(valor)
+
+    def monta_matriz_julgamento(self, linhas):
+        """
+        Função que converte uma matriz de julgamento da definição em numpy array
+
+        Args:
+            linhas (list): lista de linhas com os julgamentos
+
+        Returns:
+            matriz (numpy array): matriz de julgamento em float64
+        """
+        return np.array([[self.converte_julgamento(valor) for valor in linha] for linha in linhas], dtype=np.float64)
+
+    def converte_caracteristica(self, caracteristica):
+        """
+        Função que converte a característica do critério no formato da lista de referência monotômica
+
+        Args:
+            caracteristica (int, str): 1, -1 ou um dos textos usados no app
+
+        Returns:
+            referencia (int): -1 (custo) ou 1 (lucro)
+        """
+        if caracteristica in (-1, "-1", "Quanto maior, pior"):
+            return -1
+        if caracteristica in (1, "1", "Quanto maior, melhor"):
+            return 1
+        raise ValueError(f"Característica {caracteristica!r} inválida: use 1 ou 'Quanto maior, melhor' (lucro) "
+                         f"e -1 ou 'Quanto maior, pior' (custo)")
+
+    def pesos_qualitativos(self, criterio):
+        """
+        Função que calcula os pesos dos valores de um critério qualitativo com o método de priorização
+        do modelo, aplicando à sua matriz de julgamento as mesmas verificações do AHP
+
+        Args:
+            criterio (dict): definição do critério qualitativo
+
+        Returns:
+            pesos (dict): dicionário valor -> peso
+            consistencia (float): índice de consistência da matriz de julgamento do critério
+        """
+        nome = criterio["nome"]
+        matriz = self.monta_matriz_julgamento(criterio["matriz_julgamento"])
+        valores = list(criterio["valores"])
+        priorizacao = ahp.obtem_priorizacao(self.metodo)
+        mj = priorizacao.class_matriz_julgamento
+        message, status = mj.checa_reciprocidade(matriz, permite_ausentes = priorizacao.aceita_ausentes)
+        if status == 200:
+            message, status = mj.verifica_qualidade_matriz(matriz)
+        if status != 200:
+            raise ValueError(f"Critério {nome}: {message}")
+        if len(valores) != matriz.shape[0]:
+            raise ValueError(f"Critério {nome}: a matriz de julgamento deve ter uma linha para cada valor "
+                             f"({matriz.shape[0]} linhas para {len(valores)} valores)")
+
+        vetor_prioridade = priorizacao.prioridades(matriz)
+        consistencia = float(priorizacao.consistencia(matriz, vetor_prioridade))
+        if not consistencia <= priorizacao.limite(len(valores)):
+            raise ValueError(f"Critério {nome}: {priorizacao.mensagem_reprovacao(consistencia, len(valores))}")
+        return {valor: vetor_prioridade[i][0] for i, valor in enumerate(valores)}, consistencia
+
+    def monta_matrizes(self):
+        """
+        Função que monta a matriz de julgamento, a matriz de decisão e a lista de referência do modelo
+
+        Args:
+            None
+
+        Returns:
+            matriz_julgamento (numpy array): matriz de julgamento dos critérios
+            matriz_decisao (numpy array): matriz de decisão (alternativas x critérios)
+            lista_referencia (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+        """
+        criterios = self.definicao["criterios"]
+        matriz_julgamento = self.monta_matriz_julgamento(self.definicao["matriz_julgamento"])
+        lista_referencia = [self.converte_caracteristica(criterio.get("caracteristica", 1)) for criterio in criterios]
+        pesos = {}
+        self.consistencias_qualitativas.clear()
+        for criterio in criterios:
+            if criterio.get("tipo") == "qualitativo":
+                pesos[criterio["nome"]], self.consistencias_qualitativas[criterio["nome"]] = self.pesos_qualitativos(criterio)
+
+        linhas = self.definicao["matriz_decisao"]
+        if len(linhas) != len(self.definicao["alternativas"]):
+            raise ValueError(f"A matriz de decisão deve ter uma linha para cada alternativa "
+                             f"({len(linhas)} linhas para {len(self.definicao['alternativas'])} alternativas)")
+        for i, linha in enumerate(linhas):
+            if len(linha) != len(criterios):
+                raise ValueError(f"A linha {i} da matriz de decisão deve ter um valor para cada critério "
+                                 f"({len(linha)} valores para {len(criterios)} critérios)")
+
+        matriz_decisao = np.full((len(linhas), len(criterios)), np.nan, dtype=np.float64)
+        for i, linha in enumerate(linhas):
+            for j, criterio in enumerate(criterios):
+                if criterio["nome"] in pesos:
+                    matriz_decisao[i, j] = pesos[criterio["nome"]][linha[j]]
+                else:
+                    matriz_decisao[i, j] = float(linha[j])
+        return matriz_julgamento, matriz_decisao, lista_referencia
+
+    def executa(self):
+        """
+        Função que executa o modelo, registrando falhas como status em vez de interromper o processo
+
+        Args:
+            None
+
+        Returns:
+            resultado (dict): nome do modelo, status, mensagem, índice de consistência dos critérios e de
+            cada critério qualitativo, alternativas e respectivas relevâncias
+        """
+        resultado = {"modelo": self.nome, "status": 200, "mensagem": "OK", "consistencia": None,
+                     "consistencias_qualitativas": self.consistencias_qualitativas,
+                     "alternativas": list(self.definicao.get("alternativas", [])), "resultados": None}
+        process = None
+        try:
+            matriz_julgamento, matriz_decisao, lista_referencia = self.monta_matrizes()
+            # O AHP valida a matriz (aceitando comparações ausentes nos métodos que as suportam) e calcula
+            # prioridades e consistência uma única vez
+            process = ahp.AHP(matriz_julgamento = matriz_julgamento, matriz_decisao = matriz_decisao,
+                              lista_referencia_monotomica = lista_referencia, metodo = self.metodo)
+            resultado["resultados"] = process.executa_algoritmo().flatten().tolist()
+        except (ValueError, KeyError, IndexError, TypeError) as erro:
+            resultado["status"] = 400
+            resultado["mensagem"] = f"{type(erro).__name__}: {erro}"
+        if process is not None and process.consistencia is not None:
+            resultado["consistencia"] = float(process.consistencia)
+        return resultado
+
+def carrega_definicao(caminho):
+    """
+    Função que lê a definição de um modelo de um arquivo JSON ou YAML
+
+    Args:
+        caminho (str): caminho do arquivo
+
+    Returns:
+        definicao (dict): definição do modelo
+    """
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        if caminho.endswith(".json"):
+            return json.load(arquivo)
+        if yaml is None:
+            raise ImportError("A leitura de arquivos YAML requer o pacote pyyaml")
+        return yaml.safe_load(arquivo)
+
+def avalia_arquivo(argumentos):
+    """
+    Função executada por cada processo do pool: lê e avalia um arquivo de modelo
+
+    Args:
+        argumentos (tuple): caminho do arquivo e método de priorização
+
+    Returns:
+        resultado (dict): ver ModeloAHP.executa
+    """
+    caminho, metodo = argumentos
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    try:
+        definicao = carrega_definicao(caminho)
+    except Exception as erro:
+        return {"modelo": nome, "status": 400, "mensagem": f"{type(erro).__name__}: {erro}", "consistencia": None,
+                "consistencias_qualitativas": {}, "alternativas": [], "resultados": None}
+    return ModeloAHP(definicao, nome, metodo).executa()
+
+# Classe que avalia um conjunto de arquivos de modelo em paralelo e grava os resultados
+class ExecutorLote:
+    def __init__(self, processos = None, metodo = "aproximado") -> None:
+        """
+        Args:
+            processos (int): quantidade de processos do pool. None usa todos os núcleos; 1 executa no
+            processo atual
+            metodo (str): um dos métodos de ahp.PRIORIZACOES ('aproximado', 'autovetor', 'geometrica', 'llsm' ou 'incompleto')
+        """
+        self.processos = processos or os.cpu_count() or 1
+        self.metodo = metodo
+
+    def lista_arquivos(self, entradas):
+        """
+        Função que expande diretórios na lista de arquivos de modelo que eles contêm
+
+        Args:
+            entradas (list): caminhos de arquivos ou diretórios
+
+        Returns:
+            arquivos (list): caminhos dos arquivos de modelo, em ordem alfabética por diretório
+        """
+        arquivos = []
+        for entrada in entradas:
+            if os.path.isdir(entrada):
+                arquivos.extend(os.path.join(entrada, nome) for nome in sorted(os.listdir(entrada))
+                                if nome.endswith(EXTENSOES_MODELO))
+            else:
+                arquivos.append(entrada)
+        return arquivos
+
+    def executa(self, arquivos):
+        """
+        Função que avalia os arquivos de modelo, distribuindo-os entre os processos
+
+        Args:
+            arquivos (list): caminhos dos arquivos de modelo
+
+        Returns:
+            resultados (list): lista de dicionários (ver ModeloAHP.executa), na ordem dos arquivos
+        """
+        logger.info(f"Avaliando {len(arquivos)} modelos com {self.processos} processos")
+        tarefas = [(arquivo, self.metodo) for arquivo in arquivos]
+        if self.processos == 1:
+            return [avalia_arquivo(tarefa) for tarefa in tarefas]
+        tamanho_lote = max(1, len(tarefas) // (self.processos * 4))
+        with ProcessPoolExecutor(max_workers=self.processos) as executor:
+            return list(executor.map(avalia_arquivo, tarefas, chunksize=tamanho_lote))
+
+    def tabela(self, resultados):
+        """
+        Função que converte os resultados em um dataframe com uma linha por alternativa de cada modelo
+        (modelos com falha aparecem em uma única linha, sem alternativa)
+
+        Args:
+            resultados (list): lista de dicionários (ver ModeloAHP.executa)
+
+        Returns:
+            df (dataframe pandas): colunas modelo, alternativa, resultado, posicao, consistencia,
+            consistencias_qualitativas (JSON com o índice de cada critério qualitativo), status e mensagem
+        """
+        linhas = []
+        for resultado in resultados:
+            comum = {"modelo": resultado["modelo"], "consistencia": resultado["consistencia"],
+                     "consistencias_qualitativas": json.dumps(resultado.get("consistencias_qualitativas", {}), ensure_ascii=False),
+                     "status": resultado["status"], "mensagem": resultado["mensagem"]}
+            if resultado["resultados"] is None:
+                linhas.append({**comum, "alternativa": None, "resultado": None, "posicao": None})
+                continue
+            posicoes = np.argsort(np.argsort(-np.asarray(resultado["resultados"]), kind="stable"), kind="stable") + 1
+            for alternativa, valor, posicao in zip(resultado["alternativas"], resultado["resultados"], posicoes):
+                linhas.append({**comum, "alternativa": alternativa, "resultado": valor, "posicao": int(posicao)})
+        colunas = ["modelo", "alternativa", "resultado", "posicao", "consistencia", "consistencias_qualitativas", "status", "mensagem"]
+        df = pd.DataFrame(linhas, columns=colunas)
+        df["posicao"] = df["posicao"].astype("Int64")
+        return df
+
+    def salva(self, resultados, destino):
+        """
+        Função que grava os resultados em CSV, JSON ou Parquet, conforme a extensão do destino
+
+        Args:
+            resultados (list): lista de dicionários (ver ModeloAHP.executa)
+            destino (str): caminho do arquivo de saída (.csv, .json ou .parquet)
+
+        Returns:
+            None
+        """
+        if destino.endswith(".json"):
+            with open(destino, "w", encoding="utf-8") as arquivo:
+                json.dump(resultados, arquivo, ensure_ascii=False, indent=1)
+        elif destino.endswith(".parquet"):
+            self.tabela(resultados).to_parquet(destino, index=False)
+        else:
+            self.tabela(resultados).to_csv(destino, index=False)
+
+def main(argumentos = None):
+    parser = argparse.ArgumentParser(description="Executa modelos AHP definidos em arquivos JSON ou YAML, sem interface")
+    parser.add_argument("entradas", nargs="+", help="arquivos de modelo ou diretórios que os contêm")
+    parser.add_argument("-o", "--saida", default="resultados.csv", help="arquivo de saída (.csv, .json ou .parquet)")
+    parser.add_argument("-p", "--processos", type=int, default=None, help="quantidade de processos (padrão: todos os núcleos)")
+    parser.add_argument("-m", "--metodo", choices=tuple(ahp.PRIORIZACOES), default="aproximado",
+                        help="método de cálculo do vetor prioridade")
+    parser.add_argument("-v", "--verboso", action="store_true", help="exibe as mensagens de progresso")
+    args = parser.parse_args(argumentos)
+
+    # A configuração do logging cabe ao ponto de entrada, e não aos módulos de cálculo
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(message)s", level="INFO" if args.verboso else "WARNING")
+
+    executor = ExecutorLote(processos=args.processos, metodo=args.metodo)
+    arquivos = executor.lista_arquivos(args.entradas)
+    resultados = executor.executa(arquivos)
+    executor.salva(resultados, args.saida)
+    falhas = sum(resultado["status"] != 200 for resultado in resultados)
+    print(f"{len(resultados)} modelos avaliados ({falhas} com falha). Resultados gravados em {args.saida}")
+    return 1 if falhas > 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,10 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+
+# Valores da escala fundamental de Saaty oferecidos ao tomador de decisão
+ESCALA_SAATY = ("1/9", "1/8","1/7","1/6","1/5","1/4","1/3","1/2","1","2","3","4",
+                "5","6","7","8","9")
 
 # Classe que apoia a montagem de dataframes e outras operações correlatas para compor
 # os objetos necessários para execução do programa
@@ -17,15 +22,48 @@ class DealWithDf:
         Returns:
             df (dataframe pandas)
         """
-        # Iterando sobre o dataframe
-        for idx in df.index:
-            for col in df.columns:
-                # Checando se o index é o mesmo que a coluna
-                if idx == col:
-                    # garantindo a diagonal princial igual a 1
-                    df.loc[idx, col] = 1
+        # Máscara com as posições em que o index é o mesmo que a coluna, montada de uma só vez
+        mascara = df.index.to_numpy()[:, np.newaxis] == df.columns.to_numpy()[np.newaxis, :]
+        # garantindo a diagonal princial igual a 1
+        df = df.mask(mascara, 1)
         return df
 
+    def build_reciprocal_matrix(self, upper_values, size):
+        """
+        Função que monta uma matriz de julgamento recíproca (float64 contígua) a partir dos julgamentos
+        do triângulo superior, preenchendo a diagonal e o triângulo inferior em operações vetorizadas
+
+        Args:
+            upper_values (list, numpy array): julgamentos aij (i < j), na ordem de leitura por linhas
+            size (int): quantidade de critérios
+        
+        Returns:
+            matrix (numpy array): matriz de julgamento (size, size) em float64
+        """
+        upper_values = np.asarray(upper_values, dtype=np.float64)
+        linhas, colunas = np.triu_indices(size, k=1)
+        if upper_values.shape != linhas.shape:
+            raise ValueError(f"São necessários {len(linhas)} julgamentos para {size} critérios")
+        matrix = np.ones((size, size), dtype=np.float64)
+        matrix[linhas, colunas] = upper_values
+        matrix[colunas, linhas] = 1.0 / upper_values
+        return matrix
+
+    def matrix_to_dataframe(self, matrix, labels, columns = None):
+        """
+        Função que associa os rótulos a uma matriz numérica apenas para exibição. Os cálculos do ahp
+        devem usar a própria matriz (ou df.to_numpy()), que permanece em float64
+
+        Args:
+            matrix (numpy array): matriz numérica
+            labels (list): rótulos das linhas
+            columns (list): rótulos das colunas (por padrão, os mesmos das linhas)
+        
+        Returns:
+            df (dataframe pandas): dataframe float64 com os rótulos informados
+        """
+        return pd.DataFrame(matrix, index=labels, columns=labels if columns is None else columns, copy=False)
+
     def create_dataframe_from_list(self, list_of_strings):
         """
         Função que cria um dataframe tendo como índices e colunas uma mesma lista de strings
@@ -51,24 +89,127 @@ class DealWithDf:
             type (str): valor que ajuda a criar objetos de entradas no streamlit com diferentes IDs
         
         Returns:
-            df (dataframe pandas): dataframe contendo os valores da matrix de julgamento fornecidos pelo
+            df (dataframe pandas): dataframe (float64) contendo os valores da matrix de julgamento fornecidos pelo
             usuário
         """
         index = list(df.index)
         columns = list(df.columns)
+        # Os julgamentos são coletados na ordem do triângulo superior e a matriz é montada de uma só vez
+        upper_values = []
         for i in range(len(index)):
             for j in range(i + 1, len(columns)):
                 cell_value = st.selectbox(f"Qual a relação de importância entre {index[i]} e {columns[j]}", 
-                                        ("1/9", "1/8","1/7","1/6","1/5","1/4","1/3","1/2","1","2","3","4",
-                                        "5","6","7","8","9"),
+                                        ESCALA_SAATY,
                                         key=f"{type}_{i}_{j}")
                 if "/" in cell_value:
                     numbers = cell_value.split("/")
                     cell_value = int(numbers[0]) / int(numbers[1])
+                upper_values.append(float(cell_value))
 
-                df.at[index[i], columns[j]] = float(cell_value)
-                df.at[columns[j], index[i]] = 1 / float(cell_value)    
-        return df
+        matrix = self.build_reciprocal_matrix(upper_values, len(index))
+        return self.matrix_to_dataframe(matrix, index, columns)
+
+    def convert_judgements(self, values):
+        """
+        Função que converte, de forma vetorizada, julgamentos em texto ("3", "1/3", "0.5") em números
+
+        Args:
+            values (series pandas): julgamentos em texto ou numéricos
+        
+        Returns:
+            values (numpy array): julgamentos em float64 (NaN para valores inválidos)
+        """
+        partes = values.astype(str).str.strip().str.split("/", n=1, expand=True)
+        numerador = pd.to_numeric(partes[0], errors="coerce")
+        if partes.shape[1] > 1:
+            denominador = pd.to_numeric(partes[1], errors="coerce").fillna(1)
+        else:
+            denominador = 1
+        return (numerador / denominador).to_numpy(dtype=np.float64)
+
+    def create_judgement_grid(self, df, type):
+        """
+        Função que cria a matriz de julgamento a partir de uma única tabela editável (um par de critérios
+        por linha) ou de um CSV enviado com as colunas 'criterio_a', 'criterio_b' e 'julgamento',
+        substituindo um selectbox por célula
+
+        Args:
+            df (dataframe pandas): dataframe que contém os critérios como índices e colunas
+            type (str): valor que ajuda a criar objetos de entradas no streamlit com diferentes IDs
+        
+        Returns:
+            df (dataframe pandas): dataframe (float64) contendo os valores da matrix de julgamento
+        """
+        index = list(df.index)
+        nomes = np.array(index, dtype=object)
+        linhas, colunas = np.triu_indices(len(index), k=1)
+        pares = pd.DataFrame({"criterio_a": nomes[linhas], "criterio_b": nomes[colunas], "julgamento": "1"})
+
+        arquivo = st.file_uploader("Enviar julgamentos (CSV com colunas criterio_a, criterio_b e julgamento)",
+                                   type="csv", key=f"upload_{type}")
+        if arquivo is not None:
+            enviados = pd.read_csv(arquivo, dtype=str)
+            pares = pares.drop(columns="julgamento").merge(enviados, on=["criterio_a", "criterio_b"], how="left")
+            pares["julgamento"] = pares["julgamento"].fillna("1")
+
+        pares = st.data_editor(pares, key=f"grid_{type}", hide_index=True, use_container_width=True,
+                               disabled=["criterio_a", "criterio_b"],
+                               column_config={"julgamento": st.column_config.TextColumn(
+                                   "Importância de critério_a sobre critério_b", help=f"Valores da escala de Saaty: {', '.join(ESCALA_SAATY)}")})
+
+        valores = self.convert_judgements(pares["julgamento"])
+        if not np.all(valores > 0):
+            raise ValueError("Todos os julgamentos devem ser números positivos (por exemplo 3 ou 1/3)")
+        matriz = self.build_reciprocal_matrix(valores, len(index))
+        return self.matrix_to_dataframe(matriz, index)
+
+    def create_decision_grid(self, data_alternativas, data_criterios, flag, dict_quali = None):
+        """
+        Função que cria a matriz de decisão a partir de uma única tabela editável (ou de um CSV enviado,
+        com as alternativas na primeira coluna e um critério por coluna), substituindo um widget por célula
+
+        Args:
+            data_alternativas (dataframe pandas): df contendo as alternativas fornecidas
+            data_criterios (dataframe pandas): df contendo os critérios fornecidos
+            flag (bool): variável que indica se há presença de critérios qualitativos
+            dict_quali (dict): dicionário que contém o de / para entre valores qualitativos e seus respectivos
+            pesos calculados
+        
+        Returns:
+            df (dataframe pandas): dataframe (float64) contendo como valor a matriz de decisão
+        """
+        if flag == True and dict_quali == None:
+            raise ValueError("Quando flag é True (indicando que houve critérios qualitativos), dict_quali não pode ser None")
+
+        index = list(data_alternativas["alternativas"])
+        columns = list(data_criterios["criterios"])
+        # Os tipos dos critérios são consultados uma única vez
+        tipos = dict(zip(data_criterios["criterios"], data_criterios["tipo"]))
+        qualitativos = [coluna for coluna in columns if tipos[coluna] == "qualitativo"]
+        quantitativos = [coluna for coluna in columns if tipos[coluna] != "qualitativo"]
+
+        arquivo = st.file_uploader("Enviar matriz de decisão (CSV com as alternativas na primeira coluna)",
+                                   type="csv", key="upload_decisao")
+        if arquivo is not None:
+            tabela = pd.read_csv(arquivo, index_col=0).reindex(index=index, columns=columns)
+        else:
+            tabela = pd.DataFrame(index=index, columns=columns)
+        tabela[quantitativos] = tabela[quantitativos].apply(pd.to_numeric, errors="coerce").fillna(0.0)
+        for coluna in qualitativos:
+            tabela[coluna] = tabela[coluna].fillna(next(iter(dict_quali[coluna])))
+
+        configuracao = {coluna: st.column_config.SelectboxColumn(coluna, options=list(dict_quali[coluna].keys()), required=True)
+                        for coluna in qualitativos}
+        configuracao.update({coluna: st.column_config.NumberColumn(coluna, required=True) for coluna in quantitativos})
+        tabela = st.data_editor(tabela, key="grid_decisao", use_container_width=True, column_config=configuracao)
+
+        decision_matrix = pd.DataFrame(index=index, columns=columns, dtype=np.float64)
+        decision_matrix[quantitativos] = tabela[quantitativos].apply(pd.to_numeric, errors="coerce")
+        for coluna in qualitativos:
+            decision_matrix[coluna] = tabela[coluna].map(dict_quali[coluna]).astype(np.float64)
+        if decision_matrix.isna().to_numpy().any():
+            raise ValueError("A matriz de decisão possui valores ausentes ou inválidos")
+        return decision_matrix
 
     def create_decision_table(self, data_alternativas, data_criterios, flag, dict_quali = None):
         """
@@ -82,18 +223,20 @@ class DealWithDf:
             pesos calculados
         
         Returns:
-            df (dataframe pandas): dataframe contendo como valor a matriz de decisão
+            df (dataframe pandas): dataframe (float64) contendo como valor a matriz de decisão
         """
         if flag == True and dict_quali == None:
             raise ValueError("Quando flag é True (indicando que houve critérios qualitativos), dict_quali não pode ser None")
         
         index = list(data_alternativas["alternativas"])
         columns = list(data_criterios["criterios"])
-        decision_matrix = pd.DataFrame(index = index, columns = columns)
+        decision_matrix = np.empty((len(index), len(columns)), dtype=np.float64)
+        # Os tipos dos critérios são consultados uma única vez, e não a cada célula
+        tipos = dict(zip(data_criterios["criterios"], data_criterios["tipo"]))
 
         for i in range(len(index)):
             for j in range(len(columns)):
-                tipo = data_criterios[data_criterios["criterios"] == columns[j]]["tipo"].values[0]
+                tipo = tipos[columns[j]]
                 if tipo == "quantitativo":
                     cell_value = st.number_input(f"Indique o valor quando a alternativa for {index[i]} e o critério {columns[j]}", key = f"{i}_{j}")
                 if tipo == "qualitativo":
@@ -102,26 +245,62 @@ class DealWithDf:
                                             ,valores_possiveis
                                             , key = f"{i}_{j}")
                     cell_value = dict_quali[columns[j]][aux_value]
-                decision_matrix.at[index[i], columns[j]] = cell_value
-        return decision_matrix
+                decision_matrix[i, j] = cell_value
+        return self.matrix_to_dataframe(decision_matrix, index, columns)
 
-    def color_coding(self, row, max, min):
+    def create_repair_table(self, sugestoes, labels):
         """
-        Função que cria um mapeamento em um dataframe para definição de cores personalizadas baseando-se
-        em uma coluna de resultados.
+        Função que cria um dataframe com as sugestões de ajuste da matriz de julgamento, para exibição
 
         Args:
-            row (tuple): linha do dataframe percorrido
-            max (float): valor máximo presente na coluna 'resultados'
-            min(float): valor mínimo presente na coluna 'resultados'
+            sugestoes (list): sugestões retornadas por ReparoConsistencia.sugere
+            labels (list): nomes das linhas/colunas da matriz de julgamento
         
         Returns:
-            result (list): Lista contendo o mapeamento de cores a ser aplicado
+            df (dataframe pandas): dataframe com o par de elementos, o valor atual, o valor sugerido e a
+            razão de consistência após cada ajuste
         """
-        if row.resultados == max:
-            result = ['background-color:green'] * len(row) 
-        elif row.resultados != min: 
-            result = ['background-color:yellow'] * len(row) 
-        else:
-            result = ['background-color:red'] * len(row)
-        return result
\ No newline at end of file
+        df = pd.DataFrame(sugestoes, columns=["i", "j", "valor_atual", "valor_sugerido", "consistencia"])
+        nomes = np.array(labels, dtype=object)
+        df.insert(0, "elemento_linha", nomes[df["i"].to_numpy(dtype=int)])
+        df.insert(1, "elemento_coluna", nomes[df["j"].to_numpy(dtype=int)])
+        return df.drop(columns=["i", "j"])
+
+    def color_coding(self, df, max, min):
+        """
+        Função que cria, de forma vetorizada, o mapeamento de cores de um dataframe baseando-se na
+        coluna de resultados (usada com Styler.apply(axis=None), uma única chamada para toda a tabela)
+
+        Args:
+            df (dataframe pandas): dataframe exibido (por exemplo, uma página dos resultados)
+            max (float): valor máximo da coluna 'resultados' entre todas as alternativas
+            min (float): valor mínimo da coluna 'resultados' entre todas as alternativas
+        
+        Returns:
+            result (dataframe pandas): dataframe com o mesmo formato de df contendo o estilo de cada célula
+        """
+        resultados = df["resultados"].to_numpy()
+        cores = np.where(resultados == max, "background-color:green",
+                         np.where(resultados == min, "background-color:red", "background-color:yellow"))
+        return pd.DataFrame(np.repeat(cores[:, np.newaxis], df.shape[1], axis=1), index=df.index, columns=df.columns)
+
+    def create_results_page(self, data_alternativas, classificacao, resultado, inicio, tamanho, melhores = True):
+        """
+        Função que monta apenas a página exibida dos resultados, sem copiar todas as alternativas
+
+        Args:
+            data_alternativas (dataframe pandas): df contendo as alternativas fornecidas
+            classificacao (Classificacao): classificação das alternativas pelo resultado
+            resultado (numpy array): relevância de cada alternativa
+            inicio (int): posição inicial da página (0 = primeira alternativa)
+            tamanho (int): quantidade de alternativas por página
+            melhores (bool): True percorre da melhor para a pior; False, da pior para a melhor
+        
+        Returns:
+            df (dataframe pandas): dataframe com as alternativas da página, sua posição e seu resultado
+        """
+        indices, posicoes = classificacao.pagina(inicio, tamanho, melhores)
+        df = data_alternativas.iloc[indices].reset_index(drop=True)
+        df.insert(0, "posicao", posicoes)
+        df["resultados"] = np.asarray(resultado, dtype=np.float64).reshape(-1)[indices]
+        return df
@@ -0,0 +1,217 @@
+import logging
+import numpy as np
+import pandas as pd
+from ahp import MatrizJulgamento
+
+logger = logging.getLogger(__name__)
+
+# Classe que agrega as matrizes de julgamento de vários respondentes em uma decisão de grupo, nos
+# modos AIJ (média geométrica elemento a elemento das matrizes) e AIP (agregação dos vetores
+# prioridade individuais). Os respondentes são processados em blocos vetorizados, o que permite
+# ler arquivos maiores que a memória disponível
+class AgregacaoGrupo:
+    def __init__(self, modo = "AIJ", metodo = "aproximado", tamanho_bloco = 10000, tolerancia_validacao = 1e-6) -> None:
+        """
+        Args:
+            modo (str): 'AIJ' (agregação dos julgamentos) ou 'AIP' (agregação das prioridades)
+            metodo (str): 'aproximado' (normalização das colunas) ou 'autovetor' (método das potências)
+            tamanho_bloco (int): quantidade de respondentes processados de uma só vez
+            tolerancia_validacao (float): maior erro aceito na diagonal e na reciprocidade de cada respondente
+        """
+        logger.debug("Iniciando a classe de agregação de grupo")
+        if modo not in ("AIJ", "AIP"):
+            raise ValueError("O modo deve ser 'AIJ' ou 'AIP'")
+        if metodo not in ("aproximado", "autovetor"):
+            raise ValueError("O método deve ser 'aproximado' ou 'autovetor'")
+        self.modo = modo
+        self.metodo = metodo
+        self.tamanho_bloco = tamanho_bloco
+        self.tolerancia_validacao = tolerancia_validacao
+        self.class_matriz_julgamento = MatrizJulgamento()
+
+    def prioridades(self, matrizes):
+        """
+        Função que calcula, de forma vetorizada, os vetores prioridade e as razões de consistência de
+        uma pilha de matrizes de julgamento
+
+        Args:
+            matrizes (numpy array): pilha (r, n, n) de matrizes de julgamento
+
+        Returns:
+            vetores_prioridade (numpy array): pilha (r, n, 1) de vetores prioridade
+            consistencias (numpy array): vetor (r,) com as razões de consistência (em percentual)
+        """
+        mj = self.class_matriz_julgamento
+        if self.metodo == "autovetor":
+            vetores_prioridade, lambda_max = mj.autovetor_principal(matrizes)
+            consistencias = mj.razao_consistencia(lambda_max, matrizes.shape[-1])
+        else:
+            vetores_prioridade = mj.normalizacao_julgamentos(matrizes)
+            consistencias = mj.analise_consistencia(matrizes, vetores_prioridade)
+        return vetores_prioridade, np.atleast_1d(consistencias)
+
+    def blocos_de_array(self, matrizes):
+        """
+        Função que divide uma pilha de matrizes (em memória ou mapeada do disco) em blocos
+
+        Args:
+            matrizes (numpy array): pilha (r, n, n) de matrizes de julgamento
+
+        Returns:
+            blocos (generator): blocos (b, n, n) de matrizes em float64
+        """
+        for inicio in range(0, matrizes.shape[0], self.tamanho_bloco):
+            yield np.asarray(matrizes[inicio:inicio + self.tamanho_bloco], dtype=np.float64)
+
+    def monta_matrizes(self, valores, formato):
+        """
+        Função que converte linhas de valores em matrizes de julgamento
+
+        Args:
+            valores (numpy array): matriz (b, c) com um respondente por linha
+            formato (str): 'completo' (c = n * n, matriz achatada por linhas) ou 'triangular'
+            (c = n * (n - 1) / 2, triângulo superior lido por linhas)
+
+        Returns:
+            matrizes (numpy array): pilha (b, n, n) de matrizes de julgamento
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        quantidade, colunas = valores.shape
+        if formato == "completo":
+            tamanho = int(round(np.sqrt(colunas)))
+            if tamanho * tamanho != colunas:
+                raise ValueError("No formato 'completo' cada linha deve conter n * n valores")
+            return valores.reshape(quantidade, tamanho, tamanho)
+        if formato == "triangular":
+            tamanho = int(round((1 + np.sqrt(1 + 8 * colunas)) / 2))
+            if tamanho * (tamanho - 1) // 2 != colunas:
+                raise ValueError("No formato 'triangular' cada linha deve conter n * (n - 1) / 2 valores")
+            linhas, colunas_superiores = np.triu_indices(tamanho, k=1)
+            matrizes = np.ones((quantidade, tamanho, tamanho))
+            matrizes[:, linhas, colunas_superiores] = valores
+            matrizes[:, colunas_superiores, linhas] = 1.0 / valores
+            return matrizes
+        raise ValueError("O formato deve ser 'completo' ou 'triangular'")
+
+    def blocos_de_arquivo(self, caminho, formato = "completo", cabecalho = False):
+        """
+        Função que lê respondentes de um arquivo .npy (mapeado em memória) ou .csv (lido em partes)
+
+        Args:
+            caminho (str): caminho do arquivo. Um .npy pode conter uma pilha (r, n, n) ou uma matriz
+            (r, c); um .csv deve conter um respondente por linha
+            formato (str): disposição dos valores em cada linha ('completo' ou 'triangular')
+            cabecalho (bool): indica se o .csv possui uma linha de cabeçalho
+
+        Returns:
+            blocos (generator): blocos (b, n, n) de matrizes de julgamento
+        """
+        if str(caminho).endswith(".npy"):
+            dados = np.load(caminho, mmap_mode="r")
+            if dados.ndim == 3:
+                yield from self.blocos_de_array(dados)
+            else:
+                for inicio in range(0, dados.shape[0], self.tamanho_bloco):
+                    yield self.monta_matrizes(dados[inicio:inicio + self.tamanho_bloco], formato)
+        else:
+            leitor = pd.read_csv(caminho, header=0 if cabecalho else None, chunksize=self.tamanho_bloco)
+            for parte in leitor:
+                yield self.monta_matrizes(parte.to_numpy(dtype=np.float64), formato)
+
+    def agrega(self, matrizes):
+        """
+        Função que agrega uma pilha de matrizes de julgamento (r, n, n) em memória ou mapeada do disco
+
+        Args:
+            matrizes (numpy array): pilha (r, n, n) de matrizes de julgamento
+
+        Returns:
+            resultado (dict): ver agrega_blocos
+        """
+        return self.agrega_blocos(self.blocos_de_array(matrizes))
+
+    def agrega_arquivo(self, caminho, formato = "completo", cabecalho = False):
+        """
+        Função que agrega os respondentes de um arquivo .npy ou .csv sem carregá-lo inteiro na memória
+
+        Args:
+            caminho (str): caminho do arquivo
+            formato (str): disposição dos valores em cada linha ('completo' ou 'triangular')
+            cabecalho (bool): indica se o .csv possui uma linha de cabeçalho
+
+        Returns:
+            resultado (dict): ver agrega_blocos
+        """
+        logger.info(f"Agregando os julgamentos do arquivo {caminho}")
+        return self.agrega_blocos(self.blocos_de_arquivo(caminho, formato, cabecalho))
+
+    def agrega_blocos(self, blocos):
+        """
+        Função que agrega os respondentes em uma única passagem pelos blocos. São acumuladas a soma
+        dos logaritmos (das matrizes no modo AIJ ou dos vetores prioridade no modo AIP), os vetores
+        prioridade individuais (r, n) e as razões de consistência individuais (r,). Cada bloco é validado
+        (julgamentos positivos, diagonal unitária e reciprocidade) e os respondentes reprovados são informados no erro
+
+        Args:
+            blocos (iterable): blocos (b, n, n) de matrizes de julgamento
+
+        Returns:
+            resultado (dict): matriz de julgamento do grupo (apenas AIJ), vetor prioridade do grupo (n, 1),
+            razão de consistência do grupo (apenas AIJ), razões de consistência individuais (r,), distância
+            euclidiana de cada vetor prioridade individual ao do grupo (r,) e quantidade de respondentes
+        """
+        logger.debug(f"Agregando os julgamentos do grupo (modo {self.modo})")
+        soma_logaritmos = None
+        lista_prioridades = []
+        lista_consistencias = []
+        lista_invalidos = []
+        respondentes = 0
+        for matrizes in blocos:
+            validos, _ = self.class_matriz_julgamento.valida_matriz(matrizes, self.tolerancia_validacao)
+            validos &= (matrizes > 0).all(axis=(-2, -1))
+            if not validos.all():
+                lista_invalidos.append(respondentes + np.flatnonzero(~validos))
+            if len(lista_invalidos) > 0:
+                # Após a primeira falha os blocos restantes são apenas validados, para reportar todos os respondentes
+                respondentes += matrizes.shape[0]
+                continue
+            vetores_prioridade, consistencias = self.prioridades(matrizes)
+            if self.modo == "AIJ":
+                parcial = np.log(matrizes).sum(axis=0)
+            else:
+                parcial = np.log(vetores_prioridade[:, :, 0]).sum(axis=0)
+            soma_logaritmos = parcial if soma_logaritmos is None else soma_logaritmos + parcial
+            lista_prioridades.append(vetores_prioridade[:, :, 0])
+            lista_consistencias.append(consistencias)
+            respondentes += matrizes.shape[0]
+
+        if respondentes == 0:
+            raise ValueError("Nenhum respondente foi informado")
+        if len(lista_invalidos) > 0:
+            invalidos = np.concatenate(lista_invalidos)
+            raise ValueError(f"Os julgamentos devem ser positivos, com diagonal unitária e recíprocos "
+                             f"(falha nos respondentes {', '.join(str(i) for i in invalidos[:10])}"
+                             f"{' e outros' if len(invalidos) > 10 else ''})")
+
+        prioridades_individuais = np.concatenate(lista_prioridades)
+        consistencias_individuais = np.concatenate(lista_consistencias)
+        media_geometrica = np.exp(soma_logaritmos / respondentes)
+        if self.modo == "AIJ":
+            matriz_grupo = media_geometrica
+            vetor_grupo, consistencia_grupo = self.prioridades(matriz_grupo[np.newaxis])
+            vetor_grupo = vetor_grupo[0]
+            consistencia_grupo = float(consistencia_grupo[0])
+        else:
+            matriz_grupo = None
+            consistencia_grupo = None
+            vetor_grupo = (media_geometrica / media_geometrica.sum()).reshape((-1, 1))
+
+        distancias = np.linalg.norm(prioridades_individuais - vetor_grupo[:, 0], axis=1)
+        return {
+            "matriz_grupo": matriz_grupo,
+            "vetor_prioridade": vetor_grupo,
+            "consistencia_grupo": consistencia_grupo,
+            "consistencias": consistencias_individuais,
+            "distancias": distancias,
+            "respondentes": respondentes,
+        }
@@ -0,0 +1,265 @@
+import logging
+import numpy as np
+from ahp import MatrizJulgamento, MatrizDecisao
+
+logger = logging.getLogger(__name__)
+
+# Classe que representa um nó da hierarquia (objetivo, critério, subcritério...). Nós internos possuem
+# uma matriz de julgamento que compara seus filhos; folhas correspondem a colunas da matriz de decisão
+class NoHierarquia:
+    def __init__(self, nome, matriz_julgamento = None, filhos = None) -> None:
+        """
+        Args:
+            nome (str): nome do nó (deve ser único na hierarquia)
+            matriz_julgamento (numpy array): matriz de julgamento entre os filhos do nó (None para folhas)
+            filhos (list): lista de objetos NoHierarquia subordinados a este nó
+        """
+        self.nome = nome
+        self.filhos = list(filhos) if filhos is not None else []
+        self.matriz_julgamento = None if matriz_julgamento is None else np.array(matriz_julgamento, dtype=np.float64)
+        self.pai = None
+        for filho in self.filhos:
+            filho.pai = self
+
+        if len(self.filhos) > 0 and self.matriz_julgamento is None:
+            raise ValueError(f"O nó {nome} possui filhos e precisa de uma matriz de julgamento")
+        if self.matriz_julgamento is not None and self.matriz_julgamento.shape != (len(self.filhos), len(self.filhos)):
+            raise ValueError(f"A matriz de julgamento do nó {nome} deve ser quadrada com uma linha por filho")
+
+        # Resultados calculados pela hierarquia
+        self.vetor_prioridade = None
+        self.consistencia = 0.0
+        self.peso_global = 1.0
+        self.pontuacao = None
+
+    def eh_folha(self):
+        """
+        Função que indica se o nó é uma folha (critério sem subcritérios)
+
+        Args:
+            None
+
+        Returns:
+            (bool): True quando o nó não possui filhos
+        """
+        return len(self.filhos) == 0
+
+# Classe que compõe os vetores prioridade locais de cada nó em pesos globais e na pontuação final
+# das alternativas. Alterações em um nó recalculam apenas sua subárvore e seus ancestrais
+class Hierarquia:
+    def __init__(self, raiz, matriz_decisao, lista_referencia_monotomica, metodo = "aproximado", tolerancia_validacao = 1e-6,
+                 limite_consistencia = 10) -> None:
+        """
+        Args:
+            raiz (NoHierarquia): nó raiz (objetivo) da hierarquia
+            matriz_decisao (numpy array): matriz de decisão com uma coluna por folha, na ordem de percurso
+            em profundidade da hierarquia (ver o método folhas)
+            lista_referencia_monotomica (list): lista contendo '-1' (custo) ou '1' (lucro) para cada folha
+            metodo (str): 'aproximado' (normalização das colunas) ou 'autovetor' (método das potências)
+            tolerancia_validacao (float): erro aceito na diagonal e na reciprocidade das matrizes de julgamento
+            limite_consistencia (float): maior razão de consistência (em percentual) aceita em cada nó
+        """
+        logger.debug("Iniciando a classe Hierarquia")
+        if metodo not in ("aproximado", "autovetor"):
+            raise ValueError("O método deve ser 'aproximado' ou 'autovetor'")
+        self.raiz = raiz
+        self.metodo = metodo
+        self.tolerancia_validacao = tolerancia_validacao
+        self.limite_consistencia = limite_consistencia
+        self.class_matriz_julgamento = MatrizJulgamento()
+
+        self.nos = {}
+        for no in self.percorre(raiz):
+            if no.nome in self.nos:
+                raise ValueError(f"O nome {no.nome} aparece mais de uma vez na hierarquia")
+            self.nos[no.nome] = no
+
+        folhas = self.folhas()
+        matriz_decisao = np.asarray(matriz_decisao, dtype=np.float64)
+        if matriz_decisao.ndim != 2 or matriz_decisao.shape[1] != len(folhas):
+            raise ValueError("A matriz de decisão deve possuir uma coluna para cada folha da hierarquia")
+        matriz_normalizada = MatrizDecisao().normalizacao_decisao(matriz_decisao, lista_referencia_monotomica)
+        for coluna, nome in enumerate(folhas):
+            self.nos[nome].pontuacao = matriz_normalizada[:, coluna:coluna + 1]
+
+        self.calcula_local(raiz, recursivo=True)
+        self.propaga_pesos(raiz)
+
+    def percorre(self, no):
+        """
+        Função que percorre a subárvore de um nó em profundidade (pré-ordem)
+
+        Args:
+            no (NoHierarquia): nó inicial
+
+        Returns:
+            nos (generator): nós da subárvore, começando pelo próprio nó
+        """
+        pilha = [no]
+        while pilha:
+            atual = pilha.pop()
+            yield atual
+            pilha.extend(reversed(atual.filhos))
+
+    def folhas(self):
+        """
+        Função que lista as folhas da hierarquia na ordem esperada para as colunas da matriz de decisão
+
+        Args:
+            None
+
+        Returns:
+            folhas (list): nomes das folhas
+        """
+        return [no.nome for no in self.percorre(self.raiz) if no.eh_folha()]
+
+    def calcula_prioridade(self, no, matriz_julgamento = None):
+        """
+        Função que valida a matriz de julgamento de um nó interno e calcula seu vetor prioridade local
+        e sua razão de consistência, sem alterar o nó. Matrizes com razão de consistência acima do
+        limite são reprovadas
+
+        Args:
+            no (NoHierarquia): nó interno da hierarquia
+            matriz_julgamento (numpy array): matriz a ser avaliada (por padrão, a matriz atual do nó)
+
+        Returns:
+            vetor_prioridade (numpy array): vetor prioridade local (n, 1)
+            consistencia (float): razão de consistência (em percentual)
+        """
+        if matriz_julgamento is None:
+            matriz_julgamento = no.matriz_julgamento
+        mj = self.class_matriz_julgamento
+        message, status = mj.verifica_qualidade_matriz(matriz_julgamento, self.tolerancia_validacao)
+        if status != 200:
+            raise ValueError(f"{no.nome}: {message}")
+        message, status = mj.checa_reciprocidade(matriz_julgamento, self.tolerancia_validacao)
+        if status != 200:
+            raise ValueError(f"{no.nome}: {message}")
+
+        if self.metodo == "autovetor":
+            vetor_prioridade, lambda_max = mj.autovetor_principal(matriz_julgamento)
+            consistencia = mj.razao_consistencia(lambda_max, len(no.filhos))
+        else:
+            vetor_prioridade = mj.normalizacao_julgamentos(matriz_julgamento)
+            consistencia = mj.analise_consistencia(matriz_julgamento, vetor_prioridade)
+        if consistencia > self.limite_consistencia:
+            raise ValueError(f"""{no.nome}: O teste de consistência da matriz de julgamento reprovou as prioridades definidas.\n
+                        O resultando da razão de consistência deve ser menor que {self.limite_consistencia}%. O valor encontrado foi
+                        {consistencia}""")
+        return vetor_prioridade, consistencia
+
+    def calcula_pontuacao(self, no):
+        """
+        Função que compõe a pontuação das alternativas de um nó interno a partir das pontuações de
+        seus filhos, ponderadas pelo vetor prioridade local
+
+        Args:
+            no (NoHierarquia): nó interno da hierarquia
+
+        Returns:
+            None
+        """
+        pontuacoes_filhos = np.hstack([filho.pontuacao for filho in no.filhos])
+        no.pontuacao = np.matmul(pontuacoes_filhos, no.vetor_prioridade)
+
+    def calcula_local(self, no, recursivo = False):
+        """
+        Função que recalcula o vetor prioridade e a pontuação de um nó (e, opcionalmente, de toda a
+        sua subárvore, das folhas para a raiz)
+
+        Args:
+            no (NoHierarquia): nó a ser recalculado
+            recursivo (bool): indica se a subárvore também deve ser recalculada
+
+        Returns:
+            None
+        """
+        if no.eh_folha():
+            return
+        if recursivo:
+            for filho in no.filhos:
+                self.calcula_local(filho, recursivo=True)
+        no.vetor_prioridade, no.consistencia = self.calcula_prioridade(no)
+        self.calcula_pontuacao(no)
+
+    def propaga_pesos(self, no):
+        """
+        Função que atualiza os pesos globais da subárvore de um nó: o peso global de cada filho é o
+        peso global do pai multiplicado pelo peso local do filho
+
+        Args:
+            no (NoHierarquia): nó a partir do qual os pesos são propagados
+
+        Returns:
+            None
+        """
+        for atual in self.percorre(no):
+            for indice, filho in enumerate(atual.filhos):
+                filho.peso_global = atual.peso_global * float(atual.vetor_prioridade[indice][0])
+
+    def atualiza_julgamento(self, nome, matriz_julgamento):
+        """
+        Função que substitui a matriz de julgamento de um nó e recalcula apenas o necessário: o próprio
+        nó, os pesos globais de sua subárvore e as pontuações de seus ancestrais. Se a nova matriz for
+        reprovada na validação, o nó permanece inalterado
+
+        Args:
+            nome (str): nome do nó alterado
+            matriz_julgamento (numpy array): nova matriz de julgamento do nó
+
+        Returns:
+            None
+        """
+        logger.debug(f"Atualizando a matriz de julgamento do nó {nome}")
+        no = self.nos[nome]
+        matriz_julgamento = np.array(matriz_julgamento, dtype=np.float64)
+        if matriz_julgamento.shape != (len(no.filhos), len(no.filhos)):
+            raise ValueError(f"A matriz de julgamento do nó {nome} deve ser quadrada com uma linha por filho")
+        vetor_prioridade, consistencia = self.calcula_prioridade(no, matriz_julgamento)
+        no.matriz_julgamento = matriz_julgamento
+        no.vetor_prioridade = vetor_prioridade
+        no.consistencia = consistencia
+        self.calcula_pontuacao(no)
+        self.propaga_pesos(no)
+
+        ancestral = no.pai
+        while ancestral is not None:
+            self.calcula_pontuacao(ancestral)
+            ancestral = ancestral.pai
+
+    def pesos_globais(self):
+        """
+        Função que retorna o peso global de cada folha
+
+        Args:
+            None
+
+        Returns:
+            pesos (dict): dicionário nome da folha -> peso global
+        """
+        return {nome: self.nos[nome].peso_global for nome in self.folhas()}
+
+    def consistencias(self):
+        """
+        Função que retorna a razão de consistência (em percentual) de cada nó interno
+
+        Args:
+            None
+
+        Returns:
+            consistencias (dict): dicionário nome do nó -> razão de consistência
+        """
+        return {no.nome: no.consistencia for no in self.percorre(self.raiz) if not no.eh_folha()}
+
+    def resultado(self):
+        """
+        Função que retorna a relevância de cada alternativa segundo toda a hierarquia
+
+        Args:
+            None
+
+        Returns:
+            resultado (numpy array): vetor (m, 1) com a pontuação de cada alternativa
+        """
+        return self.raiz.pontuacao
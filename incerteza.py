@@ -0,0 +1,234 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ahp import MatrizJulgamento, MatrizDecisao
+from indice_aleatorio import ESCALA_SAATY
+
+logger = logging.getLogger(__name__)
+
+# Simulação compartilhada pelos processos do pool (definida uma única vez por processo)
+_simulacao_processo = None
+
+def _inicializa_processo(simulacao):
+    global _simulacao_processo
+    _simulacao_processo = simulacao
+
+def _executa_tarefa(argumentos):
+    semente, quantidade = argumentos
+    return _simulacao_processo.simula_tarefa(semente, quantidade)
+
+# Classe que trata os julgamentos da matriz de julgamento como incertos (variações de alguns passos
+# na escala de Saaty) e estima, por simulação de Monte Carlo, a probabilidade de cada alternativa
+# ocupar cada posição da ordenação. As estatísticas são acumuladas em blocos, com memória constante
+class SimulacaoIncerteza:
+    def __init__(self, matriz_julgamento, matriz_decisao, lista_referencia_monotomica, passos = 1,
+                 limite_consistencia = 10, tamanho_bloco = 10000) -> None:
+        """
+        Args:
+            matriz_julgamento (numpy array): matriz de julgamento (n, n) dos critérios
+            matriz_decisao (numpy array): matriz de decisão (m, n)
+            lista_referencia_monotomica (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+            passos (int): quantidade máxima de passos da escala de Saaty que cada julgamento pode variar
+            limite_consistencia (float): maior razão de consistência (em percentual) aceita em uma amostra
+            tamanho_bloco (int): quantidade de amostras avaliadas de forma vetorizada por vez
+        """
+        logger.debug("Iniciando a classe de simulação de incerteza")
+        self.matriz_julgamento = np.asarray(matriz_julgamento, dtype=np.float64)
+        self.tamanho = self.matriz_julgamento.shape[0]
+        self.passos = passos
+        self.limite_consistencia = limite_consistencia
+        self.tamanho_bloco = tamanho_bloco
+
+        class_matriz_julgamento = MatrizJulgamento()
+        for verificacao in (class_matriz_julgamento.verifica_qualidade_matriz, class_matriz_julgamento.checa_reciprocidade):
+            message, status = verificacao(self.matriz_julgamento)
+            if status != 200:
+                raise ValueError(message)
+
+        self.matriz_normalizada = MatrizDecisao().normalizacao_decisao(matriz_decisao, lista_referencia_monotomica)
+        if self.matriz_normalizada.shape[1] != self.tamanho:
+            raise ValueError("A matriz de decisão deve ter uma coluna para cada critério da matriz de julgamento")
+
+        # Posição na escala de Saaty (0 a 16) do valor mais próximo de cada julgamento do triângulo superior
+        self.linhas, self.colunas = np.triu_indices(self.tamanho, k=1)
+        julgamentos = self.matriz_julgamento[self.linhas, self.colunas]
+        fora_da_escala = np.flatnonzero(~((julgamentos >= ESCALA_SAATY[0] * (1 - 1e-6)) &
+                                          (julgamentos <= ESCALA_SAATY[-1] * (1 + 1e-6))))
+        if len(fora_da_escala) > 0:
+            elementos = ", ".join(f"a{self.linhas[i]}{self.colunas[i]}" for i in fora_da_escala)
+            raise ValueError(f"Os julgamentos devem estar na escala de Saaty, entre 1/9 e 9 (falha em {elementos})")
+        distancias = np.abs(np.log(julgamentos)[:, np.newaxis] - np.log(ESCALA_SAATY)[np.newaxis, :])
+        self.posicoes = np.argmin(distancias, axis=1)
+
+    def acumuladores(self):
+        """
+        Função que cria os acumuladores vazios das estatísticas da simulação
+
+        Args:
+            None
+
+        Returns:
+            acumuladores (dict): contadores e somas usados no cálculo das estatísticas
+        """
+        alternativas = self.matriz_normalizada.shape[0]
+        return {
+            "aceitas": 0,
+            "rejeitadas": 0,
+            "contagem_posicoes": np.zeros((alternativas, alternativas), dtype=np.int64),
+            "soma_pontuacao": np.zeros(alternativas),
+            "soma_quadrados": np.zeros(alternativas),
+        }
+
+    def combina(self, acumulado, parcial):
+        """
+        Função que soma os acumuladores de uma parte da simulação ao total
+
+        Args:
+            acumulado (dict): acumuladores totais (alterados no lugar)
+            parcial (dict): acumuladores de uma parte da simulação
+
+        Returns:
+            acumulado (dict): acumuladores totais
+        """
+        for chave in acumulado:
+            acumulado[chave] += parcial[chave]
+        return acumulado
+
+    def sorteia_matrizes(self, gerador, quantidade):
+        """
+        Função que sorteia matrizes recíprocas perturbando cada julgamento em até 'passos' posições
+        da escala de Saaty. Perto dos extremos a variação é sorteada apenas entre as posições que
+        existem na escala, em vez de truncada, o que não acumula probabilidade em 1/9 e 9
+
+        Args:
+            gerador (numpy Generator): gerador de números aleatórios
+            quantidade (int): quantidade de matrizes sorteadas
+
+        Returns:
+            matrizes (numpy array): pilha (quantidade, n, n) de matrizes recíprocas
+        """
+        minimos = np.maximum(self.posicoes - self.passos, 0)
+        maximos = np.minimum(self.posicoes + self.passos, len(ESCALA_SAATY) - 1)
+        posicoes = gerador.integers(minimos, maximos + 1, size=(quantidade, len(self.posicoes)))
+        valores = ESCALA_SAATY[posicoes]
+        matrizes = np.ones((quantidade, self.tamanho, self.tamanho))
+        matrizes[:, self.linhas, self.colunas] = valores
+        matrizes[:, self.colunas, self.linhas] = 1.0 / valores
+        return matrizes
+
+    def simula_bloco(self, gerador, quantidade, acumulado):
+        """
+        Função que avalia um bloco de amostras de forma vetorizada: calcula os vetores prioridade e as
+        razões de consistência, descarta as amostras reprovadas e acumula as posições das alternativas
+
+        Args:
+            gerador (numpy Generator): gerador de números aleatórios
+            quantidade (int): quantidade de amostras do bloco
+            acumulado (dict): acumuladores (alterados no lugar)
+
+        Returns:
+            None
+        """
+        matrizes = self.sorteia_matrizes(gerador, quantidade)
+        class_matriz_julgamento = MatrizJulgamento()
+        vetores_prioridade = class_matriz_julgamento.normalizacao_julgamentos(matrizes)
+        consistencias = class_matriz_julgamento.analise_consistencia(matrizes, vetores_prioridade)
+        aprovadas = consistencias <= self.limite_consistencia
+
+        acumulado["aceitas"] += int(aprovadas.sum())
+        acumulado["rejeitadas"] += int(quantidade - aprovadas.sum())
+        if not aprovadas.any():
+            return
+
+        # Pontuações (m, amostras aprovadas) obtidas em um único produto matricial
+        pontuacoes = np.matmul(self.matriz_normalizada, vetores_prioridade[aprovadas, :, 0].T)
+        alternativas = pontuacoes.shape[0]
+        ordem = np.argsort(-pontuacoes, axis=0, kind="stable")
+        posicoes = np.broadcast_to(np.arange(alternativas)[:, np.newaxis], ordem.shape)
+        acumulado["contagem_posicoes"] += np.bincount(
+            (ordem * alternativas + posicoes).ravel(), minlength=alternativas * alternativas
+        ).reshape(alternativas, alternativas)
+        acumulado["soma_pontuacao"] += pontuacoes.sum(axis=1)
+        acumulado["soma_quadrados"] += np.square(pontuacoes).sum(axis=1)
+
+    def simula_tarefa(self, semente, quantidade):
+        """
+        Função que executa uma parte da simulação, dividida em blocos, e devolve seus acumuladores
+
+        Args:
+            semente (numpy SeedSequence): semente independente desta parte
+            quantidade (int): quantidade de amostras desta parte
+
+        Returns:
+            acumulado (dict): acumuladores da parte simulada
+        """
+        gerador = np.random.default_rng(semente)
+        acumulado = self.acumuladores()
+        restantes = quantidade
+        while restantes > 0:
+            bloco = min(self.tamanho_bloco, restantes)
+            self.simula_bloco(gerador, bloco, acumulado)
+            restantes -= bloco
+        return acumulado
+
+    def executa(self, amostras = 100000, processos = None, semente = 0):
+        """
+        Função que executa a simulação distribuindo as amostras entre os núcleos da máquina
+
+        Args:
+            amostras (int): quantidade total de amostras sorteadas
+            processos (int): quantidade de processos do pool. None usa todos os núcleos; 1 executa
+            no processo atual
+            semente (int): semente do gerador de números aleatórios
+
+        Returns:
+            estatisticas (dict): quantidade de amostras aceitas e rejeitadas, aceitabilidade de cada
+            posição (matriz alternativa x posição, em que a posição 0 é a melhor), probabilidade de cada
+            alternativa ficar em primeiro, posição média e média e desvio padrão das pontuações
+        """
+        logger.debug(f"Executando a simulação de incerteza com {amostras} amostras")
+        processos = processos or os.cpu_count() or 1
+        # Cada tarefa corresponde a um bloco com semente própria, de forma que o resultado não depende
+        # da quantidade de processos
+        quantidade_tarefas = max(1, -(-amostras // self.tamanho_bloco))
+        quantidades = [min(self.tamanho_bloco, amostras - indice * self.tamanho_bloco)
+                       for indice in range(quantidade_tarefas)]
+        sementes = np.random.SeedSequence(semente).spawn(quantidade_tarefas)
+        tarefas = list(zip(sementes, quantidades))
+
+        acumulado = self.acumuladores()
+        if processos == 1:
+            for semente_tarefa, quantidade in tarefas:
+                self.combina(acumulado, self.simula_tarefa(semente_tarefa, quantidade))
+        else:
+            with ProcessPoolExecutor(max_workers=processos, initializer=_inicializa_processo, initargs=(self,)) as executor:
+                for parcial in executor.map(_executa_tarefa, tarefas):
+                    self.combina(acumulado, parcial)
+        return self.estatisticas(acumulado)
+
+    def estatisticas(self, acumulado):
+        """
+        Função que converte os acumuladores nas estatísticas finais da simulação
+
+        Args:
+            acumulado (dict): acumuladores da simulação
+
+        Returns:
+            estatisticas (dict): estatísticas descritas em executa
+        """
+        aceitas = acumulado["aceitas"]
+        if aceitas == 0:
+            raise ValueError("Nenhuma amostra foi aprovada no teste de consistência")
+        aceitabilidade = acumulado["contagem_posicoes"] / aceitas
+        media = acumulado["soma_pontuacao"] / aceitas
+        variancia = np.maximum(acumulado["soma_quadrados"] / aceitas - np.square(media), 0.0)
+        return {
+            "aceitas": aceitas,
+            "rejeitadas": acumulado["rejeitadas"],
+            "aceitabilidade": aceitabilidade,
+            "probabilidade_primeiro": aceitabilidade[:, 0],
+            "posicao_media": np.matmul(aceitabilidade, np.arange(aceitabilidade.shape[1])),
+            "pontuacao_media": media,
+            "pontuacao_desvio": np.sqrt(variancia),
+        }
@@ -0,0 +1,182 @@
+import json
+import logging
+import os
+import tempfile
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Valores possíveis da escala fundamental de Saaty para um julgamento aij
+ESCALA_SAATY = np.array([1/9, 1/8, 1/7, 1/6, 1/5, 1/4, 1/3, 1/2, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+# Diretório padrão onde a tabela de índices simulados é persistida
+DIRETORIO_CACHE_PADRAO = os.path.join(os.path.expanduser("~"), ".cache", "ahp_method_interface")
+
+# Cópia em memória das tabelas já lidas, evitando acessar o disco a cada consulta
+_tabelas_em_memoria = {}
+
+# Classe que gera, via simulação de Monte Carlo, o índice aleatório (RI) para qualquer quantidade
+# de critérios, substituindo a tabela fixa de Saaty quando ela não cobre o tamanho desejado
+class IndiceAleatorio:
+    def __init__(self, amostras = 100000, semente = 0, diretorio_cache = DIRETORIO_CACHE_PADRAO, tamanho_bloco = 10000) -> None:
+        """
+        Args:
+            amostras (int): quantidade de matrizes aleatórias simuladas por tamanho
+            semente (int): semente do gerador de números aleatórios
+            diretorio_cache (str): diretório onde a tabela é salva. None desativa a persistência em disco
+            tamanho_bloco (int): quantidade de matrizes geradas de uma só vez, limitando a memória usada
+        """
+        logger.debug("Iniciando a classe do índice aleatório")
+        self.amostras = amostras
+        self.semente = semente
+        self.diretorio_cache = diretorio_cache
+        self.tamanho_bloco = tamanho_bloco
+
+    def caminho_cache(self):
+        """
+        Função que retorna o arquivo em que a tabela de índices é persistida
+
+        Args:
+            None
+
+        Returns:
+            caminho (str): caminho do arquivo json com os índices simulados
+        """
+        return os.path.join(self.diretorio_cache, "indice_aleatorio.json")
+
+    def chave(self, tamanho):
+        """
+        Função que monta a chave da tabela para uma simulação
+
+        Args:
+            tamanho (int): quantidade de critérios
+
+        Returns:
+            chave (str): identificador da combinação (tamanho, amostras, semente)
+        """
+        return f"{tamanho}_{self.amostras}_{self.semente}"
+
+    def gera_matrizes(self, tamanho, quantidade, gerador):
+        """
+        Função que sorteia uma pilha de matrizes recíprocas com julgamentos da escala de Saaty
+
+        Args:
+            tamanho (int): quantidade de critérios
+            quantidade (int): quantidade de matrizes sorteadas
+            gerador (numpy Generator): gerador de números aleatórios
+
+        Returns:
+            matrizes (numpy array): pilha (quantidade, tamanho, tamanho) de matrizes recíprocas
+        """
+        linhas, colunas = np.triu_indices(tamanho, k=1)
+        sorteios = gerador.integers(0, len(ESCALA_SAATY), size=(quantidade, len(linhas)))
+        matrizes = np.ones((quantidade, tamanho, tamanho))
+        matrizes[:, linhas, colunas] = ESCALA_SAATY[sorteios]
+        matrizes[:, colunas, linhas] = 1.0 / ESCALA_SAATY[sorteios]
+        return matrizes
+
+    def simula(self, tamanho):
+        """
+        Função que estima o índice aleatório como a média do índice de consistência de matrizes
+        recíprocas sorteadas ao acaso. O cálculo é feito em blocos vetorizados
+
+        Args:
+            tamanho (int): quantidade de critérios
+
+        Returns:
+            indice (float): índice aleatório estimado
+        """
+        logger.debug(f"Simulando o índice aleatório para {tamanho} critérios com {self.amostras} amostras")
+        if tamanho <= 2:
+            return 0.0
+
+        gerador = np.random.default_rng([self.semente, tamanho])
+        soma_lambda = 0.0
+        restantes = self.amostras
+        while restantes > 0:
+            quantidade = min(self.tamanho_bloco, restantes)
+            matrizes = self.gera_matrizes(tamanho, quantidade, gerador)
+            # Pelo teorema de Perron, o autovalor principal de uma matriz positiva é real e o de maior módulo
+            lambda_max = np.abs(np.linalg.eigvals(matrizes)).max(axis=1)
+            soma_lambda += lambda_max.sum()
+            restantes -= quantidade
+
+        lambda_medio = soma_lambda / self.amostras
+        return float((lambda_medio - tamanho) / (tamanho - 1))
+
+    def carrega_tabela(self):
+        """
+        Função que lê a tabela de índices simulados (da memória ou do disco)
+
+        Args:
+            None
+
+        Returns:
+            tabela (dict): dicionário chave -> índice aleatório
+        """
+        if self.diretorio_cache is None:
+            return _tabelas_em_memoria.setdefault(None, {})
+
+        caminho = self.caminho_cache()
+        if caminho not in _tabelas_em_memoria:
+            tabela = {}
+            if os.path.exists(caminho):
+                try:
+                    with open(caminho, "r", encoding="utf-8") as arquivo:
+                        tabela = json.load(arquivo)
+                except (OSError, ValueError):
+                    logger.warning(f"Não foi possível ler a tabela de índices aleatórios em {caminho}")
+            _tabelas_em_memoria[caminho] = tabela
+        return _tabelas_em_memoria[caminho]
+
+    def salva_tabela(self, tabela):
+        """
+        Função que grava a tabela no disco de forma atômica (arquivo temporário seguido de renomeação)
+
+        Args:
+            tabela (dict): dicionário chave -> índice aleatório
+
+        Returns:
+            None
+        """
+        if self.diretorio_cache is None:
+            return
+        try:
+            os.makedirs(self.diretorio_cache, exist_ok=True)
+            descritor, temporario = tempfile.mkstemp(dir=self.diretorio_cache, suffix=".tmp")
+            with os.fdopen(descritor, "w", encoding="utf-8") as arquivo:
+                json.dump(tabela, arquivo, indent=1, sort_keys=True)
+            os.replace(temporario, self.caminho_cache())
+        except OSError:
+            logger.warning(f"Não foi possível salvar a tabela de índices aleatórios em {self.diretorio_cache}")
+
+    def obtem(self, tamanho):
+        """
+        Função que retorna o índice aleatório para a quantidade de critérios informada, simulando-o
+        apenas quando ainda não estiver na tabela persistida
+
+        Args:
+            tamanho (int): quantidade de critérios
+
+        Returns:
+            indice (float): índice aleatório
+        """
+        tabela = self.carrega_tabela()
+        chave = self.chave(tamanho)
+        if chave not in tabela:
+            tabela[chave] = self.simula(tamanho)
+            self.salva_tabela(tabela)
+        return tabela[chave]
+
+    def tabela(self, tamanho_maximo):
+        """
+        Função que monta a lista de índices aleatórios de 1 até tamanho_maximo critérios, no mesmo
+        formato da tabela de Saaty
+
+        Args:
+            tamanho_maximo (int): maior quantidade de critérios desejada
+
+        Returns:
+            indices (list): lista em que a posição n - 1 contém o índice para n critérios
+        """
+        return [self.obtem(tamanho) for tamanho in range(1, tamanho_maximo + 1)]
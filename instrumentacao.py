@@ -0,0 +1,187 @@
+import csv
+import json
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger(__name__)
+
+# Etapas do algoritmo medidas pelas classes do AHP
+ETAPAS = ("validacao", "priorizacao", "consistencia", "normalizacao", "pontuacao")
+
+# Contexto vazio devolvido quando a instrumentação está desligada (reutilizável, sem estado)
+CONTEXTO_NULO = nullcontext()
+
+# Classe que cronometra um trecho e registra sua duração na instrumentação ao sair do bloco
+class Cronometro:
+    def __init__(self, instrumentacao, etapa, quantidade) -> None:
+        """
+        Args:
+            instrumentacao (Instrumentacao): instrumentação que recebe a medida
+            etapa (str): nome da etapa
+            quantidade (int): quantidade de modelos processados no trecho
+        """
+        self.instrumentacao = instrumentacao
+        self.etapa = etapa
+        self.quantidade = quantidade
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *excecao):
+        self.instrumentacao.registra(self.etapa, time.perf_counter() - self.inicio, self.quantidade)
+        return False
+
+# Classe que acumula, por etapa, o tempo gasto e a quantidade de chamadas e de modelos processados.
+# Desligada por padrão: nesse estado, cada etapa custa apenas a consulta de um atributo e um contexto
+# vazio. Funções registradas como ganchos recebem cada medida (etapa, duração, quantidade), o que
+# permite enviá-las a sistemas de monitoramento. Não é segura para uso simultâneo por várias threads
+class Instrumentacao:
+    def __init__(self) -> None:
+        self.ativa = False
+        self.ganchos = []
+        self.zera()
+
+    def zera(self):
+        """
+        Função que descarta as medidas acumuladas
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.medidas = {}
+
+    def liga(self):
+        self.ativa = True
+
+    def desliga(self):
+        self.ativa = False
+
+    def adiciona_gancho(self, gancho):
+        """
+        Função que registra uma função chamada a cada medida. Registrar um gancho não liga a instrumentação
+
+        Args:
+            gancho (callable): função que recebe (etapa, duracao, quantidade)
+
+        Returns:
+            None
+        """
+        self.ganchos.append(gancho)
+
+    def remove_gancho(self, gancho):
+        self.ganchos.remove(gancho)
+
+    def etapa(self, nome, quantidade = 1):
+        """
+        Função que devolve o contexto que mede um trecho do algoritmo
+
+        Args:
+            nome (str): nome da etapa (ver ETAPAS)
+            quantidade (int): quantidade de modelos processados no trecho
+
+        Returns:
+            contexto: cronômetro da etapa ou, com a instrumentação desligada, um contexto vazio
+        """
+        if not self.ativa:
+            return CONTEXTO_NULO
+        return Cronometro(self, nome, quantidade)
+
+    def registra(self, etapa, duracao, quantidade = 1):
+        """
+        Função que acumula uma medida e a repassa aos ganchos
+
+        Args:
+            etapa (str): nome da etapa
+            duracao (float): duração em segundos
+            quantidade (int): quantidade de modelos processados
+
+        Returns:
+            None
+        """
+        medida = self.medidas.get(etapa)
+        if medida is None:
+            medida = self.medidas[etapa] = {"chamadas": 0, "quantidade": 0, "tempo_total": 0.0, "tempo_maximo": 0.0}
+        medida["chamadas"] += 1
+        medida["quantidade"] += quantidade
+        medida["tempo_total"] += duracao
+        medida["tempo_maximo"] = max(medida["tempo_maximo"], duracao)
+        for gancho in self.ganchos:
+            gancho(etapa, duracao, quantidade)
+
+    def exporta(self):
+        """
+        Função que resume as medidas acumuladas
+
+        Args:
+            None
+
+        Returns:
+            resumo (dict): por etapa, quantidade de chamadas e de modelos, tempo total, médio por chamada
+            e máximo (em segundos) e fração do tempo total medido
+        """
+        tempo_geral = sum(medida["tempo_total"] for medida in self.medidas.values())
+        resumo = {}
+        for etapa, medida in self.medidas.items():
+            resumo[etapa] = dict(medida, tempo_medio=medida["tempo_total"] / medida["chamadas"],
+                                 fracao=medida["tempo_total"] / tempo_geral if tempo_geral > 0 else 0.0)
+        return resumo
+
+    def salva(self, destino):
+        """
+        Função que grava o resumo das medidas em JSON ou CSV, conforme a extensão do destino
+
+        Args:
+            destino (str): caminho do arquivo de saída (.json ou .csv)
+
+        Returns:
+            None
+        """
+        resumo = self.exporta()
+        logger.debug(f"Gravando as medidas de {len(resumo)} etapas em {destino}")
+        if destino.endswith(".json"):
+            with open(destino, "w", encoding="utf-8") as arquivo:
+                json.dump(resumo, arquivo, ensure_ascii=False, indent=1)
+            return
+        campos = ["etapa", "chamadas", "quantidade", "tempo_total", "tempo_medio", "tempo_maximo", "fracao"]
+        with open(destino, "w", encoding="utf-8", newline="") as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=campos)
+            escritor.writeheader()
+            for etapa, medida in resumo.items():
+                escritor.writerow({"etapa": etapa, **medida})
+
+# Instância compartilhada pelas classes do AHP
+instrumentacao = Instrumentacao()
+
+@contextmanager
+def perfil(ganchos = (), zera = True):
+    """
+    Gerenciador de contexto que liga a instrumentação apenas dentro do bloco
+
+        with perfil() as medidas:
+            AHP(...).executa_algoritmo()
+        medidas.exporta()
+
+    Args:
+        ganchos (iterable): funções chamadas a cada medida enquanto o bloco executa
+        zera (bool): descarta as medidas anteriores ao entrar no bloco
+
+    Returns:
+        instrumentacao (Instrumentacao): instância compartilhada, com as medidas do bloco
+    """
+    estado_anterior = instrumentacao.ativa
+    if zera:
+        instrumentacao.zera()
+    for gancho in ganchos:
+        instrumentacao.adiciona_gancho(gancho)
+    instrumentacao.liga()
+    try:
+        yield instrumentacao
+    finally:
+        instrumentacao.ativa = estado_anterior
+        for gancho in ganchos:
+            instrumentacao.remove_gancho(gancho)
@@ -0,0 +1,135 @@
+import logging
+import os
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+# Classe que pontua matrizes de decisão maiores que a memória em duas passagens por blocos: a primeira
+# acumula a soma de cada coluna (com os critérios de custo invertidos) e a segunda aplica a
+# normalização e o produto pelo vetor prioridade bloco a bloco
+class PontuacaoEmBlocos:
+    def __init__(self, vetor_prioridade, lista_referencia_monotomica, tamanho_bloco = 1000000, colunas = None,
+                 cabecalho = True) -> None:
+        """
+        Args:
+            vetor_prioridade (numpy array): vetor prioridade (n, 1) dos critérios
+            lista_referencia_monotomica (list): lista contendo '-1' (custo) ou '1' (lucro) por critério
+            tamanho_bloco (int): quantidade de alternativas (linhas) lidas por bloco
+            colunas (list): colunas do arquivo .csv/.parquet usadas como critérios (None usa todas)
+            cabecalho (bool): indica se os arquivos .csv possuem uma linha de cabeçalho
+        """
+        logger.debug("Iniciando a classe de pontuação em blocos")
+        self.vetor_prioridade = np.asarray(vetor_prioridade, dtype=np.float64).reshape(-1)
+        self.custo = np.asarray(lista_referencia_monotomica) == -1
+        if len(self.custo) != len(self.vetor_prioridade):
+            raise ValueError("A lista de referência deve ter um valor para cada critério do vetor prioridade")
+        self.tamanho_bloco = tamanho_bloco
+        self.colunas = colunas
+        self.cabecalho = cabecalho
+
+    def blocos(self, fonte):
+        """
+        Função que lê a matriz de decisão em blocos de linhas
+
+        Args:
+            fonte (numpy array, str, os.PathLike): matriz (m, n) em memória ou mapeada, ou caminho de um arquivo
+            .npy (mapeado em memória), .csv (lido em partes) ou .parquet (lido por lotes, requer pyarrow)
+
+        Returns:
+            blocos (generator): blocos (b, n) da matriz de decisão em float64
+        """
+        if not isinstance(fonte, (str, os.PathLike)):
+            for inicio in range(0, fonte.shape[0], self.tamanho_bloco):
+                yield np.asarray(fonte[inicio:inicio + self.tamanho_bloco], dtype=np.float64)
+            return
+        fonte = os.fspath(fonte)
+        if fonte.endswith(".npy"):
+            yield from self.blocos(np.load(fonte, mmap_mode="r"))
+        elif fonte.endswith(".parquet"):
+            if pq is None:
+                raise ImportError("A leitura de arquivos .parquet requer o pacote pyarrow")
+            arquivo = pq.ParquetFile(fonte)
+            for lote in arquivo.iter_batches(batch_size=self.tamanho_bloco, columns=self.colunas):
+                yield lote.to_pandas().to_numpy(dtype=np.float64)
+        else:
+            leitor = pd.read_csv(fonte, header=0 if self.cabecalho else None, usecols=self.colunas,
+                                 chunksize=self.tamanho_bloco)
+            for parte in leitor:
+                yield parte.to_numpy(dtype=np.float64)
+
+    def ajusta_bloco(self, bloco):
+        """
+        Função que inverte os critérios de custo de um bloco (sem alterar o bloco recebido)
+
+        Args:
+            bloco (numpy array): bloco (b, n) da matriz de decisão
+
+        Returns:
+            bloco_ajustado (numpy array): bloco com os critérios de custo substituídos por 1 / valor
+        """
+        if bloco.shape[1] != len(self.custo):
+            raise ValueError("A matriz de decisão deve ter uma coluna para cada critério do vetor prioridade")
+        if not self.custo.any():
+            return bloco
+        ajustado = np.array(bloco, dtype=np.float64)
+        np.divide(1.0, bloco, out=ajustado, where=self.custo)
+        return ajustado
+
+    def soma_colunas(self, fonte):
+        """
+        Primeira passagem: acumula a soma de cada coluna (com os critérios de custo invertidos) e a
+        quantidade de alternativas
+
+        Args:
+            fonte (numpy array, str): matriz de decisão ou caminho do arquivo (ver blocos)
+
+        Returns:
+            soma (numpy array): vetor (n,) com a soma de cada coluna
+            linhas (int): quantidade de alternativas
+        """
+        logger.debug("Acumulando as somas das colunas da matriz de decisão")
+        soma = np.zeros(len(self.custo))
+        linhas = 0
+        for bloco in self.blocos(fonte):
+            soma += self.ajusta_bloco(bloco).sum(axis=0)
+            linhas += bloco.shape[0]
+        return soma, linhas
+
+    def pontua(self, fonte, destino = None):
+        """
+        Função que calcula a relevância de cada alternativa com memória limitada ao tamanho do bloco.
+        Como (X / soma) . w = X . (w / soma), a normalização é incorporada aos pesos e cada bloco
+        passa por um único produto matricial
+
+        Args:
+            fonte (numpy array, str): matriz de decisão ou caminho do arquivo (ver blocos)
+            destino (str): caminho de um arquivo .npy onde o resultado é gravado (mapeado em memória).
+            Quando None, o resultado é devolvido em memória
+
+        Returns:
+            resultado (numpy array): vetor (m, 1) com a relevância de cada alternativa
+        """
+        soma, linhas = self.soma_colunas(fonte)
+        pesos_normalizados = self.vetor_prioridade / soma
+
+        logger.debug("Pontuando as alternativas da matriz de decisão em blocos")
+        if destino is None:
+            resultado = np.empty((linhas, 1))
+        else:
+            resultado = np.lib.format.open_memmap(destino, mode="w+", dtype=np.float64, shape=(linhas, 1))
+
+        inicio = 0
+        for bloco in self.blocos(fonte):
+            fim = inicio + bloco.shape[0]
+            np.matmul(self.ajusta_bloco(bloco), pesos_normalizados, out=resultado[inicio:fim, 0])
+            inicio = fim
+
+        if destino is not None:
+            resultado.flush()
+        return resultado
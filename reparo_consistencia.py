@@ -0,0 +1,133 @@
+import logging
+import numpy as np
+from ahp import MatrizJulgamento
+from indice_aleatorio import ESCALA_SAATY
+
+logger = logging.getLogger(__name__)
+
+# Classe que sugere alterações nos julgamentos de uma matriz reprovada no teste de consistência. A
+# contribuição de cada julgamento para a inconsistência é medida pela matriz de erros
+# eij = aij * wj / wi (igual a 1 em uma matriz perfeitamente consistente). As correções candidatas,
+# restritas aos valores da escala de Saaty, são avaliadas em lote a cada passo
+class ReparoConsistencia:
+    def __init__(self, limite = 10, candidatos = 10, max_alteracoes = None) -> None:
+        """
+        Args:
+            limite (float): razão de consistência (em percentual) que se deseja atingir
+            candidatos (int): quantidade de julgamentos mais inconsistentes avaliados a cada passo
+            max_alteracoes (int): quantidade máxima de julgamentos alterados (None = n * (n - 1) / 2)
+        """
+        logger.debug("Iniciando a classe de reparo de consistência")
+        self.limite = limite
+        self.candidatos = candidatos
+        self.max_alteracoes = max_alteracoes
+        self.class_matriz_julgamento = MatrizJulgamento()
+
+    def consistencias(self, matrizes):
+        """
+        Função que calcula a razão de consistência de uma pilha de matrizes
+
+        Args:
+            matrizes (numpy array): pilha (k, n, n) de matrizes de julgamento
+
+        Returns:
+            consistencias (numpy array): vetor (k,) com as razões de consistência (em percentual)
+        """
+        mj = self.class_matriz_julgamento
+        return mj.analise_consistencia(matrizes, mj.normalizacao_julgamentos(matrizes))
+
+    def contribuicoes(self, matriz):
+        """
+        Função que mede, de uma só vez, a contribuição de cada julgamento para a inconsistência
+
+        Args:
+            matriz (numpy array): matriz de julgamento (n, n)
+
+        Returns:
+            erros (numpy array): matriz de erros eij = aij * wj / wi
+            pares (numpy array): matriz (p, 2) com os pares (i, j), i < j, do mais ao menos inconsistente
+            pontuacoes (numpy array): vetor (p,) com |log eij| de cada par, na mesma ordem
+        """
+        matriz = np.asarray(matriz, dtype=np.float64)
+        vetor_prioridade = self.class_matriz_julgamento.normalizacao_julgamentos(matriz)[:, 0]
+        erros = matriz * vetor_prioridade[np.newaxis, :] / vetor_prioridade[:, np.newaxis]
+        linhas, colunas = np.triu_indices(matriz.shape[0], k=1)
+        pontuacoes = np.abs(np.log(erros[linhas, colunas]))
+        ordem = np.argsort(-pontuacoes, kind="stable")
+        return erros, np.stack([linhas[ordem], colunas[ordem]], axis=1), pontuacoes[ordem]
+
+    def posicao_escala(self, valores):
+        """
+        Função que retorna a posição (0 a 16) do valor da escala de Saaty mais próximo de cada julgamento
+
+        Args:
+            valores (numpy array): julgamentos
+
+        Returns:
+            posicoes (numpy array): posições na escala
+        """
+        distancias = np.abs(np.log(np.asarray(valores, dtype=np.float64))[..., np.newaxis] - np.log(ESCALA_SAATY))
+        return np.argmin(distancias, axis=-1)
+
+    def sugere(self, matriz):
+        """
+        Função que sugere, de forma gulosa, o menor conjunto de alterações na escala de Saaty que leva a
+        razão de consistência abaixo do limite. A cada passo, todas as trocas de valor dos julgamentos
+        mais inconsistentes são avaliadas em lote; entre as que já atingem o limite, escolhe-se a de
+        menor deslocamento na escala, e, se nenhuma atingir, a que mais reduz a razão de consistência
+
+        Args:
+            matriz (numpy array): matriz de julgamento (n, n)
+
+        Returns:
+            sugestoes (list): lista de dicionários com o par (i, j), o valor atual, o valor sugerido e a
+            razão de consistência após a alteração, na ordem em que devem ser aplicadas
+            matriz_corrigida (numpy array): matriz com as sugestões aplicadas
+            consistencia (float): razão de consistência final (em percentual)
+        """
+        logger.debug("Buscando alterações que tornem a matriz de julgamento consistente")
+        matriz_corrigida = np.array(matriz, dtype=np.float64)
+        tamanho = matriz_corrigida.shape[0]
+        consistencia = float(self.consistencias(matriz_corrigida[np.newaxis])[0])
+        max_alteracoes = self.max_alteracoes or tamanho * (tamanho - 1) // 2
+        escala = len(ESCALA_SAATY)
+        sugestoes = []
+        alterados = set()
+
+        while consistencia > self.limite and len(sugestoes) < max_alteracoes:
+            _, pares, _ = self.contribuicoes(matriz_corrigida)
+            pares = np.array([par for par in pares if tuple(par) not in alterados][:self.candidatos], dtype=np.intp)
+            if len(pares) == 0:
+                break
+
+            # Lote com uma matriz para cada combinação (par candidato, valor da escala)
+            linhas = np.repeat(pares[:, 0], escala)
+            colunas = np.repeat(pares[:, 1], escala)
+            valores = np.tile(ESCALA_SAATY, len(pares))
+            lote = np.broadcast_to(matriz_corrigida, (len(valores), tamanho, tamanho)).copy()
+            indices = np.arange(len(valores))
+            lote[indices, linhas, colunas] = valores
+            lote[indices, colunas, linhas] = 1.0 / valores
+            resultados = self.consistencias(lote)
+
+            deslocamentos = np.abs(np.tile(np.arange(escala), len(pares)) -
+                                   np.repeat(self.posicao_escala(matriz_corrigida[pares[:, 0], pares[:, 1]]), escala))
+            resultados = np.where(deslocamentos == 0, np.inf, resultados)
+            aprovados = resultados <= self.limite
+            if aprovados.any():
+                # Menor deslocamento na escala e, em caso de empate, menor razão de consistência
+                escolha = np.lexsort((resultados, np.where(aprovados, deslocamentos, escala)))[0]
+            else:
+                escolha = int(np.argmin(resultados))
+            if not resultados[escolha] < consistencia:
+                break
+
+            i, j = int(linhas[escolha]), int(colunas[escolha])
+            sugestoes.append({"i": i, "j": j, "valor_atual": float(matriz_corrigida[i, j]),
+                              "valor_sugerido": float(valores[escolha]), "consistencia": float(resultados[escolha])})
+            matriz_corrigida[i, j] = valores[escolha]
+            matriz_corrigida[j, i] = 1.0 / valores[escolha]
+            consistencia = float(resultados[escolha])
+            alterados.add((i, j))
+
+        return sugestoes, matriz_corrigida, consistencia
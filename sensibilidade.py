@@ -0,0 +1,144 @@
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Classe que analisa a estabilidade da ordenação obtida pelo AHP a partir do vetor prioridade e da
+# matriz de decisão normalizada, sem reexecutar o algoritmo. Ao alterar o peso de um critério, os
+# demais pesos são reescalados proporcionalmente para que a soma continue igual a 1
+class AnaliseSensibilidade:
+    def __init__(self, vetor_prioridade, matriz_normalizada) -> None:
+        """
+        Args:
+            vetor_prioridade (numpy array): vetor prioridade (n, 1) dos critérios
+            matriz_normalizada (numpy array): matriz de decisão normalizada (m, n)
+        """
+        logger.debug("Iniciando a classe de análise de sensibilidade")
+        self.pesos = np.asarray(vetor_prioridade, dtype=np.float64).reshape(-1)
+        self.matriz = np.asarray(matriz_normalizada, dtype=np.float64)
+        if self.matriz.ndim != 2 or self.matriz.shape[1] != len(self.pesos):
+            raise ValueError("A matriz normalizada deve possuir uma coluna para cada elemento do vetor prioridade")
+        self.resultado = np.matmul(self.matriz, self.pesos)
+
+    def pares_adjacentes(self):
+        """
+        Função que retorna os pares de alternativas vizinhas na ordenação atual. Ao variar
+        continuamente o peso de um critério, a primeira inversão sempre ocorre entre vizinhas
+
+        Args:
+            None
+
+        Returns:
+            pares (numpy array): matriz (m - 1, 2) com os índices (melhor, pior) de cada par vizinho
+        """
+        ordem = np.argsort(-self.resultado, kind="stable")
+        return np.stack([ordem[:-1], ordem[1:]], axis=1)
+
+    def limiares_pares(self, pares = None):
+        """
+        Função que calcula, para todos os critérios de uma vez, a variação de peso que inverte a
+        ordem de cada par de alternativas. Somando delta ao peso do critério c e renormalizando, a
+        diferença de pontuação entre i e j se anula em delta = (Sj - Si) / (aic - ajc)
+
+        Args:
+            pares (numpy array): matriz (p, 2) com os índices (i, j) dos pares avaliados. Quando None,
+            são usados os pares vizinhos na ordenação atual
+
+        Returns:
+            variacoes (numpy array): matriz (n, p) com a variação delta aplicada ao peso de cada critério
+            antes da renormalização (NaN quando a inversão é impossível)
+            pesos_criticos (numpy array): matriz (n, p) com o novo peso do critério, após a renormalização,
+            no qual o par se inverte (NaN quando a inversão é impossível)
+        """
+        if pares is None:
+            pares = self.pares_adjacentes()
+        pares = np.asarray(pares, dtype=np.intp).reshape(-1, 2)
+        i, j = pares[:, 0], pares[:, 1]
+
+        diferenca_pontuacao = self.resultado[j] - self.resultado[i]
+        diferenca_criterio = self.matriz[i, :] - self.matriz[j, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variacoes = (diferenca_pontuacao[:, np.newaxis] / diferenca_criterio).T
+        # O peso do critério não pode ficar negativo: delta >= -w
+        possiveis = np.isfinite(variacoes) & (variacoes >= -self.pesos[:, np.newaxis])
+        variacoes = np.where(possiveis, variacoes, np.nan)
+        pesos_criticos = (self.pesos[:, np.newaxis] + variacoes) / (1 + variacoes)
+        return variacoes, pesos_criticos
+
+    def menor_alteracao(self):
+        """
+        Função que indica, para cada critério, o menor aumento e a menor redução de peso que alteram
+        a ordenação das alternativas, bem como o par que se inverte
+
+        Args:
+            None
+
+        Returns:
+            aumento (numpy array): vetor (n,) com o menor delta positivo (inf quando não existe)
+            par_aumento (numpy array): matriz (n, 2) com o par invertido pelo aumento (-1 quando não existe)
+            reducao (numpy array): vetor (n,) com o delta negativo de menor módulo (-inf quando não existe)
+            par_reducao (numpy array): matriz (n, 2) com o par invertido pela redução (-1 quando não existe)
+        """
+        pares = self.pares_adjacentes()
+        variacoes, _ = self.limiares_pares(pares)
+        criterios = np.arange(len(self.pesos))
+
+        positivas = np.where(variacoes > 0, variacoes, np.inf)
+        indice_aumento = np.argmin(positivas, axis=1)
+        aumento = positivas[criterios, indice_aumento]
+
+        negativas = np.where(variacoes < 0, variacoes, -np.inf)
+        indice_reducao = np.argmax(negativas, axis=1)
+        reducao = negativas[criterios, indice_reducao]
+
+        par_aumento = np.where(np.isfinite(aumento)[:, np.newaxis], pares[indice_aumento], -1)
+        par_reducao = np.where(np.isfinite(reducao)[:, np.newaxis], pares[indice_reducao], -1)
+        return aumento, par_aumento, reducao, par_reducao
+
+    def curvas_variacao(self, pontos = 101):
+        """
+        Função que calcula as curvas de variação "um critério por vez": o peso de cada critério
+        percorre o intervalo [0, 1] e os demais são reescalados proporcionalmente. Todas as curvas
+        são obtidas em um único produto matricial
+
+        Args:
+            pontos (int): quantidade de valores de peso avaliados por critério
+
+        Returns:
+            grade (numpy array): vetor (pontos,) com os pesos avaliados
+            curvas (numpy array): matriz (n, pontos, m) com a pontuação de cada alternativa
+        """
+        tamanho = len(self.pesos)
+        grade = np.linspace(0.0, 1.0, pontos)
+        # Fator que reescala os demais pesos: (1 - t) / (1 - wc)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fator = (1.0 - grade)[np.newaxis, :] / (1.0 - self.pesos)[:, np.newaxis]
+        fator = np.nan_to_num(fator, nan=0.0, posinf=0.0)
+        pesos = fator[:, :, np.newaxis] * self.pesos[np.newaxis, np.newaxis, :]
+        criterios = np.arange(tamanho)
+        pesos[criterios, :, criterios] = grade
+        curvas = np.matmul(pesos.reshape(-1, tamanho), self.matriz.T)
+        return grade, curvas.reshape(tamanho, pontos, -1)
+
+    def relatorio(self, pontos = 101):
+        """
+        Função que reúne a análise de sensibilidade completa
+
+        Args:
+            pontos (int): quantidade de valores de peso avaliados por critério nas curvas
+
+        Returns:
+            relatorio (dict): resultados atuais, menores alterações que mudam a ordenação e curvas de variação
+        """
+        logger.debug("Gerando o relatório de sensibilidade")
+        aumento, par_aumento, reducao, par_reducao = self.menor_alteracao()
+        grade, curvas = self.curvas_variacao(pontos)
+        return {
+            "resultado": self.resultado,
+            "aumento": aumento,
+            "par_aumento": par_aumento,
+            "reducao": reducao,
+            "par_reducao": par_reducao,
+            "grade": grade,
+            "curvas": curvas,
+        }
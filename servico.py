@@ -0,0 +1,512 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import ahp
+
+logger = logging.getLogger(__name__)
+
+# Frases de status usadas nas respostas HTTP
+RAZOES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error",
+          503: "Service Unavailable"}
+
+# Quantidade de latências recentes guardadas para o cálculo dos percentis
+LATENCIAS_GUARDADAS = 10000
+
+# Grupos com trabalho estimado (k . n . (m + n) elementos) abaixo deste valor são avaliados no próprio
+# processo, pois o envio ao pool custaria mais que o cálculo
+TRABALHO_MINIMO_PROCESSO = 1 << 16
+
+def avalia_grupo(matrizes_julgamento, matrizes_decisao, referencias, metodo):
+    """
+    Função executada nos processos do pool (ou no próprio processo, para grupos pequenos): avalia de
+    uma só vez um grupo de modelos com as mesmas dimensões
+
+    Args:
+        matrizes_julgamento (numpy array): pilha (k, n, n) de matrizes de julgamento
+        matrizes_decisao (numpy array): pilha (k, m, n) de matrizes de decisão
+        referencias (numpy array): matriz (k, n) com a lista de referência de cada modelo
+        metodo (str): um dos métodos de ahp.PRIORIZACOES ('aproximado', 'autovetor', 'geometrica', 'llsm' ou 'incompleto')
+
+    Returns:
+        respostas (list): dicionários com status, mensagem, razão de consistência, vetor prioridade e
+        resultados de cada modelo
+    """
+    lote = ahp.AHPLote(matrizes_julgamento, matrizes_decisao, referencias, metodo=metodo)
+    vetores_prioridade, consistencias, resultados, status = lote.executa_algoritmo()
+    respostas = []
+    for indice, (message, codigo) in enumerate(status):
+        consistencia = float(consistencias[indice])
+        respostas.append({
+            "status": codigo,
+            "mensagem": message,
+            "consistencia": None if np.isnan(consistencia) else consistencia,
+            "vetor_prioridade": None if np.isnan(consistencia) else vetores_prioridade[indice, :, 0].tolist(),
+            "resultados": resultados[indice, :, 0].tolist() if codigo == 200 else None,
+        })
+    return respostas
+
+def resposta_falha(status, mensagem):
+    """
+    Função que monta a resposta de um modelo que não pôde ser avaliado
+
+    Args:
+        status (int): código indicando o status do processo
+        mensagem (str): motivo da falha
+
+    Returns:
+        resposta (dict): ver avalia_grupo
+    """
+    return {"status": status, "mensagem": mensagem, "consistencia": None, "vetor_prioridade": None, "resultados": None}
+
+# Classe que recebe modelos de forma concorrente e os avalia em micro-lotes: as requisições que chegam
+# dentro de uma janela curta são agrupadas por dimensão e avaliadas de forma vetorizada (AHPLote).
+# Grupos com muito trabalho são enviados a um pool de processos, mantendo o laço de eventos livre
+class ServicoPontuacao:
+    def __init__(self, janela = 0.002, tamanho_maximo_lote = 512, processos = None,
+                 trabalho_minimo_processo = TRABALHO_MINIMO_PROCESSO,
+                 metodo = "aproximado") -> None:
+        """
+        Args:
+            janela (float): tempo (em segundos) que o primeiro modelo de um lote aguarda a chegada de outros
+            tamanho_maximo_lote (int): quantidade máxima de modelos por lote
+            processos (int): quantidade de processos do pool. None usa todos os núcleos; 0 avalia tudo no
+            próprio processo
+            trabalho_minimo_processo (int): grupos com trabalho estimado (k . n . (m + n) elementos) menor
+            que este são avaliados no próprio processo, pois o envio ao pool custaria mais que o cálculo
+            metodo (str): método padrão de priorização (um dos métodos de ahp.PRIORIZACOES), que pode ser
+            substituído em cada requisição
+        """
+        if metodo not in ahp.PRIORIZACOES:
+            raise ValueError(f"O método deve ser um entre {', '.join(repr(nome) for nome in ahp.PRIORIZACOES)}")
+        self.janela = janela
+        self.tamanho_maximo_lote = tamanho_maximo_lote
+        self.processos = (os.cpu_count() or 1) if processos is None else processos
+        self.trabalho_minimo_processo = trabalho_minimo_processo
+        self.metodo = metodo
+        self.fila = None
+        self.executor = None
+        self.consumidor = None
+        self.tarefas = set()
+        self.latencias = deque(maxlen=LATENCIAS_GUARDADAS)
+        self.requisicoes = 0
+        self.erros = 0
+        self.lotes = 0
+        self.modelos_em_lotes = 0
+        self.inicio = None
+
+    async def inicia(self):
+        """
+        Função que cria a fila, o pool de processos e a tarefa que forma os lotes. Deve ser chamada
+        dentro do laço de eventos
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        logger.info(f"Iniciando o serviço de pontuação com {self.processos} processos")
+        self.fila = asyncio.Queue()
+        if self.processos > 0:
+            self.executor = ProcessPoolExecutor(max_workers=self.processos)
+        self.inicio = time.perf_counter()
+        self.consumidor = asyncio.create_task(self.forma_lotes())
+
+    async def encerra(self):
+        """
+        Função que interrompe a formação de lotes, aguarda os lotes em avaliação e responde com 503
+        os modelos que ainda estavam na fila
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        self.consumidor.cancel()
+        await asyncio.gather(self.consumidor, *self.tarefas, return_exceptions=True)
+        pendentes = []
+        while not self.fila.empty():
+            pendentes.append(self.fila.get_nowait())
+        self.falha(pendentes, 503, "O serviço foi encerrado antes da avaliação do modelo")
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    async def __aenter__(self):
+        await self.inicia()
+        return self
+
+    async def __aexit__(self, *excecao):
+        await self.encerra()
+        return False
+
+    def prepara(self, modelo):
+        """
+        Função que converte e confere as dimensões de um modelo recebido
+
+        Args:
+            modelo (dict): matriz_julgamento (n x n), matriz_decisao (m x n), lista_referencia_monotomica
+            (n valores '-1' ou '1', opcional) e metodo (opcional)
+
+        Returns:
+            entrada (tuple): matriz de julgamento, matriz de decisão, lista de referência e método
+        """
+        matriz_julgamento = np.asarray(modelo["matriz_julgamento"], dtype=np.float64)
+        matriz_decisao = np.asarray(modelo["matriz_decisao"], dtype=np.float64)
+        if matriz_julgamento.ndim != 2 or matriz_julgamento.shape[0] != matriz_julgamento.shape[1]:
+            raise ValueError("A matriz de julgamento deve ser quadrada")
+        if matriz_decisao.ndim != 2 or matriz_decisao.shape[1] != matriz_julgamento.shape[0]:
+            raise ValueError("A matriz de decisão deve ter uma coluna para cada critério da matriz de julgamento")
+        referencia = np.asarray(modelo.get("lista_referencia_monotomica", [1] * matriz_julgamento.shape[0]))
+        if referencia.shape != (matriz_julgamento.shape[0],):
+            raise ValueError("A lista de referência deve ter um valor para cada critério")
+        metodo = modelo.get("metodo", self.metodo)
+        if metodo not in ahp.PRIORIZACOES:
+            raise ValueError(f"O método deve ser um entre {', '.join(repr(nome) for nome in ahp.PRIORIZACOES)}")
+        return matriz_julgamento, matriz_decisao, referencia, metodo
+
+    async def pontua(self, modelo):
+        """
+        Função que avalia um modelo, aguardando o lote do qual ele fizer parte
+
+        Args:
+            modelo (dict): ver prepara
+
+        Returns:
+            resposta (dict): ver avalia_grupo
+        """
+        inicio = time.perf_counter()
+        self.requisicoes += 1
+        try:
+            entrada = self.prepara(modelo)
+        except (ValueError, KeyError, TypeError) as erro:
+            self.erros += 1
+            return resposta_falha(400, f"{type(erro).__name__}: {erro}")
+
+        if self.consumidor is None or self.consumidor.done():
+            self.erros += 1
+            return resposta_falha(503, "O serviço não está em execução")
+        futuro = asyncio.get_running_loop().create_future()
+        self.fila.put_nowait((entrada, futuro))
+        resposta = await futuro
+        if resposta["status"] != 200:
+            self.erros += 1
+        self.latencias.append(time.perf_counter() - inicio)
+        return resposta
+
+    async def forma_lotes(self):
+        """
+        Tarefa que retira os modelos da fila: a partir do primeiro modelo, aguarda a janela e agrupa
+        os que chegaram, por dimensões e método, até o tamanho máximo do lote
+
+        Args:
+            None
+
+        Returns:
+            None
+        """
+        while True:
+            itens = [await self.fila.get()]
+            try:
+                if self.janela > 0:
+                    await asyncio.sleep(self.janela)
+            except asyncio.CancelledError:
+                # Os modelos já retirados da fila não seriam respondidos
+                self.falha(itens, 503, "O serviço foi encerrado antes da avaliação do modelo")
+                raise
+            while len(itens) < self.tamanho_maximo_lote and not self.fila.empty():
+                itens.append(self.fila.get_nowait())
+
+            grupos = {}
+            for entrada, futuro in itens:
+                matriz_julgamento, matriz_decisao, _, metodo = entrada
+                grupos.setdefault((matriz_julgamento.shape[0], matriz_decisao.shape[0], metodo), []).append((entrada, futuro))
+            self.lotes += 1
+            self.modelos_em_lotes += len(itens)
+            for grupo in grupos.values():
+                tarefa = asyncio.create_task(self.avalia(grupo))
+                self.tarefas.add(tarefa)
+                tarefa.add_done_callback(self.tarefas.discard)
+
+    def falha(self, itens, status, mensagem):
+        """
+        Função que entrega uma resposta de falha aos futuros ainda não resolvidos
+
+        Args:
+            itens (list): tuplas (entrada, futuro)
+            status (int): código indicando o status do processo
+            mensagem (str): motivo da falha
+
+        Returns:
+            None
+        """
+        for _, futuro in itens:
+            if not futuro.done():
+                futuro.set_result(resposta_falha(status, mensagem))
+
+    def trabalho(self, grupo):
+        """
+        Função que estima o trabalho de um grupo pela quantidade de elementos processados: k . n . (m + n)
+
+        Args:
+            grupo (list): tuplas (entrada, futuro) de modelos com as mesmas dimensões
+
+        Returns:
+            trabalho (int): quantidade estimada de elementos
+        """
+        matriz_julgamento, matriz_decisao, _, _ = grupo[0][0]
+        criterios = matriz_julgamento.shape[0]
+        return len(grupo) * criterios * (matriz_decisao.shape[0] + criterios)
+
+    async def avalia(self, grupo):
+        """
+        Função que avalia um grupo de modelos de mesmas dimensões e entrega cada resposta ao seu futuro
+
+        Args:
+            grupo (list): tuplas (entrada, futuro)
+
+        Returns:
+            None
+        """
+        entradas = [entrada for entrada, _ in grupo]
+        argumentos = (np.stack([entrada[0] for entrada in entradas]), np.stack([entrada[1] for entrada in entradas]),
+                      np.stack([entrada[2] for entrada in entradas]), entradas[0][3])
+        try:
+            if self.executor is None or self.trabalho(grupo) < self.trabalho_minimo_processo:
+                respostas = avalia_grupo(*argumentos)
+            else:
+                respostas = await asyncio.get_running_loop().run_in_executor(self.executor, avalia_grupo, *argumentos)
+        except Exception as erro:
+            logger.exception("Falha na avaliação de um lote")
+            respostas = [resposta_falha(500, f"{type(erro).__name__}: {erro}")] * len(grupo)
+        for (_, futuro), resposta in zip(grupo, respostas):
+            if not futuro.done():
+                futuro.set_result(resposta)
+
+    def metricas(self):
+        """
+        Função que resume a latência e a vazão do serviço
+
+        Args:
+            None
+
+        Returns:
+            metricas (dict): quantidade de requisições, de erros e de lotes, tamanho médio dos lotes,
+            vazão média (requisições por segundo desde o início) e percentis de latência (em milissegundos)
+            das últimas requisições
+        """
+        duracao = time.perf_counter() - self.inicio if self.inicio is not None else 0.0
+        metricas = {
+            "requisicoes": self.requisicoes,
+            "erros": self.erros,
+            "lotes": self.lotes,
+            "tamanho_medio_lote": self.modelos_em_lotes / self.lotes if self.lotes > 0 else 0.0,
+            "vazao": self.requisicoes / duracao if duracao > 0 else 0.0,
+            "fila": self.fila.qsize() if self.fila is not None else 0,
+        }
+        if self.latencias:
+            percentis = np.percentile(np.fromiter(self.latencias, dtype=np.float64), [50, 90, 99]) * 1e3
+            metricas.update(latencia_p50=percentis[0], latencia_p90=percentis[1], latencia_p99=percentis[2],
+                            latencia_maxima=max(self.latencias) * 1e3)
+        return metricas
+
+    async def roteia(self, metodo_http, caminho, corpo):
+        """
+        Função que atende uma requisição HTTP já lida
+
+        Rotas:
+            POST /pontua: um modelo (ver prepara) ou {"modelos": [...]}
+            GET /metricas: ver metricas
+            GET /saude: {"status": "OK"}
+
+        Args:
+            metodo_http (str): método HTTP
+            caminho (str): caminho requisitado
+            corpo (bytes): corpo da requisição
+
+        Returns:
+            status (int): status HTTP
+            resposta (dict): corpo da resposta
+        """
+        if caminho == "/saude":
+            return 200, {"status": "OK"}
+        if caminho == "/metricas":
+            return 200, self.metricas()
+        if caminho != "/pontua":
+            return 404, {"mensagem": f"Rota {caminho} inexistente"}
+        if metodo_http != "POST":
+            return 405, {"mensagem": "Use POST para pontuar modelos"}
+        try:
+            carga = json.loads(corpo)
+        except ValueError as erro:
+            return 400, {"mensagem": f"JSON inválido: {erro}"}
+        if isinstance(carga, dict) and "modelos" in carga:
+            if not isinstance(carga["modelos"], list):
+                return 400, {"mensagem": "O campo 'modelos' deve ser uma lista de modelos"}
+            respostas = await asyncio.gather(*[self.pontua(modelo) for modelo in carga["modelos"]])
+            return 200, {"resultados": respostas}
+        if not isinstance(carga, dict):
+            return 400, {"mensagem": "O corpo deve ser um objeto JSON"}
+        resposta = await self.pontua(carga)
+        return resposta["status"], resposta
+
+    async def atende(self, leitor, escritor):
+        """
+        Função que atende uma conexão HTTP/1.1, com várias requisições por conexão (keep-alive)
+
+        Args:
+            leitor (asyncio.StreamReader): leitura da conexão
+            escritor (asyncio.StreamWriter): escrita da conexão
+
+        Returns:
+            None
+        """
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    metodo_http, caminho, _ = linha.decode("latin-1").split(" ", 2)
+                    cabecalhos = {}
+                    while True:
+                        cabecalho = await leitor.readline()
+                        if cabecalho in (b"\r\n", b"\n", b""):
+                            break
+                        nome, valor = cabecalho.decode("latin-1").split(":", 1)
+                        cabecalhos[nome.strip().lower()] = valor.strip()
+                    corpo = await leitor.readexactly(int(cabecalhos.get("content-length", 0)))
+                except ValueError:
+                    await self.responde(escritor, 400, {"mensagem": "Requisição HTTP inválida"}, fecha=True)
+                    break
+                status, resposta = await self.roteia(metodo_http, caminho.split("?", 1)[0], corpo)
+                fecha = cabecalhos.get("connection", "").lower() == "close"
+                await self.responde(escritor, status, resposta, fecha)
+                if fecha:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            escritor.close()
+
+    async def responde(self, escritor, status, resposta, fecha = False):
+        dados = json.dumps(resposta, ensure_ascii=False).encode()
+        cabecalho = (f"HTTP/1.1 {status} {RAZOES.get(status, '')}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(dados)}\r\nConnection: {'close' if fecha else 'keep-alive'}\r\n\r\n")
+        escritor.write(cabecalho.encode() + dados)
+        await escritor.drain()
+
+    async def servidor(self, host = "127.0.0.1", porta = 8080):
+        """
+        Função que inicia o servidor HTTP (o serviço deve ter sido iniciado)
+
+        Args:
+            host (str): endereço de escuta
+            porta (int): porta de escuta (0 escolhe uma porta livre)
+
+        Returns:
+            servidor (asyncio.Server): servidor iniciado
+        """
+        servidor = await asyncio.start_server(self.atende, host, porta)
+        logger.info(f"Serviço de pontuação ouvindo em {servidor.sockets[0].getsockname()}")
+        return servidor
+
+# Classe cliente do serviço de pontuação por HTTP, com uma conexão persistente. Cada cliente envia
+# uma requisição por vez; para requisições concorrentes, usam-se vários clientes
+class ClienteHTTP:
+    def __init__(self, host = "127.0.0.1", porta = 8080) -> None:
+        self.host = host
+        self.porta = porta
+        self.leitor = None
+        self.escritor = None
+        self.trava = asyncio.Lock()
+
+    async def fecha(self):
+        if self.escritor is not None:
+            self.escritor.close()
+            self.leitor = self.escritor = None
+
+    async def requisita(self, metodo_http, caminho, carga = None):
+        """
+        Função que envia uma requisição e lê a resposta
+
+        Args:
+            metodo_http (str): 'GET' ou 'POST'
+            caminho (str): caminho requisitado
+            carga (dict): corpo da requisição (convertido para JSON)
+
+        Returns:
+            status (int): status HTTP
+            resposta (dict): corpo da resposta
+        """
+        async with self.trava:
+            if self.escritor is None:
+                self.leitor, self.escritor = await asyncio.open_connection(self.host, self.porta)
+            corpo = b"" if carga is None else json.dumps(carga).encode()
+            self.escritor.write(f"{metodo_http} {caminho} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                                f"Content-Length: {len(corpo)}\r\n\r\n".encode() + corpo)
+            await self.escritor.drain()
+            status = int((await self.leitor.readline()).split(b" ", 2)[1])
+            tamanho = 0
+            while True:
+                cabecalho = await self.leitor.readline()
+                if cabecalho in (b"\r\n", b"\n", b""):
+                    break
+                nome, valor = cabecalho.decode("latin-1").split(":", 1)
+                if nome.strip().lower() == "content-length":
+                    tamanho = int(valor)
+            return status, json.loads(await self.leitor.readexactly(tamanho))
+
+    async def pontua(self, modelo):
+        return await self.requisita("POST", "/pontua", modelo)
+
+    async def metricas(self):
+        return await self.requisita("GET", "/metricas")
+
+# Classe cliente que chama o serviço diretamente, sem rede, para testes e uso embutido
+class ClienteLocal:
+    def __init__(self, servico) -> None:
+        self.servico = servico
+
+    async def pontua(self, modelo):
+        resposta = await self.servico.pontua(modelo)
+        return resposta["status"], resposta
+
+    async def metricas(self):
+        return 200, self.servico.metricas()
+
+async def executa_servidor(host, porta, **parametros):
+    async with ServicoPontuacao(**parametros) as servico:
+        servidor = await servico.servidor(host, porta)
+        async with servidor:
+            await servidor.serve_forever()
+
+def main(argumentos = None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP de pontuação de modelos AHP com micro-lotes")
+    parser.add_argument("--host", default="127.0.0.1", help="endereço de escuta")
+    parser.add_argument("--porta", type=int, default=8080, help="porta de escuta")
+    parser.add_argument("-p", "--processos", type=int, default=None, help="processos do pool (0 = sem pool)")
+    parser.add_argument("-j", "--janela", type=float, default=0.002, help="janela de formação dos lotes, em segundos")
+    parser.add_argument("-l", "--tamanho-lote", type=int, default=512, help="quantidade máxima de modelos por lote")
+    parser.add_argument("-m", "--metodo", choices=tuple(ahp.PRIORIZACOES), default="aproximado",
+                        help="método padrão de cálculo do vetor prioridade")
+    parser.add_argument("-v", "--verboso", action="store_true", help="exibe as mensagens de progresso")
+    args = parser.parse_args(argumentos)
+
+    logging.basicConfig(format="%(asctime)s %(levelname)s %(message)s", level="INFO" if args.verboso else "WARNING")
+    try:
+        asyncio.run(executa_servidor(args.host, args.porta, processos=args.processos, janela=args.janela,
+                                     tamanho_maximo_lote=args.tamanho_lote, metodo=args.metodo))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
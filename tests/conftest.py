@@ -0,0 +1,34 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Os módulos do projeto ficam na raiz do repositório
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def gera_julgamentos(gerador, tamanho, lote = None, ruido = 0.1):
+    """
+    Função que gera matrizes de julgamento recíprocas próximas da consistência perfeita
+
+    Args:
+        gerador (numpy Generator): gerador de números aleatórios
+        tamanho (int): quantidade de critérios
+        lote (int): quantidade de matrizes (None devolve uma matriz bidimensional)
+        ruido (float): desvio padrão do ruído multiplicativo (em escala logarítmica)
+
+    Returns:
+        matrizes (numpy array): matriz (n, n) ou pilha (lote, n, n)
+    """
+    quantidade = 1 if lote is None else lote
+    pesos = gerador.uniform(0.1, 1.0, size=(quantidade, tamanho))
+    linhas, colunas = np.triu_indices(tamanho, k=1)
+    valores = pesos[:, linhas] / pesos[:, colunas] * np.exp(gerador.normal(0.0, ruido, size=(quantidade, len(linhas))))
+    matrizes = np.ones((quantidade, tamanho, tamanho))
+    matrizes[:, linhas, colunas] = valores
+    matrizes[:, colunas, linhas] = 1.0 / valores
+    return matrizes[0] if lote is None else matrizes
+
+@pytest.fixture
+def gerador():
+    return np.random.default_rng(0)
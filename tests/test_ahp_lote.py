@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+import ahp
+from conftest import gera_julgamentos
+
+@pytest.mark.parametrize("metodo", ["aproximado", "autovetor"])
+def test_lote_igual_ao_ahp_por_modelo(gerador, metodo):
+    k, m, n = 30, 8, 5
+    julgamentos = gera_julgamentos(gerador, n, k)
+    decisoes = gerador.uniform(1.0, 10.0, size=(k, m, n))
+    referencia = [1, -1, 1, 1, -1]
+    vetores, consistencias, resultados, status = ahp.AHPLote(julgamentos, decisoes, referencia, metodo=metodo).executa_algoritmo()
+
+    for indice in range(k):
+        processo = ahp.AHP(julgamentos[indice], decisoes[indice], referencia, metodo=metodo)
+        np.testing.assert_allclose(resultados[indice], processo.executa_algoritmo(), rtol=1e-9)
+        np.testing.assert_allclose(vetores[indice], processo.vetor_prioridade, rtol=1e-9)
+        assert consistencias[indice] == pytest.approx(processo.consistencia, abs=1e-8)
+        assert status[indice] == ("OK", 200)
+
+def test_lote_isola_modelos_reprovados(gerador):
+    k, m, n = 6, 4, 4
+    julgamentos = gera_julgamentos(gerador, n, k)
+    julgamentos[1, 0, 0] = 2.0
+    julgamentos[2, 0, 1] = 5.0
+    julgamentos[3] = gera_julgamentos(gerador, n, ruido=3.0)
+    julgamentos[4, 1, 2] = np.nan
+    decisoes = gerador.uniform(1.0, 10.0, size=(k, m, n))
+    _, consistencias, resultados, status = ahp.AHPLote(julgamentos, decisoes, [1] * n).executa_algoritmo()
+
+    codigos = [codigo for _, codigo in status]
+    assert codigos == [200, 400, 400, 400, 400, 200]
+    assert "diagonal" in status[1][0] and "reciprocidade" in status[2][0]
+    assert consistencias[3] > 10
+    assert np.isnan(resultados[1:5]).all() and np.isfinite(resultados[[0, 5]]).all()
+
+def test_lote_nao_altera_as_entradas(gerador):
+    julgamentos = gera_julgamentos(gerador, 4, 3)
+    decisoes = gerador.uniform(1.0, 10.0, size=(3, 5, 4))
+    copias = julgamentos.copy(), decisoes.copy()
+    ahp.AHPLote(julgamentos, decisoes, [-1, 1, -1, 1]).executa_algoritmo()
+    np.testing.assert_array_equal(julgamentos, copias[0])
+    np.testing.assert_array_equal(decisoes, copias[1])
+
+def test_autovetor_converge_com_modelo_invalido_no_lote(gerador, caplog):
+    julgamentos = gera_julgamentos(gerador, 5, 60)
+    julgamentos[7, 0, 1] = np.nan
+    vetores, _ = ahp.MatrizJulgamento().autovetor_principal(julgamentos)
+    esperados, _ = ahp.MatrizJulgamento().autovetor_principal(np.delete(julgamentos, 7, axis=0))
+    np.testing.assert_allclose(np.delete(vetores, 7, axis=0), esperados, atol=1e-9)
+    assert "não convergiu" not in caplog.text
+
+def test_lote_com_referencia_por_modelo(gerador):
+    k, m, n = 4, 5, 3
+    julgamentos = gera_julgamentos(gerador, n, k)
+    decisoes = gerador.uniform(1.0, 10.0, size=(k, m, n))
+    referencias = np.array([[1, 1, -1], [-1, 1, 1], [1, -1, 1], [-1, -1, -1]])
+    _, _, resultados, _ = ahp.AHPLote(julgamentos, decisoes, referencias).executa_algoritmo()
+    for indice in range(k):
+        esperado = ahp.AHP(julgamentos[indice], decisoes[indice], referencias[indice]).executa_algoritmo()
+        np.testing.assert_allclose(resultados[indice], esperado, rtol=1e-12)
+
+@pytest.mark.parametrize("referencia", [[1, -1], np.ones((3, 3)), np.ones((2, 4))])
+def test_lote_rejeita_lista_de_referencia_com_formato_errado(gerador, referencia):
+    with pytest.raises(ValueError, match="A lista de referência deve ter um valor para cada critério"):
+        ahp.AHPLote(gera_julgamentos(gerador, 3, 2), gerador.uniform(1.0, 10.0, size=(2, 4, 3)), referencia)
+
+def test_normalizacao_de_pilhas_igual_a_por_matriz(gerador):
+    decisoes = gerador.uniform(1.0, 10.0, size=(3, 6, 4))
+    md = ahp.MatrizDecisao()
+    pilha = md.normalizacao_decisao(decisoes, [1, -1, -1, 1])
+    for indice in range(3):
+        np.testing.assert_allclose(pilha[indice], md.normalizacao_decisao(decisoes[indice], [1, -1, -1, 1]), rtol=1e-15)
+
+@pytest.mark.parametrize("max_iteracoes", [0, -1])
+def test_autovetor_rejeita_iteracoes_invalidas(gerador, max_iteracoes):
+    with pytest.raises(ValueError, match="iterações"):
+        ahp.MatrizJulgamento().autovetor_principal(gera_julgamentos(gerador, 3), max_iteracoes=max_iteracoes)
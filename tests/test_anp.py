@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from anp import RedeANP
+
+def rede(tamanho):
+    return RedeANP({"nos": [f"n{i}" for i in range(tamanho)]})
+
+def test_supermatriz_bipartida_usa_limite_de_cesaro():
+    # Dois grupos que só apontam um para o outro: as potências alternam com período 2
+    supermatriz = np.array([[0, 0, 0.3, 0.6],
+                            [0, 0, 0.7, 0.4],
+                            [0.2, 0.5, 0, 0],
+                            [0.8, 0.5, 0, 0]])
+    limite, periodo = rede(4).matriz_limite(supermatriz)
+    assert periodo == 2
+    np.testing.assert_allclose(limite.sum(axis=0), 1)
+    np.testing.assert_allclose(limite @ supermatriz, limite, atol=1e-10)
+    potencia = np.linalg.matrix_power(supermatriz, 200)
+    np.testing.assert_allclose(limite, (potencia + potencia @ supermatriz) / 2, atol=1e-10)
+
+def test_supermatriz_ciclica_de_periodo_tres():
+    supermatriz = np.roll(np.eye(3), 1, axis=0)
+    limite, periodo = rede(3).matriz_limite(supermatriz)
+    assert periodo == 3
+    np.testing.assert_allclose(limite, np.full((3, 3), 1 / 3))
+
+def test_supermatriz_esparsa(gerador):
+    sparse = pytest.importorskip("scipy.sparse")
+    tamanho = 250
+    supermatriz = np.zeros((tamanho, tamanho))
+    for coluna in range(tamanho):
+        linhas = gerador.choice(tamanho, size=5, replace=False)
+        supermatriz[linhas, coluna] = gerador.uniform(0.1, 1.0, size=5)
+    supermatriz /= supermatriz.sum(axis=0)
+    limite_denso, periodo_denso = rede(tamanho).matriz_limite(supermatriz)
+    limite_esparso, periodo_esparso = rede(tamanho).matriz_limite(sparse.csr_matrix(supermatriz))
+    assert isinstance(limite_esparso, np.ndarray) and periodo_esparso == periodo_denso == 1
+    np.testing.assert_allclose(limite_esparso, limite_denso, atol=1e-9)
+    np.testing.assert_allclose(limite_denso @ supermatriz, limite_denso, atol=1e-9)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import ahp
+from armazenamento import ArmazenamentoModelos
+from conftest import gera_julgamentos
+
+@pytest.mark.parametrize("metodo", ["aproximado", "autovetor", "geometrica"])
+def test_avaliacao_igual_ao_ahp(gerador, metodo):
+    matriz = gera_julgamentos(gerador, 4)
+    decisao = gerador.uniform(1.0, 10.0, size=(6, 4))
+    processo = ahp.AHP(matriz, decisao, [1, -1, 1, -1], metodo=metodo)
+    esperado = processo.executa_algoritmo()
+    with ArmazenamentoModelos(":memory:", metodo=metodo) as armazenamento:
+        avaliacao = armazenamento.avalia(matriz, decisao, [1, -1, 1, -1])
+    assert avaliacao["status"] == 200
+    np.testing.assert_allclose(avaliacao["resultado"], esperado)
+    np.testing.assert_allclose(avaliacao["vetor_prioridade"], processo.vetor_prioridade)
+    assert avaliacao["consistencia"] == pytest.approx(processo.consistencia)
+
+def test_falhas_viram_status(gerador):
+    matriz = gera_julgamentos(gerador, 4)
+    with ArmazenamentoModelos(":memory:") as armazenamento:
+        colunas = armazenamento.calcula(matriz, gerador.uniform(1.0, 10.0, size=(6, 3)), [1, 1, 1])
+        assert colunas["status"] == 400 and "coluna para cada critério" in colunas["mensagem"]
+
+        inconsistente = armazenamento.calcula(gera_julgamentos(gerador, 4, ruido=3.0), np.ones((2, 4)), [1] * 4)
+        assert inconsistente["status"] == 400 and inconsistente["consistencia"] > 10
+        assert inconsistente["vetor_prioridade"] is not None and inconsistente["resultado"] is None
+
+        invalida = matriz.copy()
+        invalida[0, 1] = 7.0
+        reciprocidade = armazenamento.calcula(invalida, np.ones((2, 4)), [1] * 4)
+        assert reciprocidade["status"] == 400 and reciprocidade["consistencia"] is None
+
+def test_segunda_avaliacao_vem_do_banco(gerador, tmp_path):
+    matriz = gera_julgamentos(gerador, 3)
+    decisao = gerador.uniform(1.0, 10.0, size=(4, 3))
+    caminho = str(tmp_path / "modelos.sqlite")
+    with ArmazenamentoModelos(caminho) as armazenamento:
+        primeira = armazenamento.avalia(matriz, decisao, [1, 1, -1])
+    with ArmazenamentoModelos(caminho) as armazenamento:
+        segunda = armazenamento.avalia(matriz, decisao, [1, 1, -1])
+        assert armazenamento.acertos == 1 and armazenamento.falhas == 0
+    np.testing.assert_array_equal(primeira["resultado"], segunda["resultado"])
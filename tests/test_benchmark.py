@@ -0,0 +1,31 @@
+import copy
+
+import ahp
+from benchmark import Benchmark, compara
+
+def relatorio():
+    benchmark = Benchmark(tamanhos=(3,), alternativas=(4,), lotes=(1, 2), criterios_decisao=(3,), repeticoes=1)
+    return benchmark.executa()
+
+def test_benchmark_mede_cada_etapa_separadamente():
+    resultados = relatorio()["resultados"]
+    casos = {resultado["caso"] for resultado in resultados}
+    for priorizacao in ahp.PRIORIZACOES.values():
+        assert {f"{priorizacao.__name__}.prioridades", f"{priorizacao.__name__}.consistencia"} <= casos
+    assert {"AHP.executa_algoritmo", "AHPLote.executa_algoritmo", "normalizacao_decisao"} <= casos
+    assert all(resultado["tempo_mediano"] > 0 and resultado["memoria_pico"] >= 0 for resultado in resultados)
+
+def test_compara_aponta_apenas_regressoes():
+    linha_base = relatorio()
+    for resultado in linha_base["resultados"]:
+        resultado.update(tempo_mediano=1.0, memoria_pico=1000)
+    atual = copy.deepcopy(linha_base)
+    assert compara(atual, linha_base) == []
+
+    atual["resultados"][0]["tempo_mediano"] = 1.5
+    atual["resultados"][1]["memoria_pico"] = 1100
+    atual["resultados"][2]["memoria_pico"] = 2000
+    regressoes = compara(atual, linha_base, limite=0.2)
+    assert [(regressao["caso"], regressao["metrica"]) for regressao in regressoes] == [
+        (atual["resultados"][0]["caso"], "tempo_mediano"), (atual["resultados"][2]["caso"], "memoria_pico")]
+    assert regressoes[0]["razao"] == 1.5
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from armazenamento import ArmazenamentoModelos
+from cache_resultados import CacheResultados
+from conftest import gera_julgamentos
+
+def test_chave_depende_apenas_do_conteudo(gerador):
+    cache = CacheResultados()
+    matriz = gera_julgamentos(gerador, 4)
+    assert cache.chave("vetor_prioridade", matriz) == cache.chave("vetor_prioridade", matriz.tolist())
+    assert cache.chave("vetor_prioridade", matriz) != cache.chave("consistencia", matriz)
+    alterada = matriz.copy()
+    alterada[0, 1] += 1
+    assert cache.chave("vetor_prioridade", matriz) != cache.chave("vetor_prioridade", alterada)
+
+def test_valores_guardados_sao_somente_leitura(gerador):
+    cache = CacheResultados()
+    matriz = gera_julgamentos(gerador, 4)
+    vetor = cache.vetor_prioridade(matriz)
+    with pytest.raises(ValueError):
+        vetor[0, 0] = 1.0
+    assert cache.vetor_prioridade(matriz) is vetor
+    assert cache.estatisticas() == {"entradas": 1, "acertos": 1, "falhas": 1}
+
+def test_avaliacoes_guardadas_sao_somente_leitura(gerador):
+    matriz = gera_julgamentos(gerador, 4)
+    decisao = gerador.uniform(1.0, 10.0, size=(5, 4))
+    with ArmazenamentoModelos(":memory:") as armazenamento:
+        avaliacao = armazenamento.avalia(matriz, decisao, [1, -1, 1, -1])
+        for nome in ("vetor_prioridade", "resultado"):
+            with pytest.raises(ValueError):
+                avaliacao[nome][0, 0] = 0.0
+        novamente = armazenamento.avalia(matriz, decisao, [1, -1, 1, -1])
+        np.testing.assert_array_equal(novamente["resultado"], avaliacao["resultado"])
+        assert armazenamento.cache.acertos == 1
+
+def test_limite_de_entradas():
+    cache = CacheResultados(tamanho_maximo=2)
+    for indice in range(3):
+        cache.obtem_ou_calcula(str(indice), lambda: indice)
+    assert list(cache.entradas) == ["1", "2"]
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from classificacao import Classificacao
+
+def resultado_com_empates(gerador, quantidade = 200):
+    # Poucos valores distintos: praticamente toda posição k cai em um grupo de empates
+    return gerador.integers(0, 8, size=quantidade) / 8
+
+@pytest.mark.parametrize("k", [1, 5, 37, 199, 200, 250])
+def test_melhores_com_empates_na_posicao_k(gerador, k):
+    resultado = resultado_com_empates(gerador)
+    ordem = np.argsort(-resultado, kind="stable")
+    indices, posicoes = Classificacao(resultado).melhores(k)
+    np.testing.assert_array_equal(indices, ordem[:k])
+    np.testing.assert_array_equal(posicoes, np.arange(1, min(k, 200) + 1))
+
+@pytest.mark.parametrize("k", [1, 5, 37, 200])
+def test_piores_com_empates_na_posicao_k(gerador, k):
+    resultado = resultado_com_empates(gerador)
+    ordem = np.argsort(-resultado, kind="stable")
+    indices, posicoes = Classificacao(resultado).piores(k)
+    np.testing.assert_array_equal(indices, ordem[::-1][:k])
+    np.testing.assert_array_equal(posicoes, np.arange(200, 200 - k, -1))
+
+def test_reprovados_ficam_nas_ultimas_posicoes(gerador):
+    resultado = resultado_com_empates(gerador, 50)
+    resultado[[3, 10, 41]] = np.nan
+    indices, _ = Classificacao(resultado.reshape(-1, 1)).melhores(50)
+    np.testing.assert_array_equal(indices[-3:], [3, 10, 41])
+    np.testing.assert_array_equal(indices, np.argsort(-np.nan_to_num(resultado, nan=-np.inf), kind="stable"))
+
+@pytest.mark.parametrize("melhores", [True, False])
+def test_paginas_percorrem_a_classificacao(gerador, melhores):
+    resultado = resultado_com_empates(gerador, 103)
+    classificacao = Classificacao(resultado)
+    ordem = np.argsort(-resultado, kind="stable")
+    if not melhores:
+        ordem = ordem[::-1]
+    paginas = [classificacao.pagina(inicio, 10, melhores) for inicio in range(0, 110, 10)]
+    indices = np.concatenate([pagina[0] for pagina in paginas])
+    posicoes = np.concatenate([pagina[1] for pagina in paginas])
+    np.testing.assert_array_equal(indices, ordem)
+    np.testing.assert_array_equal(classificacao.posicoes(indices), posicoes)
+    assert len(classificacao.pagina(103, 10, melhores)[0]) == 0
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+import ahp
+from conftest import gera_julgamentos
+
+def test_decisao_incremental_igual_ao_recalculo(gerador):
+    n = 5
+    vetor = ahp.MatrizJulgamento().normalizacao_julgamentos(gera_julgamentos(gerador, n))
+    referencia = [1, -1, 1, 1, -1]
+    inicial = gerador.uniform(1.0, 10.0, size=(4, n))
+    incremental = ahp.MatrizDecisaoIncremental(vetor, referencia, inicial, alternativas=["a", "b", "c", "d"], capacidade=2)
+    valores = dict(zip(["a", "b", "c", "d"], inicial))
+
+    for passo in range(60):
+        operacao = gerador.integers(3)
+        if operacao == 0 or len(valores) < 2:
+            valores[passo] = gerador.uniform(1.0, 10.0, size=n)
+            incremental.adiciona(passo, valores[passo])
+        elif operacao == 1:
+            alternativa = list(valores)[gerador.integers(len(valores))]
+            del valores[alternativa]
+            incremental.remove(alternativa)
+        else:
+            alternativa = list(valores)[gerador.integers(len(valores))]
+            valores[alternativa] = gerador.uniform(1.0, 10.0, size=n)
+            incremental.altera(alternativa, valores[alternativa])
+
+        decisao = np.array([valores[alternativa] for alternativa in incremental.alternativas])
+        esperado = np.matmul(ahp.MatrizDecisao().normalizacao_decisao(decisao, referencia), vetor)
+        assert len(incremental) == len(valores)
+        np.testing.assert_allclose(incremental.resultado(), esperado, atol=1e-12)
+        alternativa = incremental.alternativas[0]
+        assert incremental.pontuacao(alternativa) == pytest.approx(esperado[0, 0], abs=1e-12)
+
+def test_decisao_incremental_altera_pesos(gerador):
+    n = 4
+    decisao = gerador.uniform(1.0, 10.0, size=(6, n))
+    vetores = ahp.MatrizJulgamento().normalizacao_julgamentos(gera_julgamentos(gerador, n, 2))
+    incremental = ahp.MatrizDecisaoIncremental(vetores[0], [1] * n, decisao)
+    incremental.altera_pesos(vetores[1])
+    esperado = np.matmul(ahp.MatrizDecisao().normalizacao_decisao(decisao, [1] * n), vetores[1])
+    np.testing.assert_allclose(incremental.resultado(), esperado, atol=1e-12)
+
+def test_decisao_incremental_rejeita_entradas_invalidas(gerador):
+    incremental = ahp.MatrizDecisaoIncremental(np.full((3, 1), 1 / 3), [1, -1, 1], gerador.uniform(1.0, 10.0, size=(2, 3)))
+    with pytest.raises(ValueError):
+        incremental.adiciona(5, [1.0, 0.0, 1.0])
+    with pytest.raises(ValueError):
+        incremental.adiciona(6, [1.0, 2.0])
+    with pytest.raises(ValueError):
+        ahp.MatrizDecisaoIncremental(np.full((3, 1), 1 / 3), [1, 1, 1], np.ones((2, 3)), alternativas=["x", "x"])
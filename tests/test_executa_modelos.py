@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+import ahp
+from executa_modelos import ModeloAHP
+
+def definicao():
+    return {"alternativas": ["x", "y", "z"],
+            "criterios": [{"nome": "preco", "caracteristica": "Quanto maior, pior"},
+                          {"nome": "qualidade", "caracteristica": 1},
+                          {"nome": "prazo", "caracteristica": -1}],
+            "matriz_julgamento": [[1, 2, 4], ["1/2", 1, 2], ["1/4", "1/2", 1]],
+            "matriz_decisao": [[10, 3, 5], [12, 4, 2], [8, 2, 7]]}
+
+def test_executa_igual_ao_ahp():
+    resultado = ModeloAHP(definicao()).executa()
+    matriz = np.array([[1, 2, 4], [0.5, 1, 2], [0.25, 0.5, 1]])
+    esperado = ahp.AHP(matriz, np.array(definicao()["matriz_decisao"], dtype=float), [-1, 1, -1]).executa_algoritmo()
+    assert resultado["status"] == 200
+    np.testing.assert_allclose(resultado["resultados"], esperado[:, 0])
+
+@pytest.mark.parametrize("caracteristica", ["custo", 0, 2, None])
+def test_caracteristica_desconhecida(caracteristica):
+    modelo = definicao()
+    modelo["criterios"][1]["caracteristica"] = caracteristica
+    resultado = ModeloAHP(modelo).executa()
+    assert resultado["status"] == 400 and "Característica" in resultado["mensagem"]
+
+def test_linhas_da_matriz_de_decisao():
+    modelo = definicao()
+    modelo["matriz_decisao"] = modelo["matriz_decisao"][:2]
+    assert "uma linha para cada alternativa" in ModeloAHP(modelo).executa()["mensagem"]
+    modelo = definicao()
+    modelo["matriz_decisao"][1] = [12, 4]
+    assert "um valor para cada critério" in ModeloAHP(modelo).executa()["mensagem"]
+
+def definicao_qualitativa(matriz=None, valores=("bom", "medio", "ruim")):
+    modelo = definicao()
+    modelo["criterios"][1].update({"tipo": "qualitativo", "valores": list(valores),
+                                   "matriz_julgamento": matriz or [[1, 3, 5], ["1/3", 1, 3], ["1/5", "1/3", 1]]})
+    for linha, valor in zip(modelo["matriz_decisao"], ["bom", "ruim", "medio"]):
+        linha[1] = valor
+    return modelo
+
+@pytest.mark.parametrize("metodo", ["aproximado", "autovetor", "geometrica"])
+def test_criterio_qualitativo_usa_metodo_do_modelo(metodo):
+    resultado = ModeloAHP(definicao_qualitativa(), metodo=metodo).executa()
+    priorizacao = ahp.obtem_priorizacao(metodo)
+    matriz = np.array([[1, 3, 5], [1 / 3, 1, 3], [1 / 5, 1 / 3, 1]])
+    pesos = priorizacao.prioridades(matriz)
+    assert resultado["status"] == 200
+    np.testing.assert_allclose(resultado["consistencias_qualitativas"]["qualidade"],
+                               priorizacao.consistencia(matriz, pesos))
+    decisao = np.array([[10, pesos[0][0], 5], [12, pesos[2][0], 2], [8, pesos[1][0], 7]])
+    esperado = ahp.AHP(np.array([[1, 2, 4], [0.5, 1, 2], [0.25, 0.5, 1]]), decisao, [-1, 1, -1],
+                       metodo=metodo).executa_algoritmo()
+    np.testing.assert_allclose(resultado["resultados"], esperado[:, 0])
+
+def test_criterio_qualitativo_invalido():
+    nao_reciproca = [[1, 3, 5], [1, 1, 3], ["1/5", "1/3", 1]]
+    resultado = ModeloAHP(definicao_qualitativa(nao_reciproca)).executa()
+    assert resultado["status"] == 400 and "Critério qualidade" in resultado["mensagem"]
+    resultado = ModeloAHP(definicao_qualitativa(valores=("bom", "ruim"))).executa()
+    assert resultado["status"] == 400 and "uma linha para cada valor" in resultado["mensagem"]
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from conftest import gera_julgamentos
+from grupo import AgregacaoGrupo
+
+def test_agrega_aij_igual_a_media_geometrica(gerador):
+    matrizes = gera_julgamentos(gerador, 4, lote=25)
+    resultado = AgregacaoGrupo(tamanho_bloco=7).agrega(matrizes)
+    np.testing.assert_allclose(resultado["matriz_grupo"], np.exp(np.log(matrizes).mean(axis=0)))
+    assert resultado["respondentes"] == 25 and resultado["consistencias"].shape == (25,)
+
+@pytest.mark.parametrize("alteracao", ["diagonal", "reciprocidade", "negativo"])
+def test_respondentes_invalidos_sao_informados(gerador, alteracao):
+    matrizes = gera_julgamentos(gerador, 4, lote=25)
+    for respondente in (3, 18):
+        if alteracao == "diagonal":
+            matrizes[respondente, 1, 1] = 2
+        elif alteracao == "reciprocidade":
+            matrizes[respondente, 0, 2] = 5
+        else:
+            matrizes[respondente, 0, 2] *= -1
+            matrizes[respondente, 2, 0] *= -1
+    with pytest.raises(ValueError, match="respondentes 3, 18"):
+        AgregacaoGrupo(modo="AIP", tamanho_bloco=7).agrega(matrizes)
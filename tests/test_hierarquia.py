@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from conftest import gera_julgamentos
+from hierarquia import Hierarquia, NoHierarquia
+
+def monta(gerador, matrizes = None):
+    if matrizes is None:
+        matrizes = {"objetivo": gera_julgamentos(gerador, 2), "custos": gera_julgamentos(gerador, 3),
+                    "qualidade": gera_julgamentos(gerador, 2)}
+    custos = NoHierarquia("custos", matrizes["custos"], [NoHierarquia(nome) for nome in ("c1", "c2", "c3")])
+    qualidade = NoHierarquia("qualidade", matrizes["qualidade"], [NoHierarquia(nome) for nome in ("q1", "q2")])
+    raiz = NoHierarquia("objetivo", matrizes["objetivo"], [custos, qualidade])
+    decisao = np.random.default_rng(1).uniform(1.0, 10.0, size=(6, 5))
+    return Hierarquia(raiz, decisao, [-1, -1, 1, 1, 1]), matrizes
+
+def test_atualizacao_igual_a_nova_hierarquia(gerador):
+    hierarquia, matrizes = monta(gerador)
+    matrizes["custos"] = gera_julgamentos(gerador, 3)
+    hierarquia.atualiza_julgamento("custos", matrizes["custos"])
+    nova, _ = monta(gerador, matrizes)
+    np.testing.assert_allclose(hierarquia.resultado(), nova.resultado(), rtol=1e-12)
+    assert hierarquia.pesos_globais() == pytest.approx(nova.pesos_globais(), rel=1e-12)
+
+def test_atualizacao_reprovada_mantem_o_no(gerador):
+    hierarquia, matrizes = monta(gerador)
+    no = hierarquia.nos["custos"]
+    anteriores = no.matriz_julgamento.copy(), no.vetor_prioridade.copy(), hierarquia.resultado().copy()
+    invalida = matrizes["custos"].copy()
+    invalida[0, 1] = 9.0
+    with pytest.raises(ValueError, match="custos"):
+        hierarquia.atualiza_julgamento("custos", invalida)
+
+    np.testing.assert_array_equal(no.matriz_julgamento, anteriores[0])
+    np.testing.assert_array_equal(no.vetor_prioridade, anteriores[1])
+    np.testing.assert_array_equal(hierarquia.resultado(), anteriores[2])
+    hierarquia.atualiza_julgamento("qualidade", matrizes["qualidade"])
+
+def test_reprova_no_inconsistente(gerador):
+    matrizes = {"objetivo": gera_julgamentos(gerador, 2), "custos": gera_julgamentos(gerador, 3, ruido=3.0),
+                "qualidade": gera_julgamentos(gerador, 2)}
+    with pytest.raises(ValueError, match="custos: O teste de consistência"):
+        monta(gerador, matrizes)
+
+def test_atualizacao_inconsistente_mantem_o_no(gerador):
+    hierarquia, _ = monta(gerador)
+    no = hierarquia.nos["custos"]
+    anteriores = no.matriz_julgamento.copy(), no.consistencia
+    with pytest.raises(ValueError, match="razão de consistência"):
+        hierarquia.atualiza_julgamento("custos", gera_julgamentos(gerador, 3, ruido=3.0))
+    np.testing.assert_array_equal(no.matriz_julgamento, anteriores[0])
+    assert no.consistencia == anteriores[1]
+    assert hierarquia.consistencias()["custos"] <= hierarquia.limite_consistencia
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+import ahp
+from incerteza import SimulacaoIncerteza
+
+MATRIZ_JULGAMENTO = np.array([[1, 3, 5], [1 / 3, 1, 3], [1 / 5, 1 / 3, 1]])
+MATRIZ_DECISAO = np.array([[10.0, 3, 5], [12, 4, 2], [8, 2, 7], [9, 5, 4]])
+REFERENCIA = [-1, 1, 1]
+
+def simulacao(**kwargs):
+    return SimulacaoIncerteza(MATRIZ_JULGAMENTO, MATRIZ_DECISAO, REFERENCIA, **kwargs)
+
+def test_sem_variacao_reproduz_o_ahp():
+    estatisticas = simulacao(passos=0, tamanho_bloco=64).executa(amostras=200, processos=1)
+    esperado = ahp.AHP(MATRIZ_JULGAMENTO, MATRIZ_DECISAO, REFERENCIA).executa_algoritmo()[:, 0]
+    assert estatisticas["aceitas"] == 200 and estatisticas["rejeitadas"] == 0
+    np.testing.assert_allclose(estatisticas["pontuacao_media"], esperado)
+    np.testing.assert_allclose(estatisticas["pontuacao_desvio"], 0, atol=1e-12)
+    np.testing.assert_array_equal(np.argmax(estatisticas["aceitabilidade"], axis=0), np.argsort(-esperado, kind="stable"))
+
+def test_filtro_de_consistencia():
+    amostras = 3000
+    todas = simulacao(passos=2, limite_consistencia=np.inf).executa(amostras=amostras, processos=1)
+    filtradas = simulacao(passos=2, limite_consistencia=5).executa(amostras=amostras, processos=1)
+    assert todas["aceitas"] == amostras
+    assert 0 < filtradas["aceitas"] < amostras and filtradas["aceitas"] + filtradas["rejeitadas"] == amostras
+    with pytest.raises(ValueError, match="Nenhuma amostra"):
+        simulacao(passos=2, limite_consistencia=-1).executa(amostras=100, processos=1)
+
+def test_blocos_e_processos_dao_o_mesmo_resultado():
+    # 2500 amostras em blocos de 300: o último bloco é parcial
+    unico = simulacao(passos=1, tamanho_bloco=300).executa(amostras=2500, processos=1)
+    paralelo = simulacao(passos=1, tamanho_bloco=300).executa(amostras=2500, processos=2)
+    assert unico["aceitas"] + unico["rejeitadas"] == 2500
+    np.testing.assert_allclose(unico["aceitabilidade"].sum(axis=0), 1)
+    np.testing.assert_allclose(unico["aceitabilidade"].sum(axis=1), 1)
+    for chave in ("aceitas", "rejeitadas", "aceitabilidade", "pontuacao_media", "pontuacao_desvio"):
+        np.testing.assert_allclose(unico[chave], paralelo[chave])
+
+def test_sorteio_respeita_a_escala_sem_truncar():
+    matriz = np.array([[1, 9], [1 / 9, 1]])
+    sorteio = SimulacaoIncerteza(matriz, MATRIZ_DECISAO[:, :2], REFERENCIA[:2], passos=2)
+    valores = sorteio.sorteia_matrizes(np.random.default_rng(0), 30000)[:, 0, 1]
+    distintos, contagens = np.unique(valores, return_counts=True)
+    np.testing.assert_allclose(distintos, [7, 8, 9])
+    np.testing.assert_allclose(contagens / len(valores), 1 / 3, atol=0.02)
+
+@pytest.mark.parametrize("matriz, mensagem", [
+    ([[2, 3, 5], [1 / 3, 1, 3], [1 / 5, 1 / 3, 1]], "diagonal"),
+    ([[1, 12, 5], [1 / 12, 1, 3], [1 / 5, 1 / 3, 1]], "escala de Saaty"),
+    ([[1, 3, 5], [1, 1, 3], [1 / 5, 1 / 3, 1]], "reciprocidade"),
+])
+def test_rejeita_matrizes_invalidas(matriz, mensagem):
+    with pytest.raises(ValueError, match=mensagem):
+        SimulacaoIncerteza(np.array(matriz), MATRIZ_DECISAO, REFERENCIA)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import ahp
+from conftest import gera_julgamentos
+
+ESCALA = (1 / 7, 1 / 5, 1 / 3, 1 / 2, 2.0, 3.0, 5.0, 7.0)
+
+def resultado_completo(matriz, decisao, referencia, metodo):
+    processo = ahp.AHP(matriz, decisao, referencia, metodo=metodo)
+    try:
+        resultado = processo.executa_algoritmo()
+    except ValueError:
+        # A pontuação é comparada mesmo quando a consistência reprova a matriz
+        normalizada = ahp.MatrizDecisao().normalizacao_decisao(decisao, referencia)
+        resultado = np.matmul(normalizada, processo.vetor_prioridade)
+    return processo, resultado
+
+@pytest.mark.parametrize("metodo", ["aproximado", "autovetor"])
+def test_julgamento_incremental_igual_ao_recalculo(gerador, metodo):
+    n, m = 7, 30
+    matriz = gera_julgamentos(gerador, n)
+    decisao = gerador.uniform(1.0, 10.0, size=(m, n))
+    referencia = [1, -1, 1, -1, 1, -1, 1]
+    incremental = ahp.MatrizJulgamentoIncremental(matriz, decisao, referencia, metodo=metodo)
+
+    for _ in range(40):
+        i, j = gerador.choice(n, size=2, replace=False)
+        valor = gerador.choice(ESCALA)
+        matriz[i, j], matriz[j, i] = valor, 1 / valor
+        incremental.atualiza(i, j, valor)
+
+        processo, resultado = resultado_completo(matriz, decisao, referencia, metodo)
+        np.testing.assert_allclose(incremental.vetor_prioridade, processo.vetor_prioridade, atol=1e-9)
+        np.testing.assert_allclose(incremental.resultado, resultado, atol=1e-9)
+        # A mesma razão de consistência do AHP garante o mesmo veredito perto do limite de 10%
+        assert incremental.consistencia == pytest.approx(processo.consistencia, abs=1e-7)
+
+def test_julgamento_incremental_recalcula_periodicamente(gerador):
+    matriz = gera_julgamentos(gerador, 5)
+    incremental = ahp.MatrizJulgamentoIncremental(matriz, intervalo_recalculo=3)
+    for _ in range(7):
+        incremental.atualiza(0, 1, 3.0)
+    assert incremental.atualizacoes == 1
+
+def test_julgamento_incremental_rejeita_alteracoes_invalidas(gerador):
+    incremental = ahp.MatrizJulgamentoIncremental(gera_julgamentos(gerador, 4))
+    with pytest.raises(ValueError):
+        incremental.atualiza(2, 2, 3.0)
+    with pytest.raises(ValueError):
+        incremental.atualiza(0, 1, -1.0)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ahp
+from pontuacao_em_blocos import PontuacaoEmBlocos
+
+REFERENCIA = [1, -1, 1, -1]
+
+@pytest.fixture
+def dados(gerador):
+    matriz_decisao = gerador.uniform(1.0, 100.0, size=(1003, 4))
+    vetor_prioridade = gerador.dirichlet(np.ones(4)).reshape(-1, 1)
+    esperado = np.matmul(ahp.MatrizDecisao().normalizacao_decisao(matriz_decisao, REFERENCIA), vetor_prioridade)
+    return matriz_decisao, vetor_prioridade, esperado
+
+def test_duas_passagens_iguais_a_normalizacao_decisao(dados):
+    matriz_decisao, vetor_prioridade, esperado = dados
+    resultado = PontuacaoEmBlocos(vetor_prioridade, REFERENCIA, tamanho_bloco=100).pontua(matriz_decisao)
+    np.testing.assert_allclose(resultado, esperado)
+
+@pytest.mark.parametrize("extensao", [".npy", ".csv", ".parquet"])
+def test_arquivos_informados_como_path(dados, tmp_path, extensao):
+    matriz_decisao, vetor_prioridade, esperado = dados
+    caminho = tmp_path / f"decisao{extensao}"
+    tabela = pd.DataFrame(matriz_decisao, columns=[f"c{j}" for j in range(4)])
+    if extensao == ".npy":
+        np.save(caminho, matriz_decisao)
+    elif extensao == ".csv":
+        tabela.to_csv(caminho, index=False)
+    else:
+        pytest.importorskip("pyarrow")
+        tabela.to_parquet(caminho, index=False)
+    pontuacao = PontuacaoEmBlocos(vetor_prioridade, REFERENCIA, tamanho_bloco=100)
+    np.testing.assert_allclose(pontuacao.pontua(caminho), esperado)
+    destino = tmp_path / "resultado.npy"
+    pontuacao.pontua(caminho, destino=str(destino))
+    np.testing.assert_allclose(np.load(destino), esperado)
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+import ahp
+from conftest import gera_julgamentos
+
+def gci_direto(matriz, vetor_prioridade):
+    tamanho = matriz.shape[0]
+    pesos = vetor_prioridade[:, 0]
+    soma = sum(np.log(matriz[i, j] * pesos[j] / pesos[i]) ** 2 for i in range(tamanho) for j in range(i + 1, tamanho))
+    return 2 * soma / ((tamanho - 1) * (tamanho - 2))
+
+def test_geometrica_igual_a_media_geometrica_das_linhas(gerador):
+    matriz = gera_julgamentos(gerador, 6)
+    esperado = np.prod(matriz, axis=1) ** (1 / 6)
+    vetor = ahp.PriorizacaoGeometrica().prioridades(matriz)
+    np.testing.assert_allclose(vetor[:, 0], esperado / esperado.sum(), rtol=1e-12)
+
+def test_geometrica_e_llsm_coincidem_em_matrizes_completas(gerador):
+    matrizes = gera_julgamentos(gerador, 7, 40)
+    geometrica = ahp.PriorizacaoGeometrica().prioridades(matrizes)
+    llsm = ahp.PriorizacaoMinimosQuadrados().prioridades(matrizes)
+    np.testing.assert_allclose(geometrica, llsm, atol=1e-12)
+
+def test_gci(gerador):
+    matrizes = gera_julgamentos(gerador, 5, 10, ruido=0.4)
+    priorizacao = ahp.PriorizacaoGeometrica()
+    vetores = priorizacao.prioridades(matrizes)
+    gci = priorizacao.consistencia(matrizes, vetores)
+    for indice in range(10):
+        assert gci[indice] == pytest.approx(gci_direto(matrizes[indice], vetores[indice]), rel=1e-10)
+        assert priorizacao.consistencia(matrizes[indice], vetores[indice]) == pytest.approx(gci[indice], rel=1e-12)
+    assert priorizacao.consistencia(np.array([[1.0, 3.0], [1 / 3, 1.0]]), np.array([[0.75], [0.25]])) == 0
+
+def test_limites_gci():
+    priorizacao = ahp.PriorizacaoGeometrica()
+    assert [priorizacao.limite(tamanho) for tamanho in (3, 4, 5, 9)] == [0.31, 0.35, 0.37, 0.37]
+
+def test_llsm_em_lote_igual_a_matriz_incompleta(gerador):
+    matrizes = gera_julgamentos(gerador, 6, 8)
+    matrizes[:, 0, 2] = matrizes[:, 2, 0] = np.nan
+    matrizes[:, 1, 4] = matrizes[:, 4, 1] = np.nan
+    vetores = ahp.PriorizacaoMinimosQuadrados().prioridades(matrizes)
+    mj = ahp.MatrizJulgamento()
+    for indice in range(8):
+        np.testing.assert_allclose(vetores[indice], mj.prioridade_incompleta(matrizes[indice]), atol=1e-12)
+
+def test_llsm_marca_modelos_desconexos(gerador):
+    matrizes = gera_julgamentos(gerador, 4, 3)
+    matrizes[1, 0, 1:] = matrizes[1, 1:, 0] = np.nan
+    vetores = ahp.PriorizacaoMinimosQuadrados().prioridades(matrizes)
+    assert np.isnan(vetores[1]).all() and np.isfinite(vetores[[0, 2]]).all()
+    with pytest.raises(ValueError, match="não ligam todos os critérios"):
+        ahp.PriorizacaoMinimosQuadrados().prioridades(matrizes[1])
+
+def test_llsm_gci_incompleto_recupera_pesos_consistentes(gerador):
+    pesos = np.array([0.4, 0.3, 0.2, 0.1])
+    matriz = pesos[:, np.newaxis] / pesos[np.newaxis, :]
+    matriz[0, 3] = matriz[3, 0] = np.nan
+    priorizacao = ahp.PriorizacaoMinimosQuadrados()
+    vetor = priorizacao.prioridades(matriz)
+    np.testing.assert_allclose(vetor[:, 0], pesos, atol=1e-12)
+    assert priorizacao.consistencia(matriz, vetor) == pytest.approx(0, abs=1e-20)
+
+def test_incompleto_mantem_razao_da_matriz_completada(gerador):
+    matriz = gera_julgamentos(gerador, 5, ruido=0.2)
+    matriz[1, 3] = matriz[3, 1] = np.nan
+    priorizacao = ahp.PriorizacaoIncompleta()
+    mj = ahp.MatrizJulgamento()
+    vetor = priorizacao.prioridades(matriz)
+    esperado = mj.analise_consistencia(mj.completa_matriz(matriz, vetor), vetor)
+    assert priorizacao.consistencia(matriz, vetor) == pytest.approx(esperado, rel=1e-12)
+    assert priorizacao.limite(5) == 10
+
+@pytest.mark.parametrize("metodo", list(ahp.PRIORIZACOES))
+def test_ahp_aceita_nome_ou_instancia(gerador, metodo):
+    matriz = gera_julgamentos(gerador, 4)
+    decisao = gerador.uniform(1.0, 10.0, size=(6, 4))
+    por_nome = ahp.AHP(matriz, decisao, [1, -1, 1, -1], metodo=metodo).executa_algoritmo()
+    por_instancia = ahp.AHP(matriz, decisao, [1, -1, 1, -1], metodo=ahp.PRIORIZACOES[metodo]()).executa_algoritmo()
+    np.testing.assert_allclose(por_nome, por_instancia)
+
+def test_ahp_reprova_pelo_limite_do_metodo(gerador):
+    matriz = gera_julgamentos(gerador, 5, ruido=2.0)
+    decisao = gerador.uniform(1.0, 10.0, size=(3, 5))
+    processo = ahp.AHP(matriz, decisao, [1] * 5, metodo="geometrica")
+    with pytest.raises(ValueError, match="índice de consistência geométrico"):
+        processo.executa_algoritmo()
+    assert processo.consistencia > 0.37
+
+def test_metodo_desconhecido():
+    with pytest.raises(ValueError, match="O método deve ser um entre"):
+        ahp.obtem_priorizacao("inexistente")
+
+def test_priorizacao_incompleta_nao_pode_ser_instanciada():
+    class SemConsistencia(ahp.Priorizacao):
+        def prioridades(self, matriz):
+            return ahp.MatrizJulgamento().normalizacao_julgamentos(matriz)
+
+    with pytest.raises(TypeError):
+        SemConsistencia()
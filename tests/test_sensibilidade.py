@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import ahp
+from sensibilidade import AnaliseSensibilidade
+
+def pontuacoes(analise, criterio, delta):
+    pesos = analise.pesos.copy()
+    pesos[criterio] += delta
+    return analise.matriz @ (pesos / (1 + delta))
+
+@pytest.fixture
+def analise(gerador):
+    matriz_decisao = gerador.uniform(1.0, 100.0, size=(12, 5))
+    matriz_normalizada = ahp.MatrizDecisao().normalizacao_decisao(matriz_decisao, [1, -1, 1, 1, -1])
+    return AnaliseSensibilidade(gerador.dirichlet(np.ones(5)).reshape(-1, 1), matriz_normalizada)
+
+def test_limiares_pares_invertem_o_par(analise):
+    pares = analise.pares_adjacentes()
+    variacoes, pesos_criticos = analise.limiares_pares()
+    assert variacoes.shape == pesos_criticos.shape == (5, len(pares)) and np.isfinite(variacoes).any()
+    for criterio, par in zip(*np.nonzero(np.isfinite(variacoes))):
+        i, j = pares[par]
+        delta = variacoes[criterio, par]
+        assert delta >= -analise.pesos[criterio]
+        assert 0 <= pesos_criticos[criterio, par] <= 1
+        no_limiar = pontuacoes(analise, criterio, delta)
+        np.testing.assert_allclose(no_limiar[i], no_limiar[j])
+        alem = pontuacoes(analise, criterio, delta * 1.01)
+        if delta * 1.01 >= -analise.pesos[criterio]:
+            assert alem[i] < alem[j]
+
+def test_inversao_impossivel_respeita_peso_nao_negativo():
+    # A alternativa 0 domina a 1 nos dois critérios: nenhum peso admissível inverte o par
+    analise = AnaliseSensibilidade(np.array([[0.5], [0.5]]), np.array([[0.9, 0.6], [0.1, 0.4]]))
+    variacoes, pesos_criticos = analise.limiares_pares()
+    assert np.isnan(variacoes).all() and np.isnan(pesos_criticos).all()
+    aumento, par_aumento, reducao, par_reducao = analise.menor_alteracao()
+    np.testing.assert_array_equal(aumento, np.inf)
+    np.testing.assert_array_equal(reducao, -np.inf)
+    assert (par_aumento == -1).all() and (par_reducao == -1).all()
+
+def test_menor_alteracao_e_a_primeira_que_muda_a_ordenacao(analise):
+    ordem = np.argsort(-analise.resultado, kind="stable")
+    aumento, par_aumento, reducao, par_reducao = analise.menor_alteracao()
+    for criterio in range(5):
+        for delta, par in ((aumento[criterio], par_aumento[criterio]), (reducao[criterio], par_reducao[criterio])):
+            if not np.isfinite(delta):
+                assert (par == -1).all()
+                continue
+            assert delta >= -analise.pesos[criterio]
+            antes = pontuacoes(analise, criterio, delta * 0.99)
+            np.testing.assert_array_equal(np.argsort(-antes, kind="stable"), ordem)
+            depois = pontuacoes(analise, criterio, delta * 1.01)
+            if delta * 1.01 >= -analise.pesos[criterio]:
+                assert depois[par[0]] < depois[par[1]]
+
+def test_curvas_variacao(analise):
+    grade, curvas = analise.curvas_variacao(pontos=11)
+    assert curvas.shape == (5, 11, 12)
+    for criterio in range(5):
+        for ponto, peso in enumerate(grade):
+            pesos = analise.pesos * (1 - peso) / (1 - analise.pesos[criterio])
+            pesos[criterio] = peso
+            np.testing.assert_allclose(pesos.sum(), 1)
+            np.testing.assert_allclose(curvas[criterio, ponto], analise.matriz @ pesos)
+        # O ponto t = 0.5 equivale a somar delta = (0.5 - wc) / 0.5 ao peso e renormalizar
+        np.testing.assert_allclose(pontuacoes(analise, criterio, (0.5 - analise.pesos[criterio]) / 0.5),
+                                   curvas[criterio, 5], atol=1e-12)
@@ -0,0 +1,129 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import ahp
+from conftest import gera_julgamentos
+from servico import ClienteLocal, ServicoPontuacao
+
+def modelo(gerador, criterios = 4, alternativas = 6, metodo = None):
+    definicao = {"matriz_julgamento": gera_julgamentos(gerador, criterios).tolist(),
+                 "matriz_decisao": gerador.uniform(1.0, 10.0, size=(alternativas, criterios)).tolist(),
+                 "lista_referencia_monotomica": [1, -1] * (criterios // 2)}
+    if metodo is not None:
+        definicao["metodo"] = metodo
+    return definicao
+
+# Executor em threads que registra os envios, no lugar do pool de processos
+class ExecutorContado(ThreadPoolExecutor):
+    def __init__(self) -> None:
+        super().__init__(max_workers=1)
+        self.envios = 0
+
+    def submit(self, *argumentos, **parametros):
+        self.envios += 1
+        return super().submit(*argumentos, **parametros)
+
+def test_pontua_igual_ao_ahp(gerador):
+    modelos = [modelo(gerador, metodo=metodo) for metodo in ("aproximado", "autovetor", "geometrica", "llsm")]
+
+    async def executa():
+        async with ServicoPontuacao(processos=0) as servico:
+            cliente = ClienteLocal(servico)
+            return await asyncio.gather(*[cliente.pontua(definicao) for definicao in modelos])
+
+    for definicao, (status, resposta) in zip(modelos, asyncio.run(executa())):
+        esperado = ahp.AHP(np.array(definicao["matriz_julgamento"]), np.array(definicao["matriz_decisao"]),
+                           definicao["lista_referencia_monotomica"], metodo=definicao["metodo"]).executa_algoritmo()
+        assert status == 200
+        np.testing.assert_allclose(resposta["resultados"], esperado[:, 0], rtol=1e-9)
+
+def test_pontua_agrupa_em_lotes(gerador):
+    modelos = [modelo(gerador) for _ in range(20)]
+
+    async def executa():
+        async with ServicoPontuacao(processos=0, janela=0.01) as servico:
+            respostas = await asyncio.gather(*[servico.pontua(definicao) for definicao in modelos])
+            return respostas, servico.metricas()
+
+    respostas, metricas = asyncio.run(executa())
+    assert all(resposta["status"] == 200 for resposta in respostas)
+    assert metricas["requisicoes"] == 20
+    assert metricas["lotes"] < 20
+
+def test_pontua_rejeita_entradas_invalidas(gerador):
+    invalido = modelo(gerador)
+    invalido["matriz_decisao"] = [linha[:-1] for linha in invalido["matriz_decisao"]]
+    metodo_desconhecido = modelo(gerador, metodo="inexistente")
+    inconsistente = modelo(gerador)
+    inconsistente["matriz_julgamento"] = gera_julgamentos(gerador, 4, ruido=3.0).tolist()
+
+    async def executa():
+        async with ServicoPontuacao(processos=0) as servico:
+            return [await servico.pontua(definicao) for definicao in (invalido, metodo_desconhecido, inconsistente)]
+
+    respostas = asyncio.run(executa())
+    assert [resposta["status"] for resposta in respostas] == [400, 400, 400]
+    assert respostas[2]["consistencia"] > 10
+
+def test_roteamento_pelo_trabalho_estimado(gerador):
+    # Poucos modelos com muitas alternativas vão ao pool; muitos modelos pequenos ficam no laço de eventos
+    grandes = [modelo(gerador, alternativas=20000) for _ in range(2)]
+    pequenos = [modelo(gerador, alternativas=5) for _ in range(100)]
+
+    async def executa(modelos):
+        async with ServicoPontuacao(processos=0, janela=0.01) as servico:
+            servico.executor = ExecutorContado()
+            respostas = await asyncio.gather(*[servico.pontua(definicao) for definicao in modelos])
+            return respostas, servico.executor.envios
+
+    respostas, envios = asyncio.run(executa(grandes))
+    assert envios == 1 and all(resposta["status"] == 200 for resposta in respostas)
+    respostas, envios = asyncio.run(executa(pequenos))
+    assert envios == 0 and all(resposta["status"] == 200 for resposta in respostas)
+
+def test_encerra_responde_modelos_pendentes(gerador):
+    async def executa():
+        servico = ServicoPontuacao(processos=0, janela=60)
+        await servico.inicia()
+        # O primeiro modelo fica com o formador de lotes (aguardando a janela) e o segundo na fila
+        tarefas = [asyncio.create_task(servico.pontua(modelo(gerador))) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        await servico.encerra()
+        respostas = await asyncio.wait_for(asyncio.gather(*tarefas), timeout=5)
+        return respostas, await servico.pontua(modelo(gerador))
+
+    respostas, depois = asyncio.run(executa())
+    assert [resposta["status"] for resposta in respostas] == [503, 503]
+    assert depois["status"] == 503
+
+def test_roteia_http(gerador):
+    async def executa():
+        async with ServicoPontuacao(processos=0) as servico:
+            return (await servico.roteia("GET", "/saude", b""), await servico.roteia("GET", "/inexistente", b""),
+                    await servico.roteia("POST", "/pontua", b"{"),
+                    await servico.roteia("POST", "/pontua", json.dumps({"modelos": [modelo(gerador)]}).encode()))
+
+    saude, inexistente, invalido, lote = asyncio.run(executa())
+    assert saude[0] == 200 and inexistente[0] == 404 and invalido[0] == 400
+    assert lote[0] == 200 and lote[1]["resultados"][0]["status"] == 200
+
+@pytest.mark.parametrize("modelos", [None, 3, "abc", {"matriz_julgamento": [[1]]}])
+def test_roteia_rejeita_modelos_que_nao_sao_lista(modelos):
+    async def executa():
+        async with ServicoPontuacao(processos=0) as servico:
+            return await servico.roteia("POST", "/pontua", json.dumps({"modelos": modelos}).encode())
+
+    status, resposta = asyncio.run(executa())
+    assert status == 400 and "lista" in resposta["mensagem"]
+
+def test_roteia_lote_com_itens_invalidos(gerador):
+    async def executa():
+        async with ServicoPontuacao(processos=0) as servico:
+            return await servico.roteia("POST", "/pontua", json.dumps({"modelos": [modelo(gerador), 3]}).encode())
+
+    status, resposta = asyncio.run(executa())
+    assert status == 200 and [item["status"] for item in resposta["resultados"]] == [200, 400]